@@ -0,0 +1,142 @@
+"""
+Benchmarks of the asserts on large outputs. The classes follow the conventions of
+airspeed velocity (asv), the module can also be run directly with
+
+    python benchmarks/bench_asserts.py
+"""
+
+import numpy as np
+
+from scwidgets.check import (
+    Check,
+    assert_equal,
+    assert_equal_chunked,
+    assert_numpy_allclose,
+    assert_numpy_allclose_chunked,
+    assert_numpy_floating_sub_dtype,
+    assert_numpy_sub_dtype,
+    assert_shape,
+    assert_shape_chunked,
+    assert_type,
+)
+
+
+class Asserts:
+    params = [10**5, 10**7]
+    param_names = ["size"]
+
+    def setup(self, size):
+        rng = np.random.default_rng(0)
+        self.outputs = (rng.random(size),)
+        self.references = (self.outputs[0].copy(),)
+        # assert_equal compares with the Python equality, which is ambiguous for
+        # arrays
+        self.list_outputs = (self.outputs[0].tolist(),)
+        self.list_references = (self.references[0].tolist(),)
+
+    def time_assert_equal(self, size):
+        assert_equal(self.list_outputs, self.list_references)
+
+    def time_assert_equal_chunked(self, size):
+        assert_equal_chunked(self.outputs, self.references)
+
+    def peakmem_assert_equal_chunked(self, size):
+        assert_equal_chunked(self.outputs, self.references)
+
+    def time_assert_shape(self, size):
+        assert_shape(self.outputs, self.references)
+
+    def time_assert_shape_chunked(self, size):
+        assert_shape_chunked(self.outputs, self.references)
+
+    def time_assert_type(self, size):
+        assert_type(self.outputs, self.references)
+
+    def time_assert_numpy_sub_dtype(self, size):
+        assert_numpy_sub_dtype(self.outputs, np.floating)
+
+    def time_assert_numpy_floating_sub_dtype(self, size):
+        assert_numpy_floating_sub_dtype(self.outputs)
+
+
+class AssertNumpyAllclose:
+    params = ([10**5, 10**7], ["close", "not_close"])
+    param_names = ["size", "case"]
+
+    def setup(self, size, case):
+        rng = np.random.default_rng(0)
+        self.output = rng.random(size)
+        if case == "close":
+            self.reference = self.output + 1e-10
+        else:
+            self.reference = self.output + 1e-3
+
+    def time_assert_numpy_allclose(self, size, case):
+        assert_numpy_allclose((self.output,), (self.reference,))
+
+    def peakmem_assert_numpy_allclose(self, size, case):
+        assert_numpy_allclose((self.output,), (self.reference,))
+
+    def time_numpy_allclose(self, size, case):
+        # baseline
+        np.allclose(self.output, self.reference)
+
+
+class AssertNumpyAllcloseChunked:
+    params = ([10**7], [True, False])
+    param_names = ["size", "stop_on_first_failure"]
+
+    def setup(self, size, stop_on_first_failure):
+        self.output = np.arange(size, dtype=float)
+        self.reference = self.output.copy()
+        self.reference[size // 10] = -1.0
+
+    def time_assert_numpy_allclose_chunked(self, size, stop_on_first_failure):
+        assert_numpy_allclose_chunked(
+            (self.output,),
+            (self.reference,),
+            stop_on_first_failure=stop_on_first_failure,
+        )
+
+    def peakmem_assert_numpy_allclose_chunked(self, size, stop_on_first_failure):
+        assert_numpy_allclose_chunked(
+            (self.output,),
+            (self.reference,),
+            stop_on_first_failure=stop_on_first_failure,
+        )
+
+
+def identity(*outputs):
+    return outputs
+
+
+class AssertNumpyAllcloseAuto:
+    """
+    The references of a :py:class:`Check` precompute the indices of the numeric
+    outputs, plain tuples are inspected on each call.
+    """
+
+    params = ([10, 1000], ["check", "tuple"])
+    param_names = ["nb_outputs", "references"]
+
+    def setup(self, nb_outputs, references):
+        self.outputs = tuple(np.arange(10, dtype=float) for _ in range(nb_outputs))
+        if references == "check":
+            check = Check(
+                identity,
+                assert_numpy_allclose,
+                [{f"output_{i}": output for i, output in enumerate(self.outputs)}],
+                [self.outputs],
+            )
+            self.references = check.outputs_references[0]
+        else:
+            self.references = self.outputs
+
+    def time_assert_numpy_allclose_auto(self, nb_outputs, references):
+        assert_numpy_allclose(self.outputs, self.references, parameters_to_check="auto")
+
+
+if __name__ == "__main__":
+    from run import main
+
+    main(["--bench", "^bench_asserts\\."])
@@ -0,0 +1,66 @@
+"""
+Benchmarks of checking a function with many inputs and of the messages of the check
+results. The classes follow the conventions of airspeed velocity (asv).
+"""
+
+import numpy as np
+
+from scwidgets.check import (
+    Check,
+    assert_numpy_allclose,
+    assert_numpy_floating_sub_dtype,
+    assert_shape,
+    assert_type,
+)
+
+
+def function_to_check(parameter):
+    return parameter * 2
+
+
+def failing_function_to_check(parameter):
+    return parameter * 3
+
+
+def create_check(nb_inputs, size, batched=False, failing=False):
+    rng = np.random.default_rng(0)
+    inputs_parameters = [{"parameter": rng.random(size)} for _ in range(nb_inputs)]
+    return Check(
+        function_to_check=(failing_function_to_check if failing else function_to_check),
+        asserts=[
+            assert_type,
+            assert_shape,
+            assert_numpy_floating_sub_dtype,
+            assert_numpy_allclose,
+        ],
+        inputs_parameters=inputs_parameters,
+        outputs_references=[
+            (function_to_check(**parameters),) for parameters in inputs_parameters
+        ],
+        batched=batched,
+    )
+
+
+class CheckFunction:
+    params = ([10, 1000], [10, 10**4], [False, True])
+    param_names = ["nb_inputs", "size", "batched"]
+
+    def setup(self, nb_inputs, size, batched):
+        self.check = create_check(nb_inputs, size, batched)
+
+    def time_check_function(self, nb_inputs, size, batched):
+        self.check.check_function()
+
+    def peakmem_check_function(self, nb_inputs, size, batched):
+        self.check.check_function()
+
+
+class CheckResultMessage:
+    params = ([10, 100], [False, True])
+    param_names = ["nb_inputs", "full"]
+
+    def setup(self, nb_inputs, full):
+        self.result = create_check(nb_inputs, 1000, failing=True).check_function()
+
+    def time_message(self, nb_inputs, full):
+        self.result.message(full)
@@ -0,0 +1,70 @@
+"""
+Benchmarks of compiling and calling the code of a :py:class:`CodeInput`. The classes
+follow the conventions of airspeed velocity (asv).
+"""
+
+from scwidgets.code import CodeInput
+from scwidgets.code._code_analysis import analyze_code
+
+
+def sum_of_squares(n):
+    total = 0
+    for i in range(n):
+        total += i**2
+    return total
+
+
+class CodeInputCompileAndCall:
+    params = [1, 100]
+    param_names = ["nb_lines"]
+
+    def setup(self, nb_lines):
+        self.code_input = CodeInput(sum_of_squares)
+        # a body with the given number of lines
+        self.code_input.function_body = (
+            "total = 0\n" * (nb_lines - 1) + self.code_input.function_body
+        )
+
+    def time_compile(self, nb_lines):
+        # the analysis is cached by the code, so the compilation is measured
+        analyze_code.cache_clear()
+        self.code_input.function
+
+    def time_compile_cached(self, nb_lines):
+        self.code_input.function
+
+    def time_call(self, nb_lines):
+        self.code_input(10)
+
+    def time_create(self, nb_lines):
+        CodeInput(sum_of_squares)
+
+
+def sum_of_cubes(n):
+    def cube(x):
+        return x**3
+
+    total = 0
+    for i in range(n):
+        total += cube(i)
+    return total
+
+
+class CodeInputProfile:
+    """
+    The overhead of the line profiler is the ratio of `time_profile` to `time_call`
+    for a tight loop and for a loop calling a function of the profiled code.
+    """
+
+    params = ["loop", "calls"]
+    param_names = ["code"]
+
+    def setup(self, code):
+        self.code_input = CodeInput(sum_of_squares if code == "loop" else sum_of_cubes)
+        self.code_input.function
+
+    def time_call(self, code):
+        self.code_input(10000)
+
+    def time_profile(self, code):
+        self.code_input.profile(10000)
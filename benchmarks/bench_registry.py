@@ -0,0 +1,46 @@
+"""
+Benchmarks of saving and loading the answers of an :py:class:`ExerciseRegistry` for
+answer files of increasing size. The classes follow the conventions of airspeed
+velocity (asv).
+"""
+
+import os
+from tempfile import TemporaryDirectory
+
+from scwidgets.exercise import ExerciseRegistry, TextExercise
+
+
+class ExerciseRegistrySaveLoad:
+    params = ([1, 100], [10**2, 10**5])
+    param_names = ["nb_exercises", "answer_size"]
+
+    def setup(self, nb_exercises, answer_size):
+        # the answer files are created in the working directory
+        self.working_dir = os.getcwd()
+        self.tmp_dir = TemporaryDirectory()
+        os.chdir(self.tmp_dir.name)
+        self.registry = ExerciseRegistry(filename_prefix="benchmark")
+        self.exercises = [
+            TextExercise(
+                "a" * answer_size, key=f"exercise_{i}", exercise_registry=self.registry
+            )
+            for i in range(nb_exercises)
+        ]
+        self.registry.create_new_file_from_student_name("student")
+        self.answers_filename = self.registry.loaded_file_name
+
+    def teardown(self, nb_exercises, answer_size):
+        os.chdir(self.working_dir)
+        self.tmp_dir.cleanup()
+
+    def time_save_answer(self, nb_exercises, answer_size):
+        self.registry.save_answer("exercise_0")
+
+    def time_save_all_answers(self, nb_exercises, answer_size):
+        self.registry.save_all_answers()
+
+    def time_load_answer(self, nb_exercises, answer_size):
+        self.registry.load_answer(self.answers_filename, "exercise_0")
+
+    def time_load_file(self, nb_exercises, answer_size):
+        self.registry.load_file(self.answers_filename)
@@ -0,0 +1,100 @@
+"""
+Benchmarks of the construction of the exercise widgets. The classes follow the
+conventions of airspeed velocity (asv).
+"""
+
+import os
+from tempfile import TemporaryDirectory
+
+from ipywidgets import FloatSlider
+
+from scwidgets.check import Check, CheckRegistry, assert_numpy_allclose
+from scwidgets.cue import CueObject
+from scwidgets.exercise import (
+    CodeExercise,
+    ExerciseRegistry,
+    MultipleChoiceExercise,
+    TextExercise,
+)
+
+
+def function_to_check(parameter):
+    return parameter * 2
+
+
+class CodeExerciseConstruction:
+    params = ["plain", "check", "parameters", "figure"]
+    param_names = ["case"]
+
+    def time_construction(self, case):
+        # the registries and figures are created for each exercise, since an exercise
+        # takes over its figure and is registered only once
+        kwargs = {}
+        if case == "check":
+            kwargs["check_registry"] = CheckRegistry()
+        elif case == "parameters":
+            kwargs["parameters"] = {
+                f"parameter_{i}": FloatSlider(value=0.5, min=0, max=1) for i in range(5)
+            }
+            kwargs["update"] = lambda: None
+            kwargs["outputs"] = [CueObject(None)]
+        elif case == "figure":
+            import matplotlib.pyplot as plt
+
+            kwargs["outputs"] = plt.figure()
+            kwargs["update"] = lambda: None
+        exercise = CodeExercise(code=function_to_check, **kwargs)
+        if case == "check":
+            kwargs["check_registry"].add_check(
+                exercise,
+                asserts=[assert_numpy_allclose],
+                inputs_parameters=[{"parameter": 1.0}],
+                outputs_references=[(2.0,)],
+            )
+
+
+class TextExerciseConstruction:
+    def time_construction(self):
+        TextExercise("answer", description="Describe the answer")
+
+
+class MultipleChoiceExerciseConstruction:
+    params = [2, 20]
+    param_names = ["nb_options"]
+
+    def setup(self, nb_options):
+        self.options = {f"option_{i}": f"Option {i}" for i in range(nb_options)}
+
+    def time_construction(self, nb_options):
+        MultipleChoiceExercise(self.options, allow_multiple=True)
+
+
+class ExerciseRegistryConstruction:
+    params = [0, 100]
+    param_names = ["nb_answer_files"]
+
+    def setup(self, nb_answer_files):
+        # the answer files in the working directory are listed in the dropdown
+        self.working_dir = os.getcwd()
+        self.tmp_dir = TemporaryDirectory()
+        os.chdir(self.tmp_dir.name)
+        for i in range(nb_answer_files):
+            with open(f"benchmark-student_{i}.json", "w") as answers_file:
+                answers_file.write("{}")
+
+    def teardown(self, nb_answer_files):
+        os.chdir(self.working_dir)
+        self.tmp_dir.cleanup()
+
+    def time_construction(self, nb_answer_files):
+        ExerciseRegistry(filename_prefix="benchmark")
+
+
+class CheckConstruction:
+    def time_construction(self):
+        Check(
+            function_to_check,
+            asserts=[assert_numpy_allclose],
+            inputs_parameters=[{"parameter": 1.0}],
+            outputs_references=[(2.0,)],
+        )
@@ -0,0 +1,220 @@
+"""
+Runs the benchmarks without airspeed velocity (asv) and stores the results for the
+comparison across commits. The benchmark modules `bench_*.py` in this directory follow
+the conventions of asv: classes with the methods `time_*` and `peakmem_*`, the
+optional methods `setup` and `teardown` and the attributes `params` and `param_names`.
+
+    python benchmarks/run.py [--bench REGEX] [--quick] [--compare RESULTS_FILE]
+
+The results are stored in `benchmarks/results/<commit>.json`. The peak memory is
+measured with :py:mod:`tracemalloc`, so unlike asv only the memory allocated by Python
+and numpy is counted.
+"""
+
+import argparse
+import contextlib
+import functools
+import importlib.util
+import inspect
+import itertools
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import timeit
+import tracemalloc
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BENCHMARKS_DIR, "results")
+
+#: The minimal duration in seconds of one timing sample, fast benchmarks are repeated
+#: within a sample until it is reached
+MIN_SAMPLE_TIME = 0.01
+
+#: A benchmark is reported as regression if it is slower or uses more memory than
+#: this factor times the compared result
+REGRESSION_FACTOR = 1.1
+
+
+def iter_benchmarks(pattern: Optional[str] = None) -> Iterator[Tuple[str, type, str]]:
+    """
+    Yields the name, class and method name of each benchmark matching the pattern.
+    """
+    for filename in sorted(os.listdir(BENCHMARKS_DIR)):
+        if not (filename.startswith("bench_") and filename.endswith(".py")):
+            continue
+        module_name = filename[: -len(".py")]
+        spec = importlib.util.spec_from_file_location(
+            module_name, os.path.join(BENCHMARKS_DIR, filename)
+        )
+        module = importlib.util.module_from_spec(spec)  # type: ignore[arg-type]
+        spec.loader.exec_module(module)  # type: ignore[union-attr]
+        for class_name, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ != module_name:
+                continue
+            for method_name in sorted(vars(cls)):
+                if not (method_name.startswith(("time_", "peakmem_"))):
+                    continue
+                name = f"{module_name}.{class_name}.{method_name}"
+                if pattern is None or re.search(pattern, name):
+                    yield name, cls, method_name
+
+
+def iter_params(cls: type) -> Iterator[Tuple[Any, ...]]:
+    params = getattr(cls, "params", [])
+    if len(params) == 0:
+        yield ()
+    # asv accepts a single list of parameters for one parameter
+    elif isinstance(params, tuple) or isinstance(params[0], list):
+        yield from itertools.product(*params)
+    else:
+        yield from ((param,) for param in params)
+
+
+def run_benchmark(cls: type, method_name: str, params: Tuple[Any, ...], repeat: int):
+    """
+    :return:
+        The minimal time in seconds of the benchmark for `time_*` methods and the peak
+        memory in bytes for `peakmem_*` methods, `None` if the setup raised
+        `NotImplementedError` to skip the parameters as in asv
+    """
+    # the widgets print their representation and clear the output outside of a
+    # notebook
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        return _run_benchmark(cls(), method_name, params, repeat)
+
+
+def _run_benchmark(
+    benchmark: Any, method_name: str, params: Tuple[Any, ...], repeat: int
+) -> Optional[float]:
+    try:
+        if hasattr(benchmark, "setup"):
+            benchmark.setup(*params)
+    except NotImplementedError:
+        return None
+    try:
+        run = functools.partial(getattr(benchmark, method_name), *params)
+        if method_name.startswith("peakmem_"):
+            tracemalloc.start()
+            try:
+                run()
+                _, peak_memory = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            return peak_memory
+        timer = timeit.Timer(run)
+        number, _ = timer.autorange()
+        # the first sample also warms up caches
+        number = max(round(number * MIN_SAMPLE_TIME / 0.2), 1)
+        return min(timer.repeat(repeat=repeat, number=number)) / number
+    finally:
+        if hasattr(benchmark, "teardown"):
+            benchmark.teardown(*params)
+
+
+def get_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BENCHMARKS_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def format_value(name: str, value: Optional[float]) -> str:
+    if value is None:
+        return "skipped"
+    if ".peakmem_" in name:
+        return f"{value / 2**20:.2f} MiB"
+    return f"{value * 1e3:.3f} ms"
+
+
+def compare(results: Dict[str, Any], previous_results: Dict[str, Any]) -> List[str]:
+    """
+    Returns a line for each benchmark result that got slower or uses more memory than
+    the previous result by more than :py:data:`REGRESSION_FACTOR`.
+    """
+    regressions = []
+    for key, value in results["benchmarks"].items():
+        previous_value = previous_results["benchmarks"].get(key)
+        if value is None or not (previous_value):
+            continue
+        ratio = value / previous_value
+        if ratio > REGRESSION_FACTOR:
+            regressions.append(
+                f"{key}: {format_value(key, previous_value)} -> "
+                f"{format_value(key, value)} ({ratio:.2f}x)"
+            )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--bench", "-b", help="Only run the benchmarks matching the regex"
+    )
+    parser.add_argument(
+        "--quick", action="store_true", help="Take one sample of each benchmark"
+    )
+    parser.add_argument(
+        "--compare",
+        metavar="RESULTS_FILE",
+        help="Reports the regressions compared to the results stored in the file",
+    )
+    parser.add_argument(
+        "--output", help="The results file, by default results/<commit>.json"
+    )
+    arguments = parser.parse_args(argv)
+
+    results: Dict[str, Any] = {
+        "commit": get_commit(),
+        "python": platform.python_version(),
+        "machine": platform.node(),
+        "benchmarks": {},
+    }
+    for name, cls, method_name in iter_benchmarks(arguments.bench):
+        for params in iter_params(cls):
+            key = f"{name}({', '.join(map(repr, params))})"
+            value = run_benchmark(
+                cls, method_name, params, repeat=1 if arguments.quick else 5
+            )
+            results["benchmarks"][key] = value
+            print(f"{key}: {format_value(name, value)}", flush=True)
+
+    output = arguments.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{results['commit']}.json")
+    if os.path.exists(output):
+        # the results of a run of other benchmarks on the same commit are kept
+        with open(output, "r") as results_file:
+            previous_results = json.load(results_file)
+        if previous_results.get("commit") == results["commit"]:
+            results["benchmarks"] = {
+                **previous_results["benchmarks"],
+                **results["benchmarks"],
+            }
+    with open(output, "w") as results_file:
+        json.dump(results, results_file, indent=2)
+    print(f"Results stored in {output}")
+
+    if arguments.compare is None:
+        return 0
+    with open(arguments.compare, "r") as results_file:
+        regressions = compare(results, json.load(results_file))
+    if len(regressions) > 0:
+        print("Regressions:\n" + "\n".join(regressions))
+        return 1
+    print("No regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,49 @@
 __version__ = "0.2.2"
 __authors__ = "the scicode-widgets developer team"
 
-from .check import *  # noqa: F403
-from .code import *  # noqa: F403
-from .cue import *  # noqa: F403
-from .exercise import *  # noqa: F403
+from typing import TYPE_CHECKING
+
+from . import check, code, cue, exercise
+from ._lazy_import import attach_lazy_attributes
+
+if TYPE_CHECKING:
+    from ._instrumentation import WidgetCounter, WidgetCounts
+    from ._tracing import (
+        JsonlSink,
+        OpenTelemetrySink,
+        Span,
+        add_trace_sink,
+        remove_trace_sink,
+        trace_span,
+        traced,
+        tracing,
+    )
+    from .check import *  # noqa: F403
+    from .code import *  # noqa: F403
+    from .cue import *  # noqa: F403
+    from .exercise import *  # noqa: F403
+
+# the subpackages only import the modules of their attributes on first access
+__getattr__, __dir__ = attach_lazy_attributes(
+    __name__,
+    {
+        **{
+            name: subpackage.__name__
+            for subpackage in [check, code, cue, exercise]
+            for name in subpackage.__all__
+        },
+        "WidgetCounter": "._instrumentation",
+        "WidgetCounts": "._instrumentation",
+        "Span": "._tracing",
+        "tracing": "._tracing",
+        "trace_span": "._tracing",
+        "traced": "._tracing",
+        "add_trace_sink": "._tracing",
+        "remove_trace_sink": "._tracing",
+        "JsonlSink": "._tracing",
+        "OpenTelemetrySink": "._tracing",
+    },
+)
 
 __all__ = [  # noqa: F405
     # cue
@@ -14,6 +53,7 @@ __all__ = [  # noqa: F405
     # code
     "CodeInput",
     "ParametersPanel",
+    "LineProfile",
     # check
     "CheckRegistry",
     "assert_equal",
@@ -22,6 +62,26 @@ __all__ = [  # noqa: F405
     "assert_type",
     "assert_numpy_floating_sub_dtype",
     "assert_numpy_sub_dtype",
+    "assert_equal_chunked",
+    "assert_shape_chunked",
+    "assert_numpy_allclose_chunked",
+    "fingerprint_blake2b",
+    "assert_runtime_within",
+    "assert_peak_memory_within",
+    "assert_complexity",
+    "ExecutionTimeoutError",
+    # instrumentation
+    "WidgetCounter",
+    "WidgetCounts",
+    # tracing
+    "Span",
+    "tracing",
+    "trace_span",
+    "traced",
+    "add_trace_sink",
+    "remove_trace_sink",
+    "JsonlSink",
+    "OpenTelemetrySink",
     # exercise
     "CodeExercise",
     "TextExercise",
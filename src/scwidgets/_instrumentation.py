@@ -0,0 +1,240 @@
+import functools
+import json
+from contextlib import contextmanager
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, TypeVar
+
+from ipywidgets import Widget
+from ipywidgets.widgets.widget import _remove_buffers
+
+FunctionT = TypeVar("FunctionT", bound=Callable[..., Any])
+
+
+class WidgetCounts:
+    """
+    The number of widget models created and comm messages sent to the frontend.
+
+    :param nb_widget_models:
+        The number of widget models created, each one opens a comm
+    :param nb_messages:
+        The number of comm messages sent by the widgets, including the messages
+        that open the comms of new widget models
+    :param nb_trait_syncs:
+        The number of traits synchronized with the frontend by update messages
+    :param nb_bytes:
+        The size of the JSON data and binary buffers of the messages, without the
+        headers of the Jupyter messages
+    """
+
+    __slots__ = ("nb_widget_models", "nb_messages", "nb_trait_syncs", "nb_bytes")
+
+    def __init__(
+        self,
+        nb_widget_models: int = 0,
+        nb_messages: int = 0,
+        nb_trait_syncs: int = 0,
+        nb_bytes: int = 0,
+    ):
+        self.nb_widget_models = nb_widget_models
+        self.nb_messages = nb_messages
+        self.nb_trait_syncs = nb_trait_syncs
+        self.nb_bytes = nb_bytes
+
+    def __repr__(self) -> str:
+        return (
+            f"WidgetCounts(nb_widget_models={self.nb_widget_models}, "
+            f"nb_messages={self.nb_messages}, nb_trait_syncs={self.nb_trait_syncs}, "
+            f"nb_bytes={self.nb_bytes})"
+        )
+
+    def __eq__(self, other: Any) -> bool:
+        if not (isinstance(other, WidgetCounts)):
+            return NotImplemented
+        return all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__
+        )
+
+    def _add(self, nb_widget_models: int, nb_trait_syncs: int, nb_bytes: int):
+        self.nb_widget_models += nb_widget_models
+        self.nb_messages += 1
+        self.nb_trait_syncs += nb_trait_syncs
+        self.nb_bytes += nb_bytes
+
+
+class WidgetCounter:
+    """
+    Counts the widget models created and the comm messages sent by all widgets while
+    it is active, in total and for each user action like checking, updating, saving
+    and loading an exercise. The counts of an exercise are obtained by creating it
+    and clicking its buttons within the counter. It is used as context manager
+
+    .. code-block:: python
+
+        with WidgetCounter() as counter:
+            exercise = CodeExercise(...)
+        assert counter.nb_widget_models < 50
+
+    or as global counter with :py:meth:`start` and :py:meth:`stop`. The messages are
+    only counted when a counter is active, otherwise the widgets are not affected.
+    """
+
+    def __init__(self):
+        self._total = WidgetCounts()
+        self._actions: Dict[str, WidgetCounts] = {}
+
+    def start(self):
+        if self in _ACTIVE_COUNTERS:
+            return
+        if len(_ACTIVE_COUNTERS) == 0:
+            _install_hooks()
+        _ACTIVE_COUNTERS.append(self)
+
+    def stop(self):
+        if self not in _ACTIVE_COUNTERS:
+            return
+        _ACTIVE_COUNTERS.remove(self)
+        if len(_ACTIVE_COUNTERS) == 0:
+            _uninstall_hooks()
+
+    def reset(self):
+        self._total = WidgetCounts()
+        self._actions = {}
+
+    def __enter__(self) -> "WidgetCounter":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    @property
+    def is_active(self) -> bool:
+        return self in _ACTIVE_COUNTERS
+
+    @property
+    def total(self) -> WidgetCounts:
+        return self._total
+
+    @property
+    def actions(self) -> Mapping[str, WidgetCounts]:
+        """
+        The counts of each user action. The messages sent outside of a user action,
+        for example when a parameter is changed, are only counted in the total.
+        """
+        return MappingProxyType(self._actions)
+
+    @property
+    def nb_widget_models(self) -> int:
+        return self._total.nb_widget_models
+
+    @property
+    def nb_messages(self) -> int:
+        return self._total.nb_messages
+
+    @property
+    def nb_trait_syncs(self) -> int:
+        return self._total.nb_trait_syncs
+
+    @property
+    def nb_bytes(self) -> int:
+        return self._total.nb_bytes
+
+    def _count(self, nb_widget_models: int, nb_trait_syncs: int, nb_bytes: int):
+        self._total._add(nb_widget_models, nb_trait_syncs, nb_bytes)
+        if _current_action is not None:
+            action_counts = self._actions.setdefault(_current_action, WidgetCounts())
+            action_counts._add(nb_widget_models, nb_trait_syncs, nb_bytes)
+
+
+def user_action(name: str) -> Callable[[FunctionT], FunctionT]:
+    """
+    Decorates the function that performs a user action, so the messages sent while
+    it runs are counted for the action by the active :py:class:`WidgetCounter`. In
+    nested actions the messages are counted for the innermost action. The name is
+    stored in the attribute `user_action` of the decorated function, so a button
+    can count its whole click for the action with :py:func:`counted_as`.
+
+    :param name:
+        The name of the action in :py:attr:`WidgetCounter.actions`
+    """
+
+    def decorator(function: FunctionT) -> FunctionT:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with counted_as(name):
+                return function(*args, **kwargs)
+
+        wrapper.user_action = name  # type: ignore[attr-defined]
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+@contextmanager
+def counted_as(name: Optional[str]) -> Iterator[None]:
+    """
+    Counts the messages sent within the context for the user action.
+
+    :param name:
+        The name of the action, `None` keeps the current action
+    """
+    global _current_action
+    if name is None or len(_ACTIVE_COUNTERS) == 0:
+        yield
+        return
+    previous_action = _current_action
+    _current_action = name
+    try:
+        yield
+    finally:
+        _current_action = previous_action
+
+
+_ACTIVE_COUNTERS: List[WidgetCounter] = []
+_current_action: Optional[str] = None
+
+_original_open = Widget.open
+_original_send = Widget._send
+
+
+def _open(self: Widget):
+    # the comm of a widget model is opened once
+    is_new_model = self.comm is None
+    _original_open(self)
+    if is_new_model and self.comm is not None:
+        state, _, buffers = _remove_buffers(self.get_state())
+        _count_message(1, 0, _get_message_size({"state": state}, buffers))
+
+
+def _send(self: Widget, msg: dict, buffers: Optional[list] = None):
+    _original_send(self, msg, buffers)
+    if self.comm is not None:
+        nb_trait_syncs = (
+            len(msg.get("state", {})) if msg.get("method") == "update" else 0
+        )
+        _count_message(0, nb_trait_syncs, _get_message_size(msg, buffers))
+
+
+def _count_message(nb_widget_models: int, nb_trait_syncs: int, nb_bytes: int):
+    for counter in _ACTIVE_COUNTERS:
+        counter._count(nb_widget_models, nb_trait_syncs, nb_bytes)
+
+
+def _get_message_size(data: Any, buffers: Optional[list]) -> int:
+    size = len(json.dumps(data, separators=(",", ":"), default=str))
+    if buffers is not None:
+        size += sum(memoryview(buffer).nbytes for buffer in buffers)
+    return size
+
+
+def _install_hooks():
+    Widget.open = _open
+    Widget._send = _send
+
+
+def _uninstall_hooks():
+    # other libraries might have replaced the methods in the meantime
+    if Widget.open is _open:
+        Widget.open = _original_open
+    if Widget._send is _send:
+        Widget._send = _original_send
@@ -0,0 +1,35 @@
+import importlib
+import sys
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def attach_lazy_attributes(
+    package_name: str, attributes: Dict[str, str]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Creates the module-level `__getattr__` and `__dir__` functions of a package
+    (PEP 562) that import an attribute from its module on first access, so importing
+    the package does not import heavy dependencies like matplotlib or IPython that
+    are only needed by some of its attributes.
+
+    :param package_name:
+        The `__name__` of the package
+    :param attributes:
+        The name of the module of each attribute relative to the package, for example
+        `{"CueFigure": "._widget_cue_figure"}`
+    :return:
+        The `__getattr__` and `__dir__` functions of the package
+    """
+
+    def __getattr__(name: str) -> Any:
+        if name not in attributes:
+            raise AttributeError(f"module {package_name!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(attributes[name], package_name), name)
+        # stored in the package, so the module is only looked up once
+        setattr(sys.modules[package_name], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package_name])) | set(attributes))
+
+    return __getattr__, __dir__
@@ -0,0 +1,269 @@
+import functools
+import itertools
+import json
+import threading
+import time
+import warnings
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+FunctionT = TypeVar("FunctionT", bound=Callable[..., Any])
+
+
+class Span:
+    """
+    A timed section of a user action, for example running the code, an assert or
+    drawing a figure. The sections entered within a section are its children.
+
+    :param name:
+        The name of the section
+    :param span_id:
+        The identifier of the span, unique within the process
+    :param parent_id:
+        The identifier of the enclosing span, `None` for the span of the action
+    :param trace_id:
+        The identifier of the span of the action the span belongs to
+    :param start_time:
+        The start time in seconds since the epoch
+    :param attributes:
+        Additional information about the section, like the name of the assert
+    """
+
+    __slots__ = (
+        "name",
+        "span_id",
+        "parent_id",
+        "trace_id",
+        "start_time",
+        "duration",
+        "attributes",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        span_id: int,
+        parent_id: Optional[int],
+        trace_id: int,
+        start_time: float,
+        attributes: Dict[str, Any],
+    ):
+        self.name = name
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.trace_id = trace_id
+        self.start_time = start_time
+        #: The duration in seconds, set when the span is finished
+        self.duration = 0.0
+        self.attributes = attributes
+
+    def __repr__(self) -> str:
+        return f"Span({self.name!r}, span_id={self.span_id}, duration={self.duration})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+#: A sink receives each span when it is finished, so the spans of nested sections
+#: are received before the span of the enclosing section
+SinkT = Callable[[Span], None]
+
+
+def add_trace_sink(sink: SinkT):
+    """
+    Starts sending the spans of all actions to the sink.
+    """
+    if sink not in _SINKS:
+        _SINKS.append(sink)
+
+
+def remove_trace_sink(sink: SinkT):
+    if sink in _SINKS:
+        _SINKS.remove(sink)
+
+
+@contextmanager
+def tracing(sink: SinkT) -> Iterator[SinkT]:
+    """
+    Sends the spans of the actions within the context to the sink.
+
+    .. code-block:: python
+
+        spans = []
+        with tracing(spans.append):
+            exercise.run_check()
+    """
+    add_trace_sink(sink)
+    try:
+        yield sink
+    finally:
+        remove_trace_sink(sink)
+
+
+@contextmanager
+def trace_span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """
+    Times the code within the context as a span, if a sink is registered.
+
+    :param name:
+        The name of the span
+    :param attributes:
+        Additional information about the span
+    :return:
+        The span that is sent to the sinks when the context is exited, `None` if no
+        sink is registered
+    """
+    if len(_SINKS) == 0:
+        yield None
+        return
+
+    stack = _get_span_stack()
+    parent = stack[-1] if len(stack) > 0 else None
+    span_id = next(_SPAN_IDS)
+    span = Span(
+        name,
+        span_id,
+        None if parent is None else parent.span_id,
+        span_id if parent is None else parent.trace_id,
+        time.time(),
+        attributes,
+    )
+    stack.append(span)
+    start = time.perf_counter()
+    try:
+        yield span
+    except BaseException as exception:
+        span.attributes["error"] = type(exception).__name__
+        raise
+    finally:
+        span.duration = time.perf_counter() - start
+        stack.pop()
+        _send_span(span)
+
+
+def traced(name: str) -> Callable[[FunctionT], FunctionT]:
+    """
+    Decorates a function so each call is timed as a span with :py:func:`trace_span`.
+    Without a registered sink only the check for sinks is added to the call.
+
+    :param name:
+        The name of the span
+    """
+
+    def decorator(function: FunctionT) -> FunctionT:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if len(_SINKS) == 0:
+                return function(*args, **kwargs)
+            with trace_span(name):
+                return function(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+class JsonlSink:
+    """
+    Appends each span as a JSON object on a separate line to a file.
+
+    :param filename:
+        The file the spans are appended to
+    """
+
+    def __init__(self, filename: str):
+        self._filename = filename
+        self._lock = threading.Lock()
+
+    @property
+    def filename(self) -> str:
+        return self._filename
+
+    def __call__(self, span: Span):
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock, open(self._filename, "a") as spans_file:
+            spans_file.write(line + "\n")
+
+
+class OpenTelemetrySink:
+    """
+    Exports the spans to OpenTelemetry, so they can be processed by any of its
+    exporters, for example one writing to a local file or a local collector. The
+    package `opentelemetry-api` is required, the exporter is configured with the
+    tracer provider of the application. A sink receives the spans of nested sections
+    first, so the spans of an action are exported when the action is finished.
+
+    :param tracer:
+        The OpenTelemetry tracer the spans are exported with, by default the tracer
+        of the global tracer provider
+    """
+
+    def __init__(self, tracer: Optional[Any] = None):
+        try:
+            from opentelemetry import trace
+        except ImportError as exception:
+            raise ImportError(
+                "The OpenTelemetrySink requires the package opentelemetry-api."
+            ) from exception
+        self._trace = trace
+        self._tracer = trace.get_tracer("scwidgets") if tracer is None else tracer
+        self._lock = threading.Lock()
+        # the finished spans of each action that is not finished yet
+        self._pending_spans: Dict[int, List[Span]] = {}
+
+    def __call__(self, span: Span):
+        with self._lock:
+            spans = self._pending_spans.setdefault(span.trace_id, [])
+            spans.append(span)
+            if span.parent_id is not None:
+                return
+            del self._pending_spans[span.trace_id]
+
+        # the parents are started first, their identifiers are smaller
+        spans.sort(key=lambda span: span.span_id)
+        exported_spans: Dict[int, Any] = {}
+        for span in spans:
+            parent = exported_spans.get(span.parent_id)  # type: ignore[arg-type]
+            exported_spans[span.span_id] = self._tracer.start_span(
+                span.name,
+                context=(
+                    None if parent is None else self._trace.set_span_in_context(parent)
+                ),
+                attributes={
+                    key: (
+                        value
+                        if isinstance(value, (str, bool, int, float))
+                        else str(value)
+                    )
+                    for key, value in span.attributes.items()
+                    if value is not None
+                },
+                start_time=int(span.start_time * 1e9),
+            )
+        for span in spans:
+            exported_spans[span.span_id].end(
+                end_time=int((span.start_time + span.duration) * 1e9)
+            )
+
+
+_SINKS: List[SinkT] = []
+_SPAN_IDS = itertools.count(1)
+# the stack of the entered spans of each thread
+_THREAD_STATE = threading.local()
+
+
+def _get_span_stack() -> List[Span]:
+    if not (hasattr(_THREAD_STATE, "stack")):
+        _THREAD_STATE.stack = []
+    return _THREAD_STATE.stack
+
+
+def _send_span(span: Span):
+    for sink in list(_SINKS):
+        try:
+            sink(span)
+        except Exception as exception:
+            # a failing sink does not interrupt the action of the student
+            warnings.warn(
+                f"The trace sink {sink!r} raised {exception!r}.", stacklevel=3
+            )
@@ -1,8 +1,42 @@
 import re
+import reprlib
+from typing import Any
 
 from termcolor import colored
 
 
+class _SummaryRepr(reprlib.Repr):
+    """
+    A size-bounded representation that summarizes numpy arrays by their shape, dtype
+    and a few values instead of printing all elements.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.maxlist = 10
+        self.maxtuple = 10
+        self.maxdict = 10
+        self.maxset = 10
+        self.maxstring = 100
+        self.maxother = 100
+        self.max_array_items = 6
+
+    def repr_ndarray(self, obj: Any, level: int) -> str:
+        if obj.size <= self.max_array_items:
+            return repr(obj)
+        edge_items = self.max_array_items // 2
+        last_items_start = obj.size - edge_items
+        # the flat iterator does not copy the array for non-contiguous arrays
+        values = ", ".join(
+            [repr(value) for value in obj.flat[:edge_items].tolist()]
+            + ["..."]
+            + [repr(value) for value in obj.flat[last_items_start:].tolist()]
+        )
+        return f"array(shape={obj.shape}, dtype={obj.dtype}, [{values}])"
+
+    repr_memmap = repr_ndarray
+
+
 class Formatter:
     LINE_LENGTH = 120
     INFO_COLOR = "blue"
@@ -13,6 +47,29 @@ class Formatter:
     def format_title_message(message: str) -> str:
         return message.center(Formatter.LINE_LENGTH - len(message) // 2, "-")
 
+    @staticmethod
+    def summarize(value: Any, max_length: int = 200) -> str:
+        """
+        Returns a representation of the value that is at most `max_length` characters
+        long. Large containers and numpy arrays are summarized without creating their
+        full representation.
+        """
+        summary = _SUMMARY_REPR.repr(value)
+        if len(summary) > max_length:
+            summary = summary[: max_length - 3] + "..."
+        return summary
+
+    @staticmethod
+    def format_time(seconds: float) -> str:
+        """
+        Formats a duration with 3 significant digits in the largest unit of s, ms, µs
+        and ns that keeps the value at least 1.
+        """
+        for unit, scale in [("s", 1.0), ("ms", 1e-3), ("µs", 1e-6)]:
+            if seconds >= scale:
+                return f"{seconds / scale:.3g} {unit}"
+        return f"{seconds / 1e-9:.3g} ns"
+
     @staticmethod
     def break_lines(message: str) -> str:
         return "\n ".join(
@@ -44,3 +101,6 @@ class Formatter:
     @staticmethod
     def color_assert_success(message: str) -> str:
         return colored(message, "light_" + Formatter.SUCCESS_COLOR)
+
+
+_SUMMARY_REPR = _SummaryRepr()
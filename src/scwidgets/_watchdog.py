@@ -0,0 +1,262 @@
+import ctypes
+import queue
+import sys
+import threading
+import time
+import traceback
+import warnings
+from typing import Any, Callable, Dict, Optional, Type
+
+
+class ExecutionTimeoutError(TimeoutError):
+    """
+    Raised when the execution of code did not finish within its time limit.
+
+    :param timeout:
+        The time limit in seconds
+    :param stack:
+        The stack of the interrupted thread at the time of the interruption
+    """
+
+    #: The maximal number of frames of the interrupted stack in the message
+    MAX_STACK_DEPTH = 3
+
+    def __init__(self, timeout: float, stack: Optional[traceback.StackSummary] = None):
+        super().__init__(timeout, stack)
+        self.timeout = timeout
+        self.stack = traceback.StackSummary() if stack is None else stack
+
+    def __str__(self) -> str:
+        message = (
+            f"The execution did not finish within the time limit of {self.timeout:g} "
+            "s and was interrupted"
+        )
+        if len(self.stack) == 0:
+            return message + "."
+        start = max(len(self.stack) - self.MAX_STACK_DEPTH, 0)
+        location = "".join(traceback.format_list(self.stack[start:]))
+        return message + f" while executing\n{location.rstrip()}"
+
+    @property
+    def lineno(self) -> Optional[int]:
+        """
+        The line that was executed when the code was interrupted.
+        """
+        return self.stack[-1].lineno if len(self.stack) > 0 else None
+
+
+class _Interrupt(BaseException):
+    """
+    Raised asynchronously in the thread that exceeded its time limit. It derives from
+    `BaseException`, so it is not caught by `except Exception` clauses of the code.
+    """
+
+    #: The deadline of the call, set on the separate interrupt type of each call
+    deadline: "_Deadline"
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        # the exception is created in the interrupted thread when it is raised, the
+        # next interrupt is only sent after this one has been raised
+        self.deadline.nb_raised_interrupts += 1
+        self.deadline.deadline = time.monotonic() + _Watchdog.RETRY_INTERVAL
+
+
+class _Deadline:
+    __slots__ = (
+        "thread_id",
+        "deadline",
+        "stack",
+        "nb_sent_interrupts",
+        "nb_raised_interrupts",
+        "interrupt_type",
+    )
+
+    def __init__(self, thread_id: int, deadline: float):
+        self.thread_id = thread_id
+        self.deadline = deadline
+        self.stack: Optional[traceback.StackSummary] = None
+        self.nb_sent_interrupts = 0
+        self.nb_raised_interrupts = 0
+        # a separate type for each call, so nested time limits only catch their own
+        # interrupt
+        self.interrupt_type: Type[_Interrupt] = type(
+            "_Interrupt", (_Interrupt,), {"deadline": self}
+        )
+
+
+class _Watchdog:
+    """
+    A daemon thread that interrupts the threads whose deadline is exceeded. One
+    thread serves all deadlines, so a time limit only costs a lock acquisition.
+
+    The interrupted thread only uses a lock and a queue implemented in C, so an
+    interrupt raised while it adds or removes a deadline cannot leave them in an
+    inconsistent state, as it could for example with a :py:class:`threading.Condition`.
+    """
+
+    #: The interval in seconds after which an interrupt is raised again, in case the
+    #: code caught it with a bare except clause. An interrupt is only sent again after
+    #: the previous one has been raised, so at most one is pending at any time.
+    RETRY_INTERVAL = 0.1
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # wakes up the watchdog thread when a deadline is added
+        self._wake_up: queue.SimpleQueue = queue.SimpleQueue()
+        self._deadlines: Dict[int, _Deadline] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, deadline: _Deadline):
+        with self._lock:
+            self._deadlines[id(deadline)] = deadline
+        if self._thread is None or not (self._thread.is_alive()):
+            self._thread = threading.Thread(
+                target=self._run, name="scwidgets-watchdog", daemon=True
+            )
+            self._thread.start()
+        self._wake_up.put(None)
+
+    def remove(self, deadline: _Deadline) -> bool:
+        """
+        Stops sending interrupts for the deadline.
+
+        :return:
+            If no sent interrupt is pending, so no interrupt can be raised anymore
+        """
+        with self._lock:
+            self._deadlines.pop(id(deadline), None)
+            return deadline.nb_sent_interrupts == deadline.nb_raised_interrupts
+
+    def _run(self):
+        timeout = None
+        while True:
+            try:
+                self._wake_up.get(timeout=timeout)
+            except queue.Empty:
+                pass
+            with self._lock:
+                now = time.monotonic()
+                for deadline in self._deadlines.values():
+                    if deadline.deadline > now:
+                        continue
+                    if deadline.nb_sent_interrupts == deadline.nb_raised_interrupts:
+                        self._interrupt(deadline)
+                        deadline.nb_sent_interrupts += 1
+                    # checks again later if the interrupt has not been raised yet
+                    deadline.deadline = now + self.RETRY_INTERVAL
+                timeout = (
+                    None
+                    if len(self._deadlines) == 0
+                    else max(
+                        min(deadline.deadline for deadline in self._deadlines.values())
+                        - now,
+                        0.0,
+                    )
+                )
+
+    @staticmethod
+    def _interrupt(deadline: _Deadline):
+        if deadline.stack is None:
+            frame = sys._current_frames().get(deadline.thread_id)
+            deadline.stack = (
+                traceback.StackSummary()
+                if frame is None
+                else traceback.extract_stack(frame)
+            )
+        _set_async_exception(deadline.thread_id, deadline.interrupt_type)
+
+
+_WATCHDOG = _Watchdog()
+
+
+#: Raising an exception in another thread requires the C API of CPython
+_TIME_LIMITS_SUPPORTED = hasattr(ctypes, "pythonapi")
+_warned_time_limits_unsupported = False
+
+
+def _set_async_exception(thread_id: int, exception_type: type):
+    ctypes.pythonapi.PyThreadState_SetAsyncExc(
+        ctypes.c_ulong(thread_id), ctypes.py_object(exception_type)
+    )
+
+
+def _raise_pending_interrupt():
+    """
+    Runs a few bytecode jumps, so an interrupt that was scheduled but not raised yet
+    is raised. Clearing a scheduled exception with `PyThreadState_SetAsyncExc` is not
+    an option, because it leaves the interpreter in a state that hangs the next
+    traced function call on CPython 3.11.
+    """
+    for _ in range(2):
+        pass
+
+
+def call_with_time_limit(
+    timeout: Optional[float], function: Callable[..., Any], *args, **kwargs
+) -> Any:
+    """
+    Calls the function with the given arguments and interrupts it if it does not
+    finish within `timeout` seconds by raising an :py:class:`ExecutionTimeoutError`.
+    The function is interrupted by raising an exception asynchronously in the
+    executing thread, so the kernel state is kept. Blocking calls into C code like
+    `time.sleep` or large numpy operations are only interrupted when they return.
+
+    The time limit is not offered as a context manager, because an interrupt raised
+    right when the code finished would be raised in the exit of the context manager
+    where it cannot be caught.
+
+    Time limits require CPython, on other implementations the function is called
+    without time limit and a warning is shown once.
+
+    :param timeout:
+        The time limit in seconds, `None` disables the time limit
+    :param function:
+        The function to call
+    :return:
+        The output of the function
+    """
+    global _warned_time_limits_unsupported
+    if timeout is None:
+        return function(*args, **kwargs)
+    if not (_TIME_LIMITS_SUPPORTED):
+        if not (_warned_time_limits_unsupported):
+            _warned_time_limits_unsupported = True
+            warnings.warn(
+                "Time limits are only supported on CPython, the code is run without "
+                "time limit.",
+                RuntimeWarning,
+                stacklevel=2,
+            )
+        return function(*args, **kwargs)
+
+    deadline = _Deadline(threading.get_ident(), time.monotonic() + timeout)
+    interrupt_type = deadline.interrupt_type
+    output = None
+    error: Optional[BaseException] = None
+    is_called = False
+    _WATCHDOG.add(deadline)
+    # all statements are protected by the except clause until the watchdog confirms
+    # that no interrupt is pending anymore, so an interrupt raised right when the
+    # function finished or while a previous interrupt is handled does not escape
+    while True:
+        try:
+            if not (is_called):
+                is_called = True
+                try:
+                    output = function(*args, **kwargs)
+                except interrupt_type:
+                    raise
+                except BaseException as exception:  # noqa: B036
+                    # raised after the time limit has been removed
+                    error = exception
+            if _WATCHDOG.remove(deadline):
+                break
+            _raise_pending_interrupt()
+        except interrupt_type:
+            pass
+    if error is not None:
+        raise error
+    if deadline.stack is not None:
+        raise ExecutionTimeoutError(timeout, deadline.stack)
+    return output
@@ -1,17 +1,59 @@
-from ._asserts import (
-    assert_equal,
-    assert_numpy_allclose,
-    assert_numpy_floating_sub_dtype,
-    assert_numpy_sub_dtype,
-    assert_shape,
-    assert_type,
+from typing import TYPE_CHECKING
+
+from .._lazy_import import attach_lazy_attributes
+
+if TYPE_CHECKING:
+    from .._watchdog import ExecutionTimeoutError
+    from ._asserts import (
+        assert_equal,
+        assert_equal_chunked,
+        assert_numpy_allclose,
+        assert_numpy_allclose_chunked,
+        assert_numpy_floating_sub_dtype,
+        assert_numpy_sub_dtype,
+        assert_shape,
+        assert_shape_chunked,
+        assert_type,
+    )
+    from ._check import AssertResult, Check, CheckResult, CheckTiming
+    from ._fingerprints import fingerprint_blake2b
+    from ._performance_asserts import (
+        assert_complexity,
+        assert_peak_memory_within,
+        assert_runtime_within,
+    )
+    from ._widget_check_registry import CheckableWidget, CheckRegistry
+
+__getattr__, __dir__ = attach_lazy_attributes(
+    __name__,
+    {
+        "ExecutionTimeoutError": ".._watchdog",
+        "assert_equal": "._asserts",
+        "assert_equal_chunked": "._asserts",
+        "assert_numpy_allclose": "._asserts",
+        "assert_numpy_allclose_chunked": "._asserts",
+        "assert_numpy_floating_sub_dtype": "._asserts",
+        "assert_numpy_sub_dtype": "._asserts",
+        "assert_shape": "._asserts",
+        "assert_shape_chunked": "._asserts",
+        "assert_type": "._asserts",
+        "AssertResult": "._check",
+        "Check": "._check",
+        "CheckResult": "._check",
+        "CheckTiming": "._check",
+        "fingerprint_blake2b": "._fingerprints",
+        "assert_complexity": "._performance_asserts",
+        "assert_peak_memory_within": "._performance_asserts",
+        "assert_runtime_within": "._performance_asserts",
+        "CheckableWidget": "._widget_check_registry",
+        "CheckRegistry": "._widget_check_registry",
+    },
 )
-from ._check import AssertResult, Check, CheckResult
-from ._widget_check_registry import CheckableWidget, CheckRegistry
 
 __all__ = [
     "Check",
     "CheckResult",
+    "CheckTiming",
     "AssertResult",
     "CheckRegistry",
     "CheckableWidget",
@@ -21,4 +63,12 @@ __all__ = [
     "assert_type",
     "assert_numpy_floating_sub_dtype",
     "assert_numpy_sub_dtype",
+    "assert_equal_chunked",
+    "assert_shape_chunked",
+    "assert_numpy_allclose_chunked",
+    "fingerprint_blake2b",
+    "assert_runtime_within",
+    "assert_peak_memory_within",
+    "assert_complexity",
+    "ExecutionTimeoutError",
 ]
@@ -1,10 +1,16 @@
 import functools
 from collections import abc
-from typing import Iterable, Union
+from typing import Any, Iterable, List, NamedTuple, Optional, Tuple, Union
 
 import numpy as np
 
-from ._check import AssertResult, Check
+from ._check import (
+    AssertResult,
+    Check,
+    OutputsReferences,
+    StackedOutputsReferences,
+    is_numeric,
+)
 
 AssertFunctionOutputT = Union[str, AssertResult]
 
@@ -122,8 +128,10 @@ def assert_numpy_allclose(
     equal_nan=False,
 ) -> AssertResult:
     """
-    Check if output_parameters are numerically close to output_references using
-    numpy.allclose().
+    Check if output_parameters are numerically close to output_references using the
+    same criterion as numpy.allclose(). The closeness and the error statistics are
+    computed in one pass over blocks of the arrays, so no full-size temporary arrays
+    are allocated. In the "auto" mode only references that are numeric are checked.
     """
     assert len(output_parameters) == len(
         output_references
@@ -132,13 +140,15 @@ def assert_numpy_allclose(
     parameter_indices: Iterable[int]
     if isinstance(parameters_to_check, str):
         if parameters_to_check == "auto":
-            parameter_indices = []
-            for i in range(len(output_references)):
-                try:
-                    np.allclose(output_references[i], output_references[i])
-                    parameter_indices.append(i)
-                except Exception:
-                    pass
+            if isinstance(output_references, OutputsReferences):
+                # precomputed once by the check
+                parameter_indices = output_references.numeric_indices
+            else:
+                parameter_indices = [
+                    i
+                    for i in range(len(output_references))
+                    if is_numeric(output_references[i])
+                ]
         elif parameters_to_check == "all":
             parameter_indices = range(len(output_parameters))
         else:
@@ -158,44 +168,466 @@ def assert_numpy_allclose(
     failed_parameter_values = []
     messages = []
     for i in parameter_indices:
-        is_allclose = np.allclose(
+        statistics = _allclose_statistics(
             output_parameters[i],
             output_references[i],
-            atol=atol,
             rtol=rtol,
+            atol=atol,
             equal_nan=equal_nan,
         )
 
-        if not (is_allclose):
-            output_parameters_i_arr = np.asarray(output_parameters[i])
-            output_references_i_arr = np.asarray(output_references[i])
-
-            diff = np.abs(output_parameters_i_arr - output_references_i_arr)
-            abs_diff = np.sum(diff)
-            rel_diff_dividend = np.max(
-                np.vstack(
-                    (
-                        np.abs(output_parameters_i_arr),
-                        np.abs(output_references_i_arr),
-                    )
-                ),
-                axis=0,
+        if statistics.nb_not_close > 0:
+            failed_parameter_indices.append(i)
+            failed_parameter_values.append(output_parameters[i])
+            messages.append(_allclose_message(statistics))
+
+    return AssertResult(
+        assert_name="assert_numpy_allclose",
+        parameter_indices=failed_parameter_indices,
+        parameter_values=failed_parameter_values,
+        messages=messages,
+    )
+
+
+def _assert_numpy_allclose_batched(
+    outputs_parameters: Check.FunOutParamsT,
+    outputs_references: StackedOutputsReferences,
+    parameters_to_check: Union[Iterable[int], str] = "auto",
+    rtol=1e-05,
+    atol=1e-08,
+    equal_nan=False,
+) -> List[AssertResult]:
+    """
+    The vectorized variant of :func:`assert_numpy_allclose` for the batched mode of
+    :py:class:`Check`. The outputs and references are stacked along the first
+    dimension, one result is returned for each input of the batch. The closeness of
+    the whole batch is computed with one numpy call, the error statistics are only
+    computed for the inputs that failed.
+    """
+    assert len(outputs_parameters) == len(
+        outputs_references
+    ), "output_parameters and output_references have to have the same length"
+    references_per_input = outputs_references.outputs_references
+    nb_inputs = len(references_per_input)
+
+    parameter_indices = _get_parameter_indices(
+        parameters_to_check, outputs_parameters, outputs_references.numeric_indices
+    )
+
+    failed_parameter_indices: List[List[int]] = [[] for _ in range(nb_inputs)]
+    failed_parameter_values: List[List[Any]] = [[] for _ in range(nb_inputs)]
+    messages: List[List[str]] = [[] for _ in range(nb_inputs)]
+    for i in parameter_indices:
+        outputs = outputs_parameters[i]
+        references = outputs_references[i]
+        if (
+            isinstance(outputs, np.ndarray)
+            and isinstance(references, np.ndarray)
+            and outputs.shape == references.shape
+            and outputs.dtype.kind in "biufc"
+        ):
+            is_close = np.isclose(
+                outputs, references, rtol=rtol, atol=atol, equal_nan=equal_nan
+            ).reshape(nb_inputs, -1)
+            failed_inputs = np.flatnonzero(~is_close.all(axis=1))
+        else:
+            failed_inputs = np.arange(nb_inputs)
+
+        for k in failed_inputs:
+            statistics = _allclose_statistics(
+                outputs[k],
+                references_per_input[k][i],
+                rtol=rtol,
+                atol=atol,
+                equal_nan=equal_nan,
+            )
+            if statistics.nb_not_close > 0:
+                failed_parameter_indices[k].append(i)
+                failed_parameter_values[k].append(outputs[k])
+                messages[k].append(_allclose_message(statistics))
+
+    return [
+        AssertResult(
+            assert_name="assert_numpy_allclose",
+            parameter_indices=failed_parameter_indices[k],
+            parameter_values=failed_parameter_values[k],
+            messages=messages[k],
+        )
+        for k in range(nb_inputs)
+    ]
+
+
+assert_numpy_allclose.batched = _assert_numpy_allclose_batched  # type: ignore
+
+
+class _AllcloseStatistics(NamedTuple):
+    nb_not_close: int
+    size: int
+    abs_diff: float
+    rel_diff: float
+    # the flat index of the first value that is not close
+    first_not_close_index: Optional[int] = None
+    # the number of values that have been compared, smaller than the size if the
+    # comparison stopped at the first failing block
+    nb_compared: int = 0
+
+
+def _allclose_message(statistics: _AllcloseStatistics) -> str:
+    return (
+        f"Output is not close to reference absolute difference "
+        f"is {statistics.abs_diff}, relative difference is "
+        f"{statistics.rel_diff}. {statistics.nb_not_close} of "
+        f"{statistics.size} values are not close."
+    )
+
+
+#: The number of elements that are compared at once
+ALLCLOSE_BLOCK_SIZE = 2**16
+
+
+def _flat_block(array: np.ndarray, start: int, stop: int) -> np.ndarray:
+    if array.flags.c_contiguous:
+        # a view for contiguous arrays
+        return array.reshape(-1)[start:stop]
+    # the flat iterator only copies the block for non-contiguous arrays
+    return array.flat[start:stop]
+
+
+def _as_array(value: Any) -> np.ndarray:
+    """
+    Converts the value to a numpy array without copying numpy arrays, memory-mapped
+    arrays and objects supporting the buffer protocol.
+    """
+    if isinstance(value, np.ndarray):
+        return value
+    try:
+        # wraps the buffer of the object without copying
+        return np.asarray(memoryview(value))
+    except TypeError:
+        return np.asarray(value)
+
+
+def _supports_buffer(value: Any) -> bool:
+    if isinstance(value, np.ndarray):
+        return True
+    try:
+        memoryview(value)
+        return True
+    except TypeError:
+        return False
+
+
+def _allclose_statistics(
+    output: Any,
+    reference: Any,
+    rtol: float,
+    atol: float,
+    equal_nan: bool,
+    block_size: int = ALLCLOSE_BLOCK_SIZE,
+    stop_on_first_failure: bool = False,
+) -> _AllcloseStatistics:
+    """
+    Computes the number of values that are not close with the criterion of
+    `numpy.isclose` together with the sum of the absolute and relative difference.
+    The arrays are processed in blocks of `block_size` elements, so the temporary
+    arrays are bounded by the block size. With `stop_on_first_failure` the
+    computation stops after the first block containing values that are not close.
+    """
+    output = _as_array(output)
+    reference = _as_array(reference)
+    if output.shape != reference.shape:
+        # raises an error if the shapes cannot be broadcasted like numpy.allclose
+        output, reference = np.broadcast_arrays(output, reference)
+    dtype = np.result_type(output.dtype, reference.dtype, np.float64)
+    is_inexact = np.issubdtype(dtype, np.inexact)
+
+    nb_not_close = 0
+    first_not_close_index = None
+    abs_diff = 0.0
+    rel_diff = 0.0
+    stop = 0
+    with np.errstate(invalid="ignore", over="ignore", divide="ignore"):
+        for start in range(0, output.size, block_size):
+            stop = min(start + block_size, output.size)
+            output_block = _flat_block(output, start, stop).astype(dtype, copy=False)
+            reference_block = _flat_block(reference, start, stop).astype(
+                dtype, copy=False
             )
-            # when both are zero the diff is also zero, so we set it to 1
+
+            diff = np.abs(output_block - reference_block)
+            abs_reference = np.abs(reference_block)
+            close = diff <= atol + rtol * abs_reference
+            if is_inexact:
+                # an infinite reference would make every finite output close
+                close &= np.isfinite(abs_reference)
+            if not (close.all()):
+                # infinite values are only close when they are equal, and nan values
+                # if equal_nan is set, we only correct the not close values
+                not_close_indices = np.flatnonzero(~close)
+                output_not_close = output_block[not_close_indices]
+                reference_not_close = reference_block[not_close_indices]
+                corrected = output_not_close == reference_not_close
+                if equal_nan and is_inexact:
+                    corrected |= np.isnan(output_not_close) & np.isnan(
+                        reference_not_close
+                    )
+                not_close_indices = not_close_indices[~corrected]
+                if first_not_close_index is None and len(not_close_indices) > 0:
+                    first_not_close_index = start + int(not_close_indices[0])
+                nb_not_close += len(not_close_indices)
+
+            abs_diff += np.sum(diff)
+            # when both are zero the diff is also zero, so we set the divisor to 1
             # so no division by zero error is raised
-            rel_diff_dividend[rel_diff_dividend == 0.0] = 1.0
-            rel_diff = np.sum(diff / rel_diff_dividend)
+            rel_diff_divisor = np.maximum(np.abs(output_block), abs_reference)
+            rel_diff_divisor[rel_diff_divisor == 0.0] = 1.0
+            rel_diff += np.sum(diff / rel_diff_divisor)
+
+            if stop_on_first_failure and nb_not_close > 0:
+                break
+
+    return _AllcloseStatistics(
+        nb_not_close,
+        output.size,
+        abs_diff,
+        rel_diff,
+        first_not_close_index,
+        stop,
+    )
+
 
+def _get_parameter_indices(
+    parameters_to_check: Union[Iterable[int], str],
+    output_parameters: Check.FunOutParamsT,
+    auto_indices: Optional[Iterable[int]] = None,
+) -> Iterable[int]:
+    if isinstance(parameters_to_check, str):
+        if parameters_to_check == "all":
+            return range(len(output_parameters))
+        elif parameters_to_check == "auto" and auto_indices is not None:
+            return auto_indices
+        accepted = '"all" and "auto" are' if auto_indices is not None else '"all" is'
+        raise ValueError(
+            f'Got parameters_to_check="{parameters_to_check}" but only {accepted} '
+            "accepted as string"
+        )
+    elif isinstance(parameters_to_check, abc.Iterable):
+        return parameters_to_check
+    raise TypeError(
+        "Only str and Iterable are accepted for parameters_to_check, "
+        f"but got type {type(parameters_to_check)}."
+    )
+
+
+def _format_index(shape: Tuple[int, ...], flat_index: int) -> str:
+    if len(shape) <= 1:
+        return str(flat_index)
+    return str(tuple(int(i) for i in np.unravel_index(flat_index, shape)))
+
+
+def assert_numpy_allclose_chunked(
+    output_parameters: Check.FunOutParamsT,
+    output_references: Check.FunOutParamsT,
+    parameters_to_check: Union[Iterable[int], str] = "auto",
+    rtol=1e-05,
+    atol=1e-08,
+    equal_nan=False,
+    block_size: int = ALLCLOSE_BLOCK_SIZE,
+    stop_on_first_failure: bool = True,
+) -> AssertResult:
+    """
+    Check if output_parameters are numerically close to output_references like
+    :func:`assert_numpy_allclose`, but comparing blocks of `block_size` elements so
+    the memory usage is bounded for very large outputs. Memory-mapped arrays
+    (`numpy.memmap`) and objects supporting the buffer protocol are compared without
+    loading them as a whole.
+
+    :param block_size:
+        The number of elements compared at once
+    :param stop_on_first_failure:
+        Stops comparing an output at the first block containing values that are not
+        close. The message then only reports the values compared until then.
+    """
+    assert len(output_parameters) == len(
+        output_references
+    ), "output_parameters and output_references have to have the same length"
+
+    if isinstance(output_references, OutputsReferences):
+        auto_indices: Iterable[int] = output_references.numeric_indices
+    else:
+        auto_indices = [
+            i
+            for i in range(len(output_references))
+            if _supports_buffer(output_references[i])
+            or is_numeric(output_references[i])
+        ]
+    parameter_indices = _get_parameter_indices(
+        parameters_to_check, output_parameters, auto_indices
+    )
+
+    failed_parameter_indices = []
+    failed_parameter_values = []
+    messages = []
+    for i in parameter_indices:
+        output = _as_array(output_parameters[i])
+        reference = _as_array(output_references[i])
+        statistics = _allclose_statistics(
+            output,
+            reference,
+            rtol=rtol,
+            atol=atol,
+            equal_nan=equal_nan,
+            block_size=block_size,
+            stop_on_first_failure=stop_on_first_failure,
+        )
+
+        if statistics.nb_not_close > 0:
+            assert statistics.first_not_close_index is not None
+            shape = np.broadcast_shapes(output.shape, reference.shape)
             message = (
-                f"Output is not close to reference absolute difference "
-                f"is {abs_diff}, relative difference is {rel_diff}."
+                "Output is not close to reference, first at index "
+                f"{_format_index(shape, statistics.first_not_close_index)}. "
+                f"{statistics.nb_not_close} of {statistics.nb_compared} compared "
+                f"values are not close, absolute difference is "
+                f"{statistics.abs_diff}, relative difference is "
+                f"{statistics.rel_diff}."
             )
+            if statistics.nb_compared < statistics.size:
+                message += (
+                    f" Stopped comparing after {statistics.nb_compared} of "
+                    f"{statistics.size} values."
+                )
             failed_parameter_indices.append(i)
             failed_parameter_values.append(output_parameters[i])
             messages.append(message)
 
     return AssertResult(
-        assert_name="assert_numpy_allclose",
+        assert_name="assert_numpy_allclose_chunked",
+        parameter_indices=failed_parameter_indices,
+        parameter_values=failed_parameter_values,
+        messages=messages,
+    )
+
+
+def assert_equal_chunked(
+    output_parameters: Check.FunOutParamsT,
+    output_references: Check.FunOutParamsT,
+    parameters_to_check: Union[Iterable[int], str] = "all",
+    block_size: int = ALLCLOSE_BLOCK_SIZE,
+    stop_on_first_failure: bool = True,
+) -> AssertResult:
+    """
+    Check if output_parameters are equal to output_references like
+    :func:`assert_equal`. Numpy arrays, memory-mapped arrays and objects supporting
+    the buffer protocol are compared elementwise in blocks of `block_size` elements,
+    so the memory usage is bounded for very large outputs. Other outputs are compared
+    with the Python equality check.
+
+    :param block_size:
+        The number of elements compared at once
+    :param stop_on_first_failure:
+        Stops comparing an output at the first block containing different values
+    """
+    assert len(output_parameters) == len(
+        output_references
+    ), "output_parameters and output_references have to have the same length"
+
+    parameter_indices = _get_parameter_indices(parameters_to_check, output_parameters)
+
+    failed_parameter_indices = []
+    failed_parameter_values = []
+    messages = []
+    for i in parameter_indices:
+        if not (
+            _supports_buffer(output_parameters[i])
+            and _supports_buffer(output_references[i])
+        ):
+            if not output_parameters[i] == output_references[i]:
+                failed_parameter_indices.append(i)
+                failed_parameter_values.append(output_parameters[i])
+                messages.append(
+                    f"Expected {output_references[i]} but got {output_parameters[i]}."
+                )
+            continue
+
+        output = _as_array(output_parameters[i])
+        reference = _as_array(output_references[i])
+        if output.shape != reference.shape:
+            message = f"Expected shape {reference.shape} but got {output.shape}."
+        else:
+            nb_not_equal = 0
+            first_not_equal_index = None
+            stop = 0
+            for start in range(0, output.size, block_size):
+                stop = min(start + block_size, output.size)
+                not_equal = _flat_block(output, start, stop) != _flat_block(
+                    reference, start, stop
+                )
+                if not_equal.any():
+                    not_equal_indices = np.flatnonzero(not_equal)
+                    if first_not_equal_index is None:
+                        first_not_equal_index = start + int(not_equal_indices[0])
+                    nb_not_equal += len(not_equal_indices)
+                    if stop_on_first_failure:
+                        break
+            if first_not_equal_index is None:
+                continue
+            message = (
+                "Output is not equal to reference, first at index "
+                f"{_format_index(output.shape, first_not_equal_index)}. "
+                f"{nb_not_equal} of {stop} compared values are not equal."
+            )
+            if stop < output.size:
+                message += f" Stopped comparing after {stop} of {output.size} values."
+        failed_parameter_indices.append(i)
+        failed_parameter_values.append(output_parameters[i])
+        messages.append(message)
+
+    return AssertResult(
+        assert_name="assert_equal_chunked",
+        parameter_indices=failed_parameter_indices,
+        parameter_values=failed_parameter_values,
+        messages=messages,
+    )
+
+
+def assert_shape_chunked(
+    output_parameters: Check.FunOutParamsT,
+    output_references: Check.FunOutParamsT,
+    parameters_to_check: Union[Iterable[int], str] = "auto",
+) -> AssertResult:
+    """
+    Check that the shape of output parameters matches the reference like
+    :func:`assert_shape`. Objects supporting the buffer protocol are accepted, their
+    shape is read from the buffer without copying the data.
+    """
+    assert len(output_parameters) == len(
+        output_references
+    ), "output_parameters and output_references have to have the same length"
+
+    auto_indices = [
+        i
+        for i in range(len(output_references))
+        if hasattr(output_references[i], "shape")
+        or _supports_buffer(output_references[i])
+    ]
+    parameter_indices = _get_parameter_indices(
+        parameters_to_check, output_parameters, auto_indices
+    )
+
+    failed_parameter_indices = []
+    failed_parameter_values = []
+    messages = []
+    for i in parameter_indices:
+        output_shape = np.shape(_as_array(output_parameters[i]))
+        reference_shape = np.shape(_as_array(output_references[i]))
+        if output_shape != reference_shape:
+            failed_parameter_indices.append(i)
+            failed_parameter_values.append(output_parameters[i])
+            messages.append(f"Expected shape {reference_shape} but got {output_shape}.")
+
+    return AssertResult(
+        assert_name="assert_shape_chunked",
         parameter_indices=failed_parameter_indices,
         parameter_values=failed_parameter_values,
         messages=messages,
@@ -4,17 +4,38 @@ from __future__ import annotations
 
 import functools
 import inspect
-import re
+import numbers
 import sys
+import time
+import tracemalloc
 import types
-from copy import deepcopy
+import weakref
+from collections import abc
+from contextlib import contextmanager
 from platform import python_version
-from types import TracebackType
-from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, Union
+from types import MappingProxyType, TracebackType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 import IPython.core.ultratb
+import numpy as np
 
+from .._tracing import trace_span, traced
 from .._utils import Formatter
+from .._watchdog import ExecutionTimeoutError, call_with_time_limit
 
 ExecutionInfo = Tuple[
     Union[None, type],  # BaseException type
@@ -23,6 +44,39 @@ ExecutionInfo = Tuple[
 ]
 
 
+#: The name of the assert result that reports modified input parameters
+INPUTS_UNCHANGED_ASSERT_NAME = "assert_inputs_unchanged"
+#: The name of the assert result that reports a function exceeding the time limit
+TIMEOUT_ASSERT_NAME = "assert_within_timeout"
+
+
+class CheckTiming(NamedTuple):
+    """
+    The wall time and optionally the peak memory of one stage of
+    :py:meth:`Check.check_function`.
+
+    :param stage:
+        One of "function", "fingerprint" or "assert"
+    :param name:
+        The name of the function that was run in the stage
+    :param input_index:
+        The index of the input parameters the stage was run for, `None` for stages
+        that are independent of the inputs (nullvariate asserts) or run for a batch of
+        inputs (batched mode)
+    :param wall_time:
+        The wall time in seconds
+    :param peak_memory:
+        The peak of the traced memory allocations in bytes, `None` if the peak memory
+        was not recorded
+    """
+
+    stage: str
+    name: str
+    input_index: Optional[int]
+    wall_time: float
+    peak_memory: Optional[int]
+
+
 class Check:
     """
     A check verifies the correctness of a function for a set of input parameters using
@@ -44,7 +98,11 @@ class Check:
         arguments). If output references have been set, it can take additional output
         references to compare with. If a fingerprint is given, the it is compared while
         assert functions with a single argument are always applied on the output
-        parameters.
+        parameters. Assert functions whose first parameter is named
+        `function_to_check` are function asserts that receive the function itself,
+        for example to measure its runtime. With a second positional parameter they
+        are run for each input with the input parameters, otherwise once per check
+        after all other asserts.
     :param fingerprint:
         A one-way function that transforms the outputs from `function_to_check`,
         obscuring direct comparisons with the `output_references`.
@@ -56,6 +114,38 @@ class Check:
         Specifies if running the asserts is stopped as soon as an error is raised in an
         assert. If a lot of asserts are specified, the printing of a lot of error
         tracebacks might make debugging harder.
+    :param record_peak_memory:
+        Specifies if the peak memory of the function call, the fingerprint and each
+        assert is recorded in addition to the wall time using `tracemalloc`. Tracing
+        memory allocations slows down the execution considerably.
+    :param batched:
+        Specifies if the function is called once for a batch of inputs instead of
+        once per input. The values of each input parameter are stacked along a new
+        first dimension with `numpy.stack`, parameters that are the identical object
+        for all inputs are passed without stacking. A check with a single input stacks
+        all parameters. The function must return outputs
+        with the batch as first dimension, they are split back per input for the
+        asserts. Bivariate asserts that provide a vectorized variant as `batched`
+        attribute (e.g. :py:func:`assert_numpy_allclose`) are run once per batch on
+        the stacked outputs and references if no fingerprint is given.
+    :param batch_size:
+        The maximal number of inputs per batch in the batched mode, `None` puts all
+        inputs into one batch.
+    :param timeout:
+        The time limit in seconds for each call of the function to check, `None`
+        disables the limit. A call exceeding the limit is interrupted and reported as
+        failed assert with the line that was executed, see
+        :py:class:`ExecutionTimeoutError`. Function asserts like
+        :py:func:`assert_runtime_within` are not limited, so they are skipped for
+        the input of a call exceeding the limit and function asserts without inputs
+        like :py:func:`assert_complexity` are skipped if any call exceeded it.
+
+    The input parameters and output references are stored without copying as
+    read-only data: numpy arrays are stored as read-only views and the parameters of
+    each input as read-only mapping. The function to check receives the read-only
+    arrays and fresh copies of list, dict and set containers, so a function that
+    modifies its input parameters is reported as failed check instead of corrupting
+    the inputs of later runs.
     """
 
     FunInParamT = TypeVar("FunInParamT", bound=Any)
@@ -74,7 +164,7 @@ class Check:
         function_to_check: Callable[..., FunOutParamsT],
         asserts: Union[List[AssertFunT], AssertFunT],
         inputs_parameters: Optional[
-            Union[List[Dict[str, FunInParamT]], Dict[str, FunInParamT]]
+            Union[List[Mapping[str, FunInParamT]], Mapping[str, FunInParamT]]
         ] = None,
         outputs_references: Optional[Union[List[tuple], tuple]] = None,
         fingerprint: Optional[
@@ -82,25 +172,48 @@ class Check:
         ] = None,
         suppress_fingerprint_asserts: bool = True,
         stop_on_assert_error_raised: bool = True,
+        record_peak_memory: bool = False,
+        batched: bool = False,
+        batch_size: Optional[int] = None,
+        timeout: Optional[float] = None,
     ):
         self._function_to_check = function_to_check
         self._asserts = []
         self._nullvariate_asserts: List[Callable[[], str]] = []
         self._univariate_asserts: List[Callable[[tuple], str]] = []
         self._bivariate_asserts = []
+        self._function_asserts: List[Callable[..., Any]] = []
+        self._input_function_asserts: List[Callable[..., Any]] = []
         if not (isinstance(asserts, list)):
             asserts = [asserts]
 
         for i, assert_f in enumerate(asserts):
+            parameters = list(inspect.signature(assert_f).parameters.values())
             nb_positional_arguments = len(
                 [
-                    parameters
-                    for parameters in inspect.signature(assert_f).parameters.values()
-                    if parameters.default is inspect._empty
+                    parameter
+                    for parameter in parameters
+                    if parameter.default is inspect._empty
                 ]
             )
             self._asserts.append(assert_f)
-            if nb_positional_arguments == 0:
+            if len(parameters) > 0 and parameters[0].name == "function_to_check":
+                if nb_positional_arguments == 1:
+                    self._function_asserts.append(assert_f)
+                elif nb_positional_arguments == 2:
+                    if inputs_parameters is None:
+                        raise ValueError(
+                            "For function asserts taking the input parameters we need "
+                            "inputs_parameters."
+                        )
+                    self._input_function_asserts.append(assert_f)
+                else:
+                    raise ValueError(
+                        "Only function asserts with 1 or 2 positional arguments are "
+                        f"allowed but assert function {i} has "
+                        f"{nb_positional_arguments} positional arguments"
+                    )
+            elif nb_positional_arguments == 0:
                 self._nullvariate_asserts.append(assert_f)  # type: ignore[arg-type]
             elif nb_positional_arguments == 1:
                 if inputs_parameters is None:
@@ -126,7 +239,7 @@ class Check:
 
         # We cannot verify if the number of input argumets match because they can be
         # hidden in **kwargs
-        if isinstance(inputs_parameters, dict):
+        if isinstance(inputs_parameters, abc.Mapping):
             inputs_parameters = [inputs_parameters]
 
         if inputs_parameters is not None and outputs_references is not None:
@@ -138,13 +251,36 @@ class Check:
                 f"[{len(inputs_parameters)} != {len(outputs_references)}]."
             )
 
-        self._inputs_parameters = [] if inputs_parameters is None else inputs_parameters
-        self._outputs_references = (
-            [] if outputs_references is None else outputs_references
+        # a parameter object passed to several inputs gets the same read-only view, so
+        # it is still recognized as shared in the batched mode
+        read_only_values: Dict[int, Tuple[Any, Any]] = {}
+        self._inputs_parameters: List[Mapping[str, Any]] = (
+            []
+            if inputs_parameters is None
+            else [
+                _read_only_mapping(input_parameters, read_only_values)
+                for input_parameters in inputs_parameters
+            ]
+        )
+        self._outputs_references: List[OutputsReferences] = (
+            []
+            if outputs_references is None
+            else [
+                OutputsReferences(output_references)
+                for output_references in outputs_references
+            ]
         )
         self._fingerprint = fingerprint
         self._suppress_fingerprint_asserts = suppress_fingerprint_asserts
         self._stop_on_assert_error_raised = stop_on_assert_error_raised
+        self._record_peak_memory = record_peak_memory
+        if batch_size is not None and batch_size < 1:
+            raise ValueError(f"batch_size must be positive but got {batch_size}.")
+        self._batched = batched
+        self._batch_size = batch_size
+        self._timeout = timeout
+        # the stacked inputs and references of each batch, computed on first use
+        self._batches: Optional[List[_Batch]] = None
 
     @property
     def function_to_check(self) -> Callable[..., FunOutParamsT]:
@@ -156,42 +292,106 @@ class Check:
 
     @property
     def fingerprint(self):
-        return deepcopy(self._fingerprint)
+        return self._fingerprint
 
     @property
     def asserts(self):
-        return deepcopy(self._asserts)
+        return list(self._asserts)
 
     @property
     def nullvariate_asserts(self):
-        return deepcopy(self._nullvariate_asserts)
+        return list(self._nullvariate_asserts)
 
     @property
     def univariate_asserts(self):
-        return deepcopy(self._univariate_asserts)
+        return list(self._univariate_asserts)
 
     @property
     def bivariate_asserts(self):
-        return deepcopy(self._bivariate_asserts)
+        return list(self._bivariate_asserts)
 
     @property
-    def inputs_parameters(self):
-        return deepcopy(self._inputs_parameters)
+    def function_asserts(self):
+        """
+        The asserts that receive the function to check, run once per check or for
+        each input.
+        """
+        return [
+            assert_f
+            for assert_f in self._asserts
+            if assert_f in self._function_asserts
+            or assert_f in self._input_function_asserts
+        ]
 
     @property
-    def outputs_references(self):
-        return deepcopy(self._outputs_references)
+    def inputs_parameters(self) -> List[Mapping[str, Any]]:
+        """
+        The input parameters as new dicts, so they can be changed or deep copied
+        without affecting the check. The values are the read-only values passed to
+        the function and are not copied.
+        """
+        return [dict(input_parameters) for input_parameters in self._inputs_parameters]
+
+    @property
+    def outputs_references(self) -> List[tuple]:
+        """
+        The read-only outputs references, the values are not copied.
+        """
+        return list(self._outputs_references)
+
+    @property
+    def record_peak_memory(self) -> bool:
+        return self._record_peak_memory
+
+    @record_peak_memory.setter
+    def record_peak_memory(self, record_peak_memory: bool):
+        self._record_peak_memory = record_peak_memory
+
+    @property
+    def batched(self) -> bool:
+        return self._batched
+
+    @property
+    def batch_size(self) -> Optional[int]:
+        return self._batch_size
+
+    @property
+    def timeout(self) -> Optional[float]:
+        return self._timeout
+
+    @timeout.setter
+    def timeout(self, timeout: Optional[float]):
+        self._timeout = timeout
 
     @property
     def nb_conducted_asserts(self):
-        return len(self._asserts) * len(self._inputs_parameters) + len(
-            self._nullvariate_asserts
+        nb_input_asserts = (
+            len(self._univariate_asserts)
+            + len(self._bivariate_asserts)
+            + len(self._input_function_asserts)
+        )
+        return (
+            nb_input_asserts * len(self._inputs_parameters)
+            + len(self._nullvariate_asserts)
+            + len(self._function_asserts)
         )
 
     def compute_outputs(self):
+        if self._batched:
+            outputs_per_input = [
+                output
+                for batch in self._get_batches()
+                for output in self._split_outputs(
+                    batch, self._function_to_check(**batch.inputs_parameters)
+                )
+            ]
+        else:
+            outputs_per_input = [
+                self._function_to_check(**input_parameters)
+                for input_parameters in self._inputs_parameters
+            ]
         outputs = []
-        for input_parameters in self._inputs_parameters:
-            output = self._function_to_check(**input_parameters)
+        for output in outputs_per_input:
             if not (isinstance(output, tuple)):
                 output = (output,)
             if self._fingerprint is not None:
@@ -202,8 +402,13 @@ class Check:
         return outputs
 
     def compute_and_set_references(self):
-        self._outputs_references = self.compute_outputs()
+        self._outputs_references = [
+            OutputsReferences(output) for output in self.compute_outputs()
+        ]
+        # the stacked references have to be recomputed
+        self._batches = None
 
+    @traced("check_function")
     def check_function(self) -> CheckResult:
         """
         For each input (first depth list) returns the result message for each assert
@@ -224,81 +429,546 @@ class Check:
 
         check_result = CheckResult()
 
+        # we only stop tracing if we started it, so an outer tracing is not disturbed
+        start_tracing = self._record_peak_memory and not tracemalloc.is_tracing()
+        if start_tracing:
+            tracemalloc.start()
+        try:
+            if self._run_asserts(check_result):
+                self._run_function_asserts(check_result)
+        finally:
+            if start_tracing:
+                tracemalloc.stop()
+        return check_result
+
+    @contextmanager
+    def _measure(
+        self,
+        check_result: CheckResult,
+        stage: str,
+        function: Callable,
+        input_index: Optional[int] = None,
+    ) -> Iterator[None]:
+        """
+        Records the wall time and optionally the peak memory of the code executed
+        within the context into the `check_result`, also if an error is raised.
+        """
+        if self._record_peak_memory:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            with trace_span(
+                stage, function=_get_function_name(function), input_index=input_index
+            ):
+                yield
+        finally:
+            wall_time = time.perf_counter() - start
+            check_result.append_timing(
+                CheckTiming(
+                    stage,
+                    _get_function_name(function),
+                    input_index,
+                    wall_time,
+                    (
+                        tracemalloc.get_traced_memory()[1]
+                        if self._record_peak_memory
+                        else None
+                    ),
+                )
+            )
+
+    def _run_asserts(self, check_result: CheckResult) -> bool:
         for assert_f in self._nullvariate_asserts:
             try:
-                assert_result = assert_f()
+                with self._measure(check_result, "assert", assert_f):
+                    assert_result = assert_f()
                 check_result.append(assert_result, assert_f, {})
             except Exception:
                 excution_info = sys.exc_info()
                 check_result.append(excution_info, assert_f, {})
                 if self._stop_on_assert_error_raised:
-                    return check_result
+                    return False
+
+        if self._batched:
+            return self._run_batched_asserts(check_result)
 
         for i, input_parameters in enumerate(self._inputs_parameters):
-            output = self._function_to_check(**input_parameters)
-            if not (isinstance(output, tuple)):
-                output = (output,)
+            # containers cannot be made read-only, so we pass copies to detect changes
+            passed_parameters = {
+                name: _copy_containers(value)
+                for name, value in input_parameters.items()
+            }
+            try:
+                with self._measure(
+                    check_result, "function", self._function_to_check, i
+                ):
+                    output = call_with_time_limit(
+                        self._timeout, self._function_to_check, **passed_parameters
+                    )
+            except ExecutionTimeoutError as exception:
+                check_result.append(
+                    str(exception),
+                    TIMEOUT_ASSERT_NAME,  # type: ignore[arg-type]
+                    input_parameters,
+                )
+                if self._stop_on_assert_error_raised:
+                    return False
+                continue
+            except Exception as exception:
+                if not (_is_read_only_error(exception)):
+                    raise exception
+                check_result.append(
+                    "The function tried to modify an input parameter in-place, but "
+                    "input parameters are read-only. Please create a copy of the "
+                    "input parameter (e.g. with `.copy()`) before modifying it.",
+                    INPUTS_UNCHANGED_ASSERT_NAME,  # type: ignore[arg-type]
+                    input_parameters,
+                )
+                if self._stop_on_assert_error_raised:
+                    return False
+                continue
 
-            for uni_assert_f in self._univariate_asserts:
-                try:
+            modified_parameters_names = [
+                name
+                for name, value in input_parameters.items()
+                if _is_modified(value, passed_parameters[name])
+            ]
+            if len(modified_parameters_names) > 0:
+                check_result.append(
+                    "The function modified the input parameters "
+                    f"{modified_parameters_names}, but input parameters must not be "
+                    "changed. Please create a copy of the input parameter before "
+                    "modifying it.",
+                    INPUTS_UNCHANGED_ASSERT_NAME,  # type: ignore[arg-type]
+                    input_parameters,
+                )
+                if self._stop_on_assert_error_raised:
+                    return False
+                continue
+
+            if not (self._run_output_asserts(check_result, i, output)):
+                return False
+        return True
+
+    def _run_batched_asserts(self, check_result: CheckResult) -> bool:
+        for batch in self._get_batches():
+            passed_parameters = {
+                name: _copy_containers(value)
+                for name, value in batch.inputs_parameters.items()
+            }
+            try:
+                with self._measure(check_result, "function", self._function_to_check):
+                    outputs = call_with_time_limit(
+                        self._timeout, self._function_to_check, **passed_parameters
+                    )
+            except ExecutionTimeoutError as exception:
+                check_result.append(
+                    str(exception),
+                    TIMEOUT_ASSERT_NAME,  # type: ignore[arg-type]
+                    self._inputs_parameters[batch.start],
+                )
+                if self._stop_on_assert_error_raised:
+                    return False
+                continue
+            except Exception as exception:
+                if not (_is_read_only_error(exception)):
+                    raise exception
+                check_result.append(
+                    "The function tried to modify an input parameter in-place, but "
+                    "input parameters are read-only. Please create a copy of the "
+                    "input parameter (e.g. with `.copy()`) before modifying it.",
+                    INPUTS_UNCHANGED_ASSERT_NAME,  # type: ignore[arg-type]
+                    self._inputs_parameters[batch.start],
+                )
+                if self._stop_on_assert_error_raised:
+                    return False
+                continue
+
+            modified_parameters_names = [
+                name
+                for name, value in batch.inputs_parameters.items()
+                if _is_modified(value, passed_parameters[name])
+            ]
+            if len(modified_parameters_names) > 0:
+                check_result.append(
+                    "The function modified the input parameters "
+                    f"{modified_parameters_names}, but input parameters must not be "
+                    "changed. Please create a copy of the input parameter before "
+                    "modifying it.",
+                    INPUTS_UNCHANGED_ASSERT_NAME,  # type: ignore[arg-type]
+                    self._inputs_parameters[batch.start],
+                )
+                if self._stop_on_assert_error_raised:
+                    return False
+                continue
+
+            outputs_per_input = self._split_outputs(batch, outputs)
+            if not (isinstance(outputs, tuple)):
+                outputs = (outputs,)
+
+            # the vectorized asserts are run once for the batch, their results are
+            # appended in the same order as in the unbatched mode
+            batched_assert_results: List[Dict[int, Any]] = [
+                {} for _ in range(batch.stop - batch.start)
+            ]
+            if self._fingerprint is None:
+                for j, assert_f in enumerate(self._bivariate_asserts):
+                    batched_assert_f = _get_batched_assert(assert_f)
+                    if batched_assert_f is None:
+                        continue
+                    try:
+                        with self._measure(check_result, "assert", assert_f):
+                            assert_results = batched_assert_f(
+                                outputs, batch.outputs_references
+                            )
+                    except Exception:
+                        assert_results = [sys.exc_info()] * len(batched_assert_results)
+                    for k, assert_result in enumerate(assert_results):
+                        batched_assert_results[k][j] = assert_result
+
+            for k, output in enumerate(outputs_per_input):
+                if not (
+                    self._run_output_asserts(
+                        check_result, batch.start + k, output, batched_assert_results[k]
+                    )
+                ):
+                    return False
+        return True
+
+    def _run_output_asserts(
+        self,
+        check_result: CheckResult,
+        i: int,
+        output: Any,
+        batched_assert_results: Optional[Dict[int, Any]] = None,
+    ) -> bool:
+        """
+        Runs the univariate and bivariate asserts on the output of the input with
+        index `i`. The results of bivariate asserts that were already computed in the
+        batched mode are given by their index in `batched_assert_results`.
+
+        :return:
+            False if the remaining asserts should not be run
+        """
+        input_parameters = self._inputs_parameters[i]
+        if not (isinstance(output, tuple)):
+            output = (output,)
+
+        for uni_assert_f in self._univariate_asserts:
+            try:
+                with self._measure(check_result, "assert", uni_assert_f, i):
                     assert_result = uni_assert_f(output)
-                    check_result.append(assert_result, uni_assert_f, input_parameters)
-                except Exception:
-                    excution_info = sys.exc_info()
-                    check_result.append(excution_info, uni_assert_f, input_parameters)
-                    if self._stop_on_assert_error_raised:
-                        return check_result
+                check_result.append(assert_result, uni_assert_f, input_parameters)
+            except Exception:
+                excution_info = sys.exc_info()
+                check_result.append(excution_info, uni_assert_f, input_parameters)
+                if self._stop_on_assert_error_raised:
+                    return False
 
-            if self._fingerprint is not None:
-                try:
+        if self._fingerprint is not None:
+            try:
+                with self._measure(check_result, "fingerprint", self._fingerprint, i):
                     output = self._fingerprint(*output)
-                except (  # we do not raise here since it is passed to widget output # noqa B040
-                    Exception
-                ) as exception:
-                    if python_version() >= "3.11":
-                        exception.add_note(
-                            "An error was raised in fingerprint function, "
-                            " most likely because your output type is wrong."
-                        )
-                    excution_info = sys.exc_info()
-                    check_result.append(
-                        excution_info, self._fingerprint, input_parameters
+            except (  # we do not raise here since it is passed to widget output # noqa B040
+                Exception
+            ) as exception:
+                if python_version() >= "3.11":
+                    exception.add_note(
+                        "An error was raised in fingerprint function, "
+                        " most likely because your output type is wrong."
                     )
-                    return check_result
+                excution_info = sys.exc_info()
+                check_result.append(excution_info, self._fingerprint, input_parameters)
+                return False
 
-                if not (isinstance(output, tuple)):
-                    output = (output,)
+            if not (isinstance(output, tuple)):
+                output = (output,)
 
-            for assert_f in self._bivariate_asserts:  # type: ignore[assignment]
-                assert len(output) == len(
-                    self._outputs_references[i]  # type: ignore[index]
-                ), (
-                    "Number of output parameters and reference output parameters "
-                    "are mismatching: "
-                    "len output parameters != len outputs references "
-                    f"[{len(output)} != "
-                    f"{len(self._outputs_references[i])}]."  # type: ignore[index]
-                )
+        for j, assert_f in enumerate(self._bivariate_asserts):
+            assert len(output) == len(
+                self._outputs_references[i]  # type: ignore[index]
+            ), (
+                "Number of output parameters and reference output parameters "
+                "are mismatching: "
+                "len output parameters != len outputs references "
+                f"[{len(output)} != "
+                f"{len(self._outputs_references[i])}]."  # type: ignore[index]
+            )
 
+            if batched_assert_results is not None and j in batched_assert_results:
+                assert_result = batched_assert_results[j]
+                if _is_execution_info(assert_result):
+                    check_result.append(assert_result, assert_f, input_parameters)
+                    if self._stop_on_assert_error_raised:
+                        return False
+                    continue
+            else:
                 try:
-                    assert_result = assert_f(
-                        output,
-                        self._outputs_references[i],  # type: ignore[index, call-arg]
-                    )
+                    reference = self._outputs_references[i]  # type: ignore[index]
+                    with self._measure(check_result, "assert", assert_f, i):
+                        assert_result = assert_f(
+                            output, reference  # type: ignore[call-arg]
+                        )
                 except Exception:
                     excution_info = sys.exc_info()
                     check_result.append(excution_info, assert_f, input_parameters)
                     if self._stop_on_assert_error_raised:
-                        return check_result
-                check_result.append(
-                    assert_result,
-                    assert_f,
-                    input_parameters,
-                    self._suppress_fingerprint_asserts
-                    and self._fingerprint is not None,
+                        return False
+                    continue
+            check_result.append(
+                assert_result,
+                assert_f,
+                input_parameters,
+                self._suppress_fingerprint_asserts and self._fingerprint is not None,
+            )
+
+        for function_assert_f in self._input_function_asserts:
+            try:
+                with self._measure(check_result, "assert", function_assert_f, i):
+                    # the function is called again by the assert, so it also gets
+                    # copies of the containers
+                    assert_result = function_assert_f(
+                        self._function_to_check,
+                        {
+                            name: _copy_containers(value)
+                            for name, value in input_parameters.items()
+                        },
+                    )
+                check_result.append(assert_result, function_assert_f, input_parameters)
+            except Exception:
+                excution_info = sys.exc_info()
+                check_result.append(excution_info, function_assert_f, input_parameters)
+                if self._stop_on_assert_error_raised:
+                    return False
+        return True
+
+    def _run_function_asserts(self, check_result: CheckResult):
+        if TIMEOUT_ASSERT_NAME in check_result.assert_names:
+            # the function asserts call the function without time limit, so they
+            # would hang on a function that already exceeded it
+            return
+        for assert_f in self._function_asserts:
+            try:
+                with self._measure(check_result, "assert", assert_f):
+                    assert_result = assert_f(self._function_to_check)
+                check_result.append(assert_result, assert_f, {})
+            except Exception:
+                excution_info = sys.exc_info()
+                check_result.append(excution_info, assert_f, {})
+                if self._stop_on_assert_error_raised:
+                    return
+
+    def _get_batches(self) -> List[_Batch]:
+        if self._batches is None:
+            nb_inputs = len(self._inputs_parameters)
+            batch_size = nb_inputs if self._batch_size is None else self._batch_size
+            shared_names = _Batch.get_shared_names(self._inputs_parameters)
+            self._batches = [
+                _Batch.from_check(
+                    self, start, min(start + batch_size, nb_inputs), shared_names
                 )
+                for start in range(0, nb_inputs, max(batch_size, 1))
+            ]
+        return self._batches
+
+    def _split_outputs(self, batch: _Batch, outputs: Any) -> List[tuple]:
+        """
+        Splits the outputs of the function for a batch of inputs into the outputs of
+        each input along the first dimension.
+        """
+        if not (isinstance(outputs, tuple)):
+            outputs = (outputs,)
+        nb_inputs = batch.stop - batch.start
+        for i, output in enumerate(outputs):
+            if not (hasattr(output, "__len__")) or len(output) != nb_inputs:
+                raise ValueError(
+                    "In the batched mode the function has to return outputs with the "
+                    f"batch of size {nb_inputs} as first dimension, but output {i} "
+                    f"is {Formatter.summarize(output, CheckResult.MAX_VALUE_LENGTH)}."
+                )
+        return [tuple(output[k] for output in outputs) for k in range(nb_inputs)]
+
+
+class _Batch(NamedTuple):
+    """
+    The stacked inputs and references of the inputs `start` to `stop` of a check in
+    the batched mode.
+    """
+
+    start: int
+    stop: int
+    inputs_parameters: Mapping[str, Any]
+    outputs_references: Optional[StackedOutputsReferences]
+
+    @staticmethod
+    def get_shared_names(inputs_parameters: List[Mapping[str, Any]]) -> Set[str]:
+        """
+        Returns the names of the parameters that are the identical object for all
+        inputs of the check. With a single input no parameter is shared.
+        """
+        if len(inputs_parameters) < 2:
+            return set()
+        first_parameters = inputs_parameters[0]
+        return {
+            name
+            for name, value in first_parameters.items()
+            if all(
+                name in input_parameters and input_parameters[name] is value
+                for input_parameters in inputs_parameters[1:]
+            )
+        }
+
+    @staticmethod
+    def from_check(
+        check: Check, start: int, stop: int, shared_names: Set[str]
+    ) -> _Batch:
+        """
+        :param shared_names:
+            The names of the parameters that are passed without stacking, so also the
+            batches with a single input are stacked consistently
+        """
+        inputs_parameters = check._inputs_parameters[start:stop]
+        names = inputs_parameters[0].keys()
+        stacked_parameters = {}
+        for input_parameters in inputs_parameters:
+            if input_parameters.keys() != names:
+                raise ValueError(
+                    "In the batched mode all inputs parameters need to have the same "
+                    f"names, but got {list(names)} and {list(input_parameters.keys())}."
+                )
+        for name in names:
+            values = [input_parameters[name] for input_parameters in inputs_parameters]
+            if name in shared_names:
+                # shared parameters like constants are not stacked
+                stacked_parameters[name] = values[0]
+                continue
+            try:
+                stacked_parameters[name] = _read_only(np.stack(values))
+            except ValueError as exception:
+                raise ValueError(
+                    f"In the batched mode the input parameter {name!r} has to be "
+                    f"stackable with numpy.stack: {exception}"
+                ) from exception
+
+        outputs_references = None
+        if len(check._outputs_references) > 0:
+            outputs_references = StackedOutputsReferences(
+                check._outputs_references[start:stop]
+            )
+        return _Batch(
+            start, stop, MappingProxyType(stacked_parameters), outputs_references
+        )
+
+
+class OutputsReferences(tuple):
+    """
+    A tuple of read-only outputs references that precomputes information about the
+    references once, so asserts do not need to recompute it on every check run.
+
+    :param outputs_references:
+        The outputs references of one input
+    """
+
+    def __new__(cls, outputs_references: tuple):
+        return super().__new__(
+            cls, (_read_only(output) for output in outputs_references)
+        )
+
+    def __init__(self, outputs_references: tuple):
+        self._numeric_indices: Optional[Tuple[int, ...]] = None
+
+    @property
+    def numeric_indices(self) -> Tuple[int, ...]:
+        """
+        The indices of the references that can be numerically compared with
+        `numpy.allclose`, computed on first access.
+        """
+        if self._numeric_indices is None:
+            self._numeric_indices = tuple(
+                i for i, reference in enumerate(self) if is_numeric(reference)
+            )
+        return self._numeric_indices
+
+
+class StackedOutputsReferences(tuple):
+    """
+    The outputs references of several inputs stacked along a new first dimension
+    used by the vectorized asserts in the batched mode of :py:class:`Check`. Each
+    reference is stacked with `numpy.stack` if it is numeric for all inputs and has
+    the same shape, otherwise it is a list of the references of each input.
+
+    :param outputs_references:
+        The outputs references of each input
+    """
+
+    def __new__(cls, outputs_references: List[OutputsReferences]):
+        nb_outputs = len(outputs_references[0]) if len(outputs_references) > 0 else 0
+        return super().__new__(
+            cls,
+            (
+                _stack_references(
+                    [output_references[i] for output_references in outputs_references]
+                )
+                for i in range(nb_outputs)
+            ),
+        )
+
+    def __init__(self, outputs_references: List[OutputsReferences]):
+        self._outputs_references = tuple(outputs_references)
+
+    @property
+    def outputs_references(self) -> Tuple[OutputsReferences, ...]:
+        """
+        The unstacked outputs references of each input.
+        """
+        return self._outputs_references
+
+    @property
+    def numeric_indices(self) -> Tuple[int, ...]:
+        """
+        The indices of the references that are numeric for all inputs.
+        """
+        numeric_indices = set.intersection(
+            *(
+                set(output_references.numeric_indices)
+                for output_references in self._outputs_references
+            )
+        )
+        return tuple(sorted(numeric_indices))
+
+
+def _stack_references(references: List[Any]) -> Any:
+    if all(
+        isinstance(reference, (np.ndarray, np.generic, numbers.Number))
+        for reference in references
+    ):
+        try:
+            stacked = np.stack(references)
+            if stacked.dtype.kind in "biufc":
+                return _read_only(stacked)
+        except ValueError:
+            # the references have different shapes
+            pass
+    return references
 
-        return check_result
+
+def is_numeric(value: Any) -> bool:
+    """
+    Checks if the value can be numerically compared with `numpy.allclose`. For numpy
+    arrays and numbers the check only inspects the type.
+    """
+    if isinstance(value, (np.ndarray, np.generic)):
+        if value.dtype.kind in "biufc":
+            return True
+        elif value.dtype.kind != "O":
+            return False
+    elif isinstance(value, numbers.Number):
+        return True
+    try:
+        np.allclose(value, value)
+        return True
+    except Exception:
+        return False
 
 
 class CheckResult:
@@ -307,17 +977,33 @@ class CheckResult:
     assert names, input parameters, and suppressed assert messages.
     """
 
+    #: The maximal number of characters of the representation of an input parameter
+    MAX_VALUE_LENGTH = 200
+    #: The maximal number of frames of a traceback
+    MAX_TRACEBACK_DEPTH = 3
+    #: The maximal number of characters of a traceback
+    MAX_TRACEBACK_LENGTH = 5000
+
+    __slots__ = (
+        "_assert_results",
+        "_assert_names",
+        "_inputs_parameters",
+        "_suppress_assert_messages",
+        "_timings",
+    )
+
     def __init__(self):
         self._assert_results = []
         self._assert_names = []
         self._inputs_parameters = []
         self._suppress_assert_messages = []
+        self._timings: List[CheckTiming] = []
 
     def append(
         self,
         assert_result: Union[str, AssertResult, ExecutionInfo],
         assert_f: Optional[Check.AssertFunT] = None,
-        input_parameters: Optional[dict] = None,
+        input_parameters: Optional[Mapping[str, Any]] = None,
         suppress_assert_message: Optional[bool] = False,
     ):
         self._assert_results.append(assert_result)
@@ -329,6 +1015,21 @@ class CheckResult:
         self._inputs_parameters.append(input_parameters)
         self._suppress_assert_messages.append(suppress_assert_message)
 
+    def append_timing(self, timing: CheckTiming):
+        self._timings.append(timing)
+
+    @property
+    def timings(self) -> Tuple[CheckTiming, ...]:
+        """
+        The wall time and optionally the peak memory of each stage of the check run in
+        the order they were executed.
+        """
+        return tuple(self._timings)
+
+    @property
+    def total_wall_time(self) -> float:
+        return sum(timing.wall_time for timing in self._timings)
+
     @property
     def successful(self):
         return (
@@ -343,95 +1044,145 @@ class CheckResult:
             == 0
         )
 
-    def message(self) -> str:
+    @traced("message")
+    def message(self, full: bool = False) -> str:
+        """
+        Renders the results of the asserts. By default the message is bounded in
+        size: failed asserts are rendered first, successful asserts are folded into a
+        count, large input parameters are summarized and tracebacks are limited to the
+        last :py:attr:`MAX_TRACEBACK_DEPTH` frames and
+        :py:attr:`MAX_TRACEBACK_LENGTH` characters.
+
+        :param full:
+            Renders every assert result in the order they were conducted with the
+            complete representation of the input parameters and the verbose
+            tracebacks.
+        """
+        if full:
+            return "\n".join(
+                self._result_message(i, full) for i in range(len(self._assert_results))
+            )
+
         messages = []
-        for i, result in enumerate(self._assert_results):
-            if (isinstance(result, str) and result == "") or (
-                isinstance(result, AssertResult) and result.successful
-            ):
-                message = Formatter.color_assert_success(
-                    f"{self._assert_names[i]} passed",
-                )
-                if len(self._inputs_parameters[i]) > 0:
-                    message += Formatter.color_assert_success(" for input\n")
-
-                input_parameters_message = "\n".join(
-                    [
-                        f"  {Formatter.color_assert_info(param_name)}:  "
-                        f"{param_value!r}"
-                        for param_name, param_value in self._inputs_parameters[
-                            i
-                        ].items()
-                    ]
-                )
-                if input_parameters_message != "":
-                    message += input_parameters_message
+        nb_successful_results = 0
+        for i in range(len(self._assert_results)):
+            if self._is_result_successful(i):
+                nb_successful_results += 1
             else:
-                message = Formatter.color_assert_failed(
-                    f"{self._assert_names[i]} failed",
+                messages.append(self._result_message(i, full))
+        if nb_successful_results > 0:
+            messages.append(
+                Formatter.color_assert_success(
+                    f"{nb_successful_results} of {len(self._assert_results)} "
+                    "asserts passed"
                 )
-                if len(self._inputs_parameters[i]) > 0 or not (
-                    self._suppress_assert_messages[i]
-                ):
-                    message += Formatter.color_assert_failed(" for\n")
-
-                input_parameters_message = "\n".join(
-                    [
-                        f"  {Formatter.color_assert_info(param_name)}: "
-                        f"{param_value!r}"
-                        for param_name, param_value in self._inputs_parameters[
-                            i
-                        ].items()
-                    ]
+            )
+        return "\n".join(messages)
+
+    def _is_result_successful(self, i: int) -> bool:
+        result = self._assert_results[i]
+        return (isinstance(result, str) and result == "") or (
+            isinstance(result, AssertResult) and result.successful
+        )
+
+    def _input_parameters_message(self, i: int, full: bool) -> str:
+        return "\n".join(
+            [
+                f"  {Formatter.color_assert_info(param_name)}: "
+                + (
+                    repr(param_value)
+                    if full
+                    else Formatter.summarize(param_value, self.MAX_VALUE_LENGTH)
                 )
-                assert_message = ""
-                if input_parameters_message != "":
-                    assert_message += input_parameters_message
-
-                assert_result = ""
-                if isinstance(result, tuple) and len(result) == 3:
-                    # Execution info
-                    tb = IPython.core.ultratb.VerboseTB()
-                    assert_result = tb.text(*result)
-                elif not (self._suppress_assert_messages[i]):
-                    if hasattr(result, "message"):
-                        assert_result = f"{result.message()}"
-                    else:
-                        assert_result = f"{Formatter.color_assert_failed(result)}"
-                if assert_result != "":
-                    assert_message += "\n" + assert_result
-                if assert_message != "":
-                    # adds "| " to the beginning of each line
-                    assert_message = re.sub(
-                        r"(^)",
-                        r"\1" + f"{Formatter.color_assert_failed('|')} ",
-                        assert_message,
-                        flags=re.M,
-                    )
-                message += f"{assert_message}"
-            messages.append(message)
+                for param_name, param_value in self._inputs_parameters[i].items()
+            ]
+        )
 
-        return "\n".join(messages)
+    def _traceback_message(self, execution_info: ExecutionInfo, full: bool) -> str:
+        if full:
+            return IPython.core.ultratb.VerboseTB().text(*execution_info)
+
+        error_type, error, tb = execution_info
+        depth = 0
+        frame_tb = tb
+        while frame_tb is not None:
+            depth += 1
+            frame_tb = frame_tb.tb_next
+        # the last frames are the relevant ones since they contain the line that
+        # raised the error
+        for _ in range(depth - self.MAX_TRACEBACK_DEPTH):
+            tb = tb.tb_next  # type: ignore[union-attr]
+        # printing the local variables of each frame can produce huge messages
+        message = IPython.core.ultratb.VerboseTB(include_vars=False).text(
+            error_type, error, tb
+        )
+        if len(message) > self.MAX_TRACEBACK_LENGTH:
+            truncation_start = len(message) - self.MAX_TRACEBACK_LENGTH
+            message = (
+                "[... traceback truncated, use message(full=True) for the complete "
+                "traceback]\n" + message[truncation_start:]
+            )
+        return message
+
+    def _result_message(self, i: int, full: bool) -> str:
+        result = self._assert_results[i]
+        if self._is_result_successful(i):
+            message = Formatter.color_assert_success(
+                f"{self._assert_names[i]} passed",
+            )
+            if len(self._inputs_parameters[i]) > 0:
+                message += Formatter.color_assert_success(" for input\n")
+            return message + self._input_parameters_message(i, full)
+
+        message = Formatter.color_assert_failed(
+            f"{self._assert_names[i]} failed",
+        )
+        if len(self._inputs_parameters[i]) > 0 or not (
+            self._suppress_assert_messages[i]
+        ):
+            message += Formatter.color_assert_failed(" for\n")
+
+        assert_message = self._input_parameters_message(i, full)
+
+        assert_result = ""
+        if isinstance(result, tuple) and len(result) == 3:
+            # Execution info
+            assert_result = self._traceback_message(result, full)
+        elif not (self._suppress_assert_messages[i]):
+            if hasattr(result, "message"):
+                assert_result = f"{result.message()}"
+            else:
+                assert_result = f"{Formatter.color_assert_failed(result)}"
+        if assert_result != "":
+            assert_message += "\n" + assert_result
+        if assert_message != "":
+            # adds "| " to the beginning of each line
+            line_prefix = f"{Formatter.color_assert_failed('|')} "
+            assert_message = "\n".join(
+                line_prefix + line for line in assert_message.split("\n")
+            )
+        return message + assert_message
 
     def _get_name_from_assert(self, assert_f: Any) -> str:
-        if isinstance(assert_f, types.FunctionType):
-            return assert_f.__name__
-        elif isinstance(assert_f, functools.partial):
-            return assert_f.func.__name__
-        else:
-            return str(assert_f)
+        return _get_function_name(assert_f)
 
     @property
-    def assert_results(self):
-        return deepcopy(self._assert_results)
+    def assert_results(self) -> Tuple[Union[str, AssertResult, ExecutionInfo], ...]:
+        return tuple(self._assert_results)
 
     @property
-    def assert_names(self):
-        return deepcopy(self._assert_names)
+    def assert_names(self) -> Tuple[str, ...]:
+        return tuple(self._assert_names)
 
     @property
-    def inputs_parameters(self):
-        return deepcopy(self._inputs_parameters)
+    def inputs_parameters(self) -> Tuple[Mapping[str, Any], ...]:
+        """
+        Read-only views of the input parameters of each assert result.
+        """
+        return tuple(
+            MappingProxyType({} if input_parameters is None else input_parameters)
+            for input_parameters in self._inputs_parameters
+        )
 
 
 class AssertResult:
@@ -445,29 +1196,56 @@ class AssertResult:
         The name of the assertion being checked.
     :param parameter_indices:
         The index or indices of the parameters that were evaluated in the assertion.
-        If a single index is provided, it will be converted into a list.
+        If a single index is provided, it will be converted into a list. An index is
+        `None` if the failure does not concern an output parameter, for example a
+        runtime measurement.
     :param parameter_values:
         The value(s) of the parameters at the given indices that were checked in the
         assertion. If a single value is provided, it will be converted into a list.
     :param messages:
         A message or list of messages describing the assertion result for each parameter
         index. If a single message is provided, it will be converted into a list.
+    :param retain_parameter_values:
+        Specifies if the parameter values are kept alive by the result. If False, only
+        a size-bounded summary and, if the value supports it, a weak reference to each
+        value are stored, so large outputs of a failing check are not kept in memory.
+        Defaults to :py:attr:`RETAIN_PARAMETER_VALUES`.
+    :param measurements:
+        Quantities measured by the assert like timings, also stored for successful
+        asserts.
     """
 
+    #: The default for the `retain_parameter_values` parameter
+    RETAIN_PARAMETER_VALUES = False
+
+    __slots__ = (
+        "_assert_name",
+        "_parameter_indices",
+        "_parameter_values",
+        "_parameter_summaries",
+        "_messages",
+        "_measurements",
+    )
+
     def __init__(
         self,
         assert_name: str,
-        parameter_indices: Union[int, List[int]],
+        parameter_indices: Union[Optional[int], Sequence[Optional[int]]],
         parameter_values: Union[Any, List[Any]],
         messages: Union[str, List[str]],
+        retain_parameter_values: Optional[bool] = None,
+        measurements: Optional[Mapping[str, Any]] = None,
     ):
         self._assert_name = assert_name
+        self._measurements = MappingProxyType(
+            {} if measurements is None else dict(measurements)
+        )
 
         # we do not include parameter_values in the check because it can be a list
         # by type definition
-        if isinstance(parameter_indices, list) or isinstance(messages, list):
+        if isinstance(parameter_indices, abc.Sequence) or isinstance(messages, list):
             if (
-                not (isinstance(parameter_indices, list))
+                not (isinstance(parameter_indices, abc.Sequence))
                 or not (isinstance(parameter_values, list))
                 or not (isinstance(messages, list))
             ):
@@ -485,13 +1263,27 @@ class AssertResult:
                     f"len(messages) [{len(parameter_indices)}, "
                     f"{len(parameter_values)}, {len(messages)}]"
                 )
-        if not (isinstance(parameter_indices, list)):
-            parameter_indices = [parameter_indices]
-        self._parameter_indices = parameter_indices
+        self._parameter_indices = (
+            list(parameter_indices)
+            if isinstance(parameter_indices, abc.Sequence)
+            else [parameter_indices]
+        )
 
         if not (isinstance(parameter_values, list)):
             parameter_values = [parameter_values]
-        self._parameter_values = parameter_values
+        if retain_parameter_values is None:
+            retain_parameter_values = AssertResult.RETAIN_PARAMETER_VALUES
+        self._parameter_summaries = [
+            Formatter.summarize(value, CheckResult.MAX_VALUE_LENGTH)
+            for value in parameter_values
+        ]
+        self._parameter_values: List[Any]
+        if retain_parameter_values:
+            self._parameter_values = parameter_values
+        else:
+            self._parameter_values = [
+                _compact_value(value) for value in parameter_values
+            ]
 
         if not (isinstance(messages, list)):
             messages = [messages]
@@ -500,13 +1292,48 @@ class AssertResult:
     def message(self) -> str:
         message = ""
         for i in range(len(self._parameter_indices)):
-            message += (
-                Formatter.color_assert_info(f"> output {self._parameter_indices[i]}: ")
-                + f"{self._parameter_values[i]}\n"
-                + Formatter.color_assert_failed(self._messages[i])
-            )
+            if self._parameter_indices[i] is not None:
+                message += (
+                    Formatter.color_assert_info(
+                        f"> output {self._parameter_indices[i]}: "
+                    )
+                    + self._parameter_summaries[i]
+                    + "\n"
+                )
+            message += Formatter.color_assert_failed(self._messages[i])
         return message
 
+    @property
+    def parameter_indices(self) -> Tuple[Optional[int], ...]:
+        return tuple(self._parameter_indices)
+
+    @property
+    def parameter_values(self) -> Tuple[Any, ...]:
+        """
+        The checked parameter values. If the values were not retained, a value is
+        `None` when it has been garbage collected or is a large object that does not
+        support weak references.
+        """
+        return tuple(
+            value() if isinstance(value, weakref.ref) else value
+            for value in self._parameter_values
+        )
+
+    @property
+    def parameter_summaries(self) -> Tuple[str, ...]:
+        """
+        Size-bounded representations of the checked parameter values.
+        """
+        return tuple(self._parameter_summaries)
+
+    @property
+    def messages(self) -> Tuple[str, ...]:
+        return tuple(self._messages)
+
+    @property
+    def measurements(self) -> Mapping[str, Any]:
+        return self._measurements
+
     @property
     def assert_name(self) -> str:
         return self._assert_name
@@ -514,3 +1341,141 @@ class AssertResult:
     @property
     def successful(self):
         return len(self._parameter_indices) == 0
+
+
+def _read_only(value: Any) -> Any:
+    """
+    Returns a read-only view for numpy arrays, also when nested in list, tuple and
+    dict containers. The data of the arrays is not copied.
+    """
+    if isinstance(value, np.ndarray):
+        if not (value.flags.writeable):
+            return value
+        view = value.view()
+        view.flags.writeable = False
+        return view
+    elif type(value) is list:
+        return [_read_only(item) for item in value]
+    elif type(value) is tuple:
+        return tuple(_read_only(item) for item in value)
+    elif type(value) is dict:
+        return {key: _read_only(item) for key, item in value.items()}
+    return value
+
+
+def _read_only_mapping(
+    input_parameters: Mapping[str, Any], read_only_values: Dict[int, Tuple[Any, Any]]
+) -> Mapping[str, Any]:
+    """
+    :param read_only_values:
+        The value and its read-only view for the id of each value that has been made
+        read-only, it is updated with the values of the input parameters
+    """
+    read_only_parameters = {}
+    for name, value in input_parameters.items():
+        if id(value) not in read_only_values:
+            # the value is kept so its id is not reused
+            read_only_values[id(value)] = (value, _read_only(value))
+        read_only_parameters[name] = read_only_values[id(value)][1]
+    return MappingProxyType(read_only_parameters)
+
+
+def _copy_containers(value: Any) -> Any:
+    """
+    Copies list, dict and set containers recursively while the contained objects are
+    not copied. Tuples are recreated, so the containers they contain are copied.
+    """
+    if type(value) is list:
+        return [_copy_containers(item) for item in value]
+    elif type(value) is tuple:
+        return tuple(_copy_containers(item) for item in value)
+    elif type(value) is dict:
+        return {key: _copy_containers(item) for key, item in value.items()}
+    elif type(value) is set:
+        return set(value)
+    return value
+
+
+def _is_modified(value: Any, passed_value: Any) -> bool:
+    """
+    Checks if the copy of the containers created by :py:func:`_copy_containers` has
+    been modified by comparing the identity of the contained objects.
+    """
+    if type(value) in (list, tuple):
+        return (
+            type(passed_value) is not type(value)
+            or len(value) != len(passed_value)
+            or any(
+                _is_modified(item, passed_item)
+                for item, passed_item in zip(value, passed_value)
+            )
+        )
+    elif type(value) is dict:
+        return (
+            type(passed_value) is not dict
+            or value.keys() != passed_value.keys()
+            or any(_is_modified(item, passed_value[key]) for key, item in value.items())
+        )
+    elif type(value) is set:
+        return value != passed_value
+    return value is not passed_value
+
+
+def _is_read_only_error(exception: BaseException) -> bool:
+    """
+    Checks if the exception or one of its causes was raised by writing to a read-only
+    numpy array.
+    """
+    visited = set()
+    error: Optional[BaseException] = exception
+    while error is not None and id(error) not in visited:
+        visited.add(id(error))
+        if isinstance(error, ValueError) and "read-only" in str(error):
+            return True
+        # CodeValidationError of the code input stores the original exception
+        error = getattr(error, "orig_exc", None) or error.__cause__ or error.__context__
+    return False
+
+
+def _compact_value(value: Any) -> Any:
+    """
+    Returns a weak reference to the value, the value itself if it is a small scalar,
+    or `None` if neither is possible.
+    """
+    if isinstance(value, (numbers.Number, str, bytes)) and sys.getsizeof(value) <= 1024:
+        return value
+    try:
+        return weakref.ref(value)
+    except TypeError:
+        # builtin containers like list or dict do not support weak references
+        return None
+
+
+def _get_function_name(function: Any) -> str:
+    if isinstance(function, (types.FunctionType, types.MethodType)):
+        return function.__name__
+    elif isinstance(function, functools.partial):
+        return _get_function_name(function.func)
+    else:
+        return str(function)
+
+
+def _get_batched_assert(assert_f: Any) -> Optional[Callable]:
+    """
+    Returns the vectorized variant of the assert stored in its `batched` attribute
+    with the arguments bound by `functools.partial`, or `None` if it has none.
+    """
+    if isinstance(assert_f, functools.partial):
+        batched_assert_f = _get_batched_assert(assert_f.func)
+        if batched_assert_f is None:
+            return None
+        return functools.partial(batched_assert_f, *assert_f.args, **assert_f.keywords)
+    return getattr(assert_f, "batched", None)
+
+
+def _is_execution_info(value: Any) -> bool:
+    return (
+        isinstance(value, tuple)
+        and len(value) == 3
+        and isinstance(value[1], BaseException)
+    )
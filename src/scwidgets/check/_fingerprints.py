@@ -0,0 +1,178 @@
+import hashlib
+import math
+import numbers
+import struct
+from typing import Any, Optional, Tuple
+
+import numpy as np
+
+from ._asserts import ALLCLOSE_BLOCK_SIZE, _flat_block
+
+
+def fingerprint_blake2b(
+    *outputs: Any, tolerance: Optional[float] = None, digest_size: int = 16
+) -> Tuple[str, ...]:
+    """
+    A fingerprint function for :py:class:`Check` that hashes each output with
+    blake2b. Numpy arrays are hashed directly from their buffer, contiguous arrays
+    without any copy and other arrays in blocks of bounded size. The hash only
+    depends on the values, so it is deterministic across processes and platforms and
+    the hashed references can be stored in the notebook.
+
+    Numpy arrays are hashed with their dtype and shape, integer arrays of any size are
+    hashed as 64 bit integers. Numpy scalars are hashed like the equivalent Python
+    scalars. Python numbers, strings, bytes, None and list,
+    tuple and dict containers of them are supported.
+
+    :param outputs:
+        The outputs of the function to check
+    :param tolerance:
+        If given, floating point values are rounded to multiples of the tolerance
+        before hashing, so values that differ by much less than the tolerance result
+        in the same hash. Values close to the midpoint between two multiples can
+        still be rounded differently. The dtype of floating point arrays is then not
+        hashed, only that they are floating or complex.
+    :param digest_size:
+        The size of each digest in bytes
+    :return:
+        The hexadecimal digest of each output
+
+    Use `functools.partial` to set the tolerance
+
+    .. code-block:: python
+
+        Check(
+            function_to_check,
+            assert_equal,
+            inputs_parameters,
+            outputs_references,
+            fingerprint=functools.partial(fingerprint_blake2b, tolerance=1e-6),
+        )
+    """
+    if tolerance is not None and not (tolerance > 0):
+        raise ValueError(f"tolerance must be positive but got {tolerance}.")
+    digests = []
+    for output in outputs:
+        hasher = hashlib.blake2b(digest_size=digest_size)
+        _hash_update(hasher, output, tolerance)
+        digests.append(hasher.hexdigest())
+    return tuple(digests)
+
+
+def _hash_update(hasher: Any, value: Any, tolerance: Optional[float] = None):
+    """
+    Updates the hasher with a deterministic encoding of the value. Each value is
+    encoded with a type tag and its size, so the encoding of a container cannot be
+    confused with the encoding of its concatenated items.
+    """
+    if isinstance(value, np.generic):
+        # numpy scalars are hashed like their Python equivalent
+        value = value.item()
+
+    if value is None:
+        _update_tagged(hasher, b"none", b"")
+    elif isinstance(value, bool):
+        _update_tagged(hasher, b"bool", b"1" if value else b"0")
+    elif isinstance(value, numbers.Integral):
+        _update_tagged(hasher, b"int", str(int(value)).encode())
+    elif isinstance(value, numbers.Real):
+        _update_tagged(hasher, b"float", _encode_float(float(value), tolerance))
+    elif isinstance(value, numbers.Complex):
+        value = complex(value)
+        _update_tagged(
+            hasher,
+            b"complex",
+            _encode_float(value.real, tolerance) + _encode_float(value.imag, tolerance),
+        )
+    elif isinstance(value, str):
+        _update_tagged(hasher, b"str", value.encode("utf-8"))
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        _update_tagged(hasher, b"bytes", bytes(value))
+    elif isinstance(value, np.ndarray):
+        _hash_update_array(hasher, value, tolerance)
+    elif isinstance(value, (list, tuple)):
+        _update_tagged(hasher, type(value).__name__.encode(), str(len(value)).encode())
+        for item in value:
+            _hash_update(hasher, item, tolerance)
+    elif isinstance(value, dict):
+        _update_tagged(hasher, b"dict", str(len(value)).encode())
+        # the order of insertion does not change the hash
+        for key in sorted(value.keys(), key=repr):
+            _hash_update(hasher, key, tolerance)
+            _hash_update(hasher, value[key], tolerance)
+    else:
+        raise TypeError(
+            f"Values of type {type(value)} cannot be fingerprinted deterministically. "
+            "Only numpy arrays, numbers, strings, bytes, None and lists, tuples and "
+            "dicts of them are supported."
+        )
+
+
+def _update_tagged(hasher: Any, tag: bytes, data: bytes):
+    hasher.update(tag + b":" + str(len(data)).encode() + b":")
+    hasher.update(data)
+
+
+def _encode_float(value: float, tolerance: Optional[float]) -> bytes:
+    if tolerance is not None and math.isfinite(value):
+        quotient = value / tolerance
+        # values too large to be rounded to a multiple of the tolerance and
+        # infinities are hashed unchanged
+        if math.isfinite(quotient):
+            value = float(round(quotient))
+    # normalizes negative zero and the different bit patterns of nan
+    if value != value:
+        value = float("nan")
+    return struct.pack("<d", value + 0.0)
+
+
+def _hash_update_array(hasher: Any, array: np.ndarray, tolerance: Optional[float]):
+    if array.dtype.hasobject:
+        _update_tagged(hasher, b"objectarray", str(array.shape).encode())
+        for item in array.flat:
+            _hash_update(hasher, item, tolerance)
+        return
+
+    quantize = tolerance is not None and array.dtype.kind in "fc"
+    # the byte order and the size of integers are fixed so the hash does not depend
+    # on the platform, the default integer dtype is int32 on Windows with numpy < 2
+    if array.dtype.kind in "iu":
+        hashed_dtype = np.dtype(f"<{array.dtype.kind}8")
+    else:
+        hashed_dtype = array.dtype.newbyteorder("<")
+    dtype = None if hashed_dtype == array.dtype else hashed_dtype
+    if quantize:
+        dtype_name = "complex" if array.dtype.kind == "c" else "floating"
+    else:
+        dtype_name = hashed_dtype.str
+    _update_tagged(hasher, b"ndarray", f"{dtype_name}{array.shape}".encode())
+
+    if not (quantize) and dtype is None and array.flags.c_contiguous:
+        # hashes the buffer of the array without copying
+        hasher.update(array.reshape(-1).view(np.uint8))
+        return
+
+    for start in range(0, array.size, ALLCLOSE_BLOCK_SIZE):
+        stop = min(start + ALLCLOSE_BLOCK_SIZE, array.size)
+        block = _flat_block(array, start, stop)
+        if dtype is not None:
+            block = block.astype(dtype)
+        if quantize:
+            block = _quantize(block, tolerance)  # type: ignore[arg-type]
+        hasher.update(np.ascontiguousarray(block).view(np.uint8))
+
+
+def _quantize(block: np.ndarray, tolerance: float) -> np.ndarray:
+    if block.dtype.kind == "c":
+        block = np.stack([block.real, block.imag], axis=-1)
+    block = block.astype(np.float64)
+    with np.errstate(over="ignore"):
+        quantized = np.round(block / tolerance)
+    # values too large to be rounded to a multiple of the tolerance are hashed
+    # unchanged like in the hash of scalars
+    overflowed = np.isinf(quantized) & np.isfinite(block)
+    quantized[overflowed] = block[overflowed]
+    # normalizes negative zero and the different bit patterns of nan
+    quantized += 0.0
+    quantized[np.isnan(quantized)] = np.nan
+    return quantized.astype("<f8", copy=False)
@@ -0,0 +1,438 @@
+import math
+import re
+import statistics
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+
+from .._utils import Formatter
+from ._check import AssertResult
+
+#: The minimal duration of one repeat in seconds when the number of calls per
+#: repeat is determined automatically
+MIN_REPEAT_TIME = 0.005
+
+_STATISTICS: Dict[str, Callable[[List[float]], float]] = {
+    "median": statistics.median,
+    "mean": statistics.mean,
+    "min": min,
+}
+
+
+def assert_runtime_within(
+    function_to_check: Callable[..., Any],
+    input_parameters: Mapping[str, Any],
+    reference_function: Callable[..., Any],
+    factor: float = 2.0,
+    repeats: int = 5,
+    warmup: int = 1,
+    number: Optional[int] = None,
+    statistic: str = "median",
+) -> AssertResult:
+    """
+    Check that `function_to_check` is at most `factor` times slower than the
+    `reference_function` for the input parameters. The runtimes of both functions
+    are measured alternately in `repeats` repeats after `warmup` calls, so a change
+    of the load of the machine affects both measurements. The measured timings are
+    stored in the measurements of the result.
+
+    Use `functools.partial` to pass the reference function to :py:class:`Check`
+
+    .. code-block:: python
+
+        Check(
+            function_to_check,
+            functools.partial(assert_runtime_within, reference_function=solution),
+            inputs_parameters,
+        )
+
+    :param reference_function:
+        The reference implementation that accepts the same input parameters
+    :param factor:
+        The maximal ratio of the runtime of the function to check to the runtime of
+        the reference function
+    :param repeats:
+        The number of repeats for each function
+    :param warmup:
+        The number of calls of each function before measuring, so caches are filled
+    :param number:
+        The number of calls per repeat, by default it is determined so that one
+        repeat takes at least :py:data:`MIN_REPEAT_TIME` seconds
+    :param statistic:
+        The statistic over the repeats that is compared, one of "median", "mean" or
+        "min"
+    """
+    if statistic not in _STATISTICS:
+        raise ValueError(
+            f"Got statistic={statistic!r} but only {list(_STATISTICS.keys())} are "
+            "accepted."
+        )
+    if repeats < 1:
+        raise ValueError(f"repeats must be positive but got {repeats}.")
+
+    for _ in range(warmup):
+        function_to_check(**input_parameters)
+        reference_function(**input_parameters)
+
+    number_to_check = _get_number(function_to_check, input_parameters, number)
+    reference_number = _get_number(reference_function, input_parameters, number)
+    times: List[float] = []
+    reference_times: List[float] = []
+    for _ in range(repeats):
+        times.append(_time_calls(function_to_check, input_parameters, number_to_check))
+        reference_times.append(
+            _time_calls(reference_function, input_parameters, reference_number)
+        )
+
+    runtime = _STATISTICS[statistic](times)
+    reference_runtime = _STATISTICS[statistic](reference_times)
+    ratio = runtime / reference_runtime if reference_runtime > 0 else float("inf")
+    measurements = {
+        "runtime": runtime,
+        "reference_runtime": reference_runtime,
+        "ratio": ratio,
+        "times": tuple(times),
+        "reference_times": tuple(reference_times),
+    }
+
+    if ratio <= factor:
+        return AssertResult(
+            assert_name="assert_runtime_within",
+            parameter_indices=[],
+            parameter_values=[],
+            messages=[],
+            measurements=measurements,
+        )
+    return AssertResult(
+        assert_name="assert_runtime_within",
+        parameter_indices=[None],
+        parameter_values=[None],
+        messages=[
+            f"The function took {Formatter.format_time(runtime)} per call "
+            f"({statistic} of {repeats} repeats), which is {ratio:.1f} times the "
+            f"runtime of the reference {Formatter.format_time(reference_runtime)}, "
+            f"but at most {factor} times is allowed."
+        ],
+        measurements=measurements,
+    )
+
+
+def assert_peak_memory_within(
+    function_to_check: Callable[..., Any],
+    input_parameters: Mapping[str, Any],
+    max_bytes: Optional[int] = None,
+    reference_function: Optional[Callable[..., Any]] = None,
+    factor: float = 2.0,
+) -> AssertResult:
+    """
+    Check that the peak memory allocated by `function_to_check` for the input
+    parameters stays within an absolute budget of `max_bytes` and/or within `factor`
+    times the peak memory of the `reference_function`. The peak is measured with
+    `tracemalloc` relative to the memory allocated before the call, so it covers the
+    allocations of Python objects and numpy arrays including intermediate arrays
+    that are freed before the function returns. The measured peaks are stored in the
+    measurements of the result.
+
+    If `tracemalloc` is already tracing, for example because the check records the
+    peak memory of its stages, the peak of the enclosing measurement is reset.
+
+    :param max_bytes:
+        The maximal peak memory in bytes
+    :param reference_function:
+        The reference implementation that accepts the same input parameters
+    :param factor:
+        The maximal ratio of the peak memory of the function to check to the peak
+        memory of the reference function
+    """
+    if max_bytes is None and reference_function is None:
+        raise ValueError("At least one of max_bytes or reference_function is required.")
+
+    peak_memory = _measure_peak_memory(function_to_check, input_parameters)
+    measurements: Dict[str, Any] = {"peak_memory": peak_memory}
+    messages = []
+    if max_bytes is not None:
+        measurements["max_bytes"] = max_bytes
+        if peak_memory > max_bytes:
+            messages.append(
+                f"The function allocated {_format_bytes(peak_memory)} at peak, but "
+                f"at most {_format_bytes(max_bytes)} are allowed."
+            )
+    if reference_function is not None:
+        reference_peak_memory = _measure_peak_memory(
+            reference_function, input_parameters
+        )
+        # small allocations of the reference would result in huge ratios
+        ratio = peak_memory / max(reference_peak_memory, 1)
+        measurements["reference_peak_memory"] = reference_peak_memory
+        measurements["ratio"] = ratio
+        if ratio > factor:
+            messages.append(
+                f"The function allocated {_format_bytes(peak_memory)} at peak, which "
+                f"is {ratio:.1f} times the peak of the reference "
+                f"{_format_bytes(reference_peak_memory)}, but at most {factor} times "
+                "is allowed."
+            )
+
+    return AssertResult(
+        assert_name="assert_peak_memory_within",
+        parameter_indices=[None] * len(messages),
+        parameter_values=[None] * len(messages),
+        messages=messages,
+        measurements=measurements,
+    )
+
+
+def _measure_peak_memory(
+    function: Callable[..., Any], input_parameters: Mapping[str, Any]
+) -> int:
+    """
+    Returns the peak memory in bytes allocated by a call of the function relative to
+    the memory allocated before the call.
+    """
+    start_tracing = not tracemalloc.is_tracing()
+    if start_tracing:
+        tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        memory_before, _ = tracemalloc.get_traced_memory()
+        output = function(**input_parameters)
+        _, peak_memory = tracemalloc.get_traced_memory()
+        # the output is freed after the measurement
+        del output
+    finally:
+        if start_tracing:
+            tracemalloc.stop()
+    return max(peak_memory - memory_before, 0)
+
+
+def assert_complexity(
+    function_to_check: Callable[..., Any],
+    input_generator: Callable[[int], Mapping[str, Any]],
+    max_complexity: Union[str, float] = "O(n)",
+    min_size: int = 2**6,
+    max_size: int = 2**20,
+    growth: float = 2.0,
+    repeats: int = 3,
+    time_budget: float = 2.0,
+    nb_fit_sizes: int = 4,
+    tolerance: float = 0.3,
+) -> AssertResult:
+    """
+    Check that the runtime of `function_to_check` does not scale worse than the
+    allowed complexity class. The function is timed on a geometric series of input
+    sizes starting at `min_size` until `max_size` is reached or the `time_budget` is
+    used up. The scaling exponent is fitted on a log-log scale over the largest
+    `nb_fit_sizes` sizes, where constant overheads have the least influence. Each
+    size is timed `repeats` times and the minimal time is used, which is the least
+    affected by the load of the machine.
+
+    For complexity classes with a logarithmic factor like "O(n log n)" the times
+    are divided by the logarithmic factor before fitting, so the fitted exponent is
+    compared to the polynomial degree.
+
+    The function is run once per check, use `functools.partial` to pass the input
+    generator to :py:class:`Check`
+
+    .. code-block:: python
+
+        Check(
+            function_to_check,
+            functools.partial(
+                assert_complexity,
+                input_generator=lambda n: {"values": np.random.rand(n)},
+                max_complexity="O(n log n)",
+            ),
+        )
+
+    :param input_generator:
+        A function that returns the input parameters for an input size `n`
+    :param max_complexity:
+        The allowed complexity class as string of the form "O(1)", "O(log n)",
+        "O(n)", "O(n log n)", "O(n^2)" or "O(n^2 log n)", or the maximal exponent
+    :param min_size:
+        The smallest input size
+    :param max_size:
+        The largest input size
+    :param growth:
+        The factor between consecutive input sizes
+    :param repeats:
+        The number of repeats for each input size
+    :param time_budget:
+        The time in seconds after which no larger sizes are measured
+    :param nb_fit_sizes:
+        The number of the largest sizes that are used for fitting the exponent
+    :param tolerance:
+        The exponent can exceed the exponent of the complexity class by this value,
+        which accounts for timing noise
+    """
+    allowed_exponent, log_power = _parse_complexity(max_complexity)
+    if growth <= 1:
+        raise ValueError(f"growth must be larger than 1 but got {growth}.")
+    if nb_fit_sizes < 2:
+        raise ValueError(f"nb_fit_sizes must be at least 2 but got {nb_fit_sizes}.")
+    if min_size < 1:
+        raise ValueError(f"min_size must be positive but got {min_size}.")
+    if max_size < min_size:
+        raise ValueError(
+            f"max_size must not be smaller than min_size but got max_size {max_size} "
+            f"and min_size {min_size}."
+        )
+    if repeats < 1:
+        raise ValueError(f"repeats must be positive but got {repeats}.")
+
+    sizes: List[int] = []
+    times: List[float] = []
+    start = time.perf_counter()
+    size = float(min_size)
+    while int(size) <= max_size:
+        input_parameters = input_generator(int(size))
+        number = _get_number(
+            function_to_check, input_parameters, None, MIN_REPEAT_TIME / 5
+        )
+        sizes.append(int(size))
+        times.append(
+            min(
+                _time_calls(function_to_check, input_parameters, number)
+                for _ in range(repeats)
+            )
+        )
+        elapsed = time.perf_counter() - start
+        # extrapolates the time of the next size with the last observed growth
+        time_growth = growth if len(times) < 2 else max(growth, times[-1] / times[-2])
+        if elapsed + times[-1] * number * (repeats + 1) * time_growth > time_budget:
+            break
+        size *= growth
+
+    measurements: Dict[str, Any] = {
+        "sizes": tuple(sizes),
+        "times": tuple(times),
+        "allowed_exponent": allowed_exponent,
+    }
+    if len(sizes) < 2:
+        return AssertResult(
+            assert_name="assert_complexity",
+            parameter_indices=[None],
+            parameter_values=[None],
+            messages=[
+                f"Only the input size {sizes[0]} could be measured within the time "
+                f"budget of {time_budget} s, which took "
+                f"{Formatter.format_time(times[0])}, so the scaling could not be "
+                "determined."
+            ],
+            measurements=measurements,
+        )
+
+    fit_sizes = np.array(sizes[-nb_fit_sizes:], dtype=float)
+    fit_times = np.array(times[-nb_fit_sizes:]) / np.log(fit_sizes) ** log_power
+    # the time resolution prevents zero times for fast functions
+    fit_times = np.maximum(fit_times, 1e-12)
+    exponent = float(np.polyfit(np.log(fit_sizes), np.log(fit_times), 1)[0])
+    measurements["exponent"] = exponent
+
+    if exponent <= allowed_exponent + tolerance:
+        return AssertResult(
+            assert_name="assert_complexity",
+            parameter_indices=[],
+            parameter_values=[],
+            messages=[],
+            measurements=measurements,
+        )
+    return AssertResult(
+        assert_name="assert_complexity",
+        parameter_indices=[None],
+        parameter_values=[None],
+        messages=[
+            f"The runtime scales with an exponent of {exponent:.2f} in the input "
+            f"size for sizes {int(fit_sizes[0])} to {int(fit_sizes[-1])}, but "
+            f"{_format_complexity(max_complexity)} allows at most "
+            f"{allowed_exponent + tolerance:.2f}."
+        ],
+        measurements=measurements,
+    )
+
+
+_COMPLEXITY_PATTERN = re.compile(r"^O\((1|(n(\^(\d+(\.\d+)?))?)?(logn)?)\)$")
+
+
+def _parse_complexity(complexity: Union[str, float]) -> Tuple[float, int]:
+    """
+    Returns the polynomial exponent and the power of the logarithmic factor of the
+    complexity class.
+    """
+    if not (isinstance(complexity, str)):
+        return float(complexity), 0
+    normalized = (
+        complexity.replace(" ", "")
+        .replace("**", "^")
+        .replace("*", "")
+        .replace("log(n)", "logn")
+    )
+    match = _COMPLEXITY_PATTERN.match(normalized)
+    if match is None or match.group(1) == "":
+        raise ValueError(
+            f"Got max_complexity={complexity!r} but only complexity classes of the "
+            'form "O(1)", "O(log n)", "O(n)", "O(n log n)", "O(n^2)" or '
+            '"O(n^2 log n)" are accepted.'
+        )
+    if match.group(1) == "1":
+        return 0.0, 0
+    log_power = 1 if match.group(6) is not None else 0
+    if match.group(2) is None:
+        exponent = 0.0
+    elif match.group(4) is None:
+        exponent = 1.0
+    else:
+        exponent = float(match.group(4))
+    return exponent, log_power
+
+
+def _format_complexity(complexity: Union[str, float]) -> str:
+    if isinstance(complexity, str):
+        return complexity
+    return f"an exponent of {complexity}"
+
+
+def _time_calls(
+    function: Callable[..., Any], input_parameters: Mapping[str, Any], number: int
+) -> float:
+    """
+    Returns the runtime per call of `number` calls of the function.
+    """
+    start = time.perf_counter()
+    for _ in range(number):
+        function(**input_parameters)
+    return (time.perf_counter() - start) / number
+
+
+def _get_number(
+    function: Callable[..., Any],
+    input_parameters: Mapping[str, Any],
+    number: Optional[int],
+    min_repeat_time: float = MIN_REPEAT_TIME,
+) -> int:
+    """
+    Returns the given number of calls per repeat or determines it so that one repeat
+    takes at least `min_repeat_time` seconds.
+    """
+    if number is not None:
+        return number
+    number = 1
+    while number < 10**6:
+        repeat_time = _time_calls(function, input_parameters, number) * number
+        if repeat_time >= min_repeat_time:
+            break
+        elif repeat_time > min_repeat_time / 100:
+            # precise enough to extrapolate the number of calls
+            return math.ceil(number * min_repeat_time / repeat_time)
+        number *= 10
+    return number
+
+
+def _format_bytes(nb_bytes: float) -> str:
+    for unit in ["B", "KiB", "MiB"]:
+        if nb_bytes < 1024:
+            return f"{nb_bytes:.4g} {unit}"
+        nb_bytes /= 1024
+    return f"{nb_bytes:.4g} GiB"
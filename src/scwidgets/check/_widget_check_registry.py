@@ -3,10 +3,11 @@
 from __future__ import annotations
 
 from collections import OrderedDict
-from typing import Callable, List, Optional, Union
+from typing import Any, Callable, Dict, List, Mapping, Optional, Union
 
 from ipywidgets import Button, HBox, Layout, Output, VBox, Widget
 
+from .._instrumentation import user_action
 from .._utils import Formatter
 from ..css_style import CssStyle
 from ._check import Check, CheckResult
@@ -73,12 +74,16 @@ class CheckableWidget:
                 check.inputs_parameters,
                 check.outputs_references,
                 check.fingerprint,
+                record_peak_memory=check.record_peak_memory,
+                batched=check.batched,
+                batch_size=check.batch_size,
+                timeout=check.timeout,
             )
 
     def _add_check_from_check_parameters(
         self,
         asserts: Union[List[Check.AssertFunT], Check.AssertFunT],
-        inputs_parameters: Optional[Union[List[dict], dict]] = None,
+        inputs_parameters: Optional[Union[List[Mapping], Mapping]] = None,
         outputs_references: Optional[
             Union[List[Check.FunOutParamsT], Check.FunOutParamsT]
         ] = None,
@@ -143,11 +148,20 @@ class CheckRegistry(VBox):
     Manages the assignment of checks to widgets and the execution of checks. It allows
     to run the checks of all widgets and properly pipes the result to the corresponding
     function of the widget.
+
+    :param display_set_all_references_button:
+        Specifies if the button to set all references is displayed
+    :param display_timings_summary:
+        Specifies if a summary table of the timings of the slowest stages of the
+        checks is printed after all widgets have been checked
     """
 
     def __init__(self, *args, **kwargs):
         self._checks = OrderedDict()
         self._names = OrderedDict()
+        self._checks_results: OrderedDict[
+            CheckableWidget, List[Union[CheckResult, Exception]]
+        ] = OrderedDict()
         self._set_all_references_button = Button(description="Set all references")
         self._check_all_widgets_button = Button(description="Check all widgets")
         self._output = Output()
@@ -159,6 +173,7 @@ class CheckRegistry(VBox):
         self.display_set_all_references_button = kwargs.pop(
             "display_set_all_references_button", False
         )
+        self._display_timings_summary = kwargs.pop("display_timings_summary", False)
 
         VBox.__init__(
             self,
@@ -226,7 +241,7 @@ class CheckRegistry(VBox):
         self,
         widget: CheckableWidget,
         asserts: Union[List[Check.AssertFunT], Check.AssertFunT],
-        inputs_parameters: Optional[Union[List[dict], dict]] = None,
+        inputs_parameters: Optional[Union[List[Mapping], Mapping]] = None,
         outputs_references: Optional[
             Union[List[Check.FunOutParamsT], Check.FunOutParamsT]
         ] = None,
@@ -235,6 +250,10 @@ class CheckRegistry(VBox):
         ] = None,
         suppress_fingerprint_asserts: bool = True,
         stop_on_assert_error_raised: bool = False,
+        record_peak_memory: bool = False,
+        batched: bool = False,
+        batch_size: Optional[int] = None,
+        timeout: Optional[float] = None,
     ):
         """
         Adds a new check for the specified widget. The check is defined using assert
@@ -252,6 +271,18 @@ class CheckRegistry(VBox):
             Optional function to obfuscate outputs before assertions.
         :param suppress_fingerprint_asserts:
             If True, suppresses assert messages involving fingerprinted outputs.
+        :param stop_on_assert_error_raised:
+            If True, stops running the asserts as soon as an error is raised.
+        :param record_peak_memory:
+            If True, the peak memory of each stage of the check is recorded.
+        :param batched:
+            If True, the function is called once per batch of stacked inputs, see
+            :py:class:`Check`.
+        :param batch_size:
+            The maximal number of inputs per batch in the batched mode.
+        :param timeout:
+            The time limit in seconds for each call of the function, a call exceeding
+            it is reported as failed check.
         """
         if not (issubclass(type(widget), CheckableWidget)):
             raise ValueError("Argument widget must be subclass of CheckableWidget")
@@ -267,6 +298,10 @@ class CheckRegistry(VBox):
             fingerprint,
             suppress_fingerprint_asserts,
             stop_on_assert_error_raised,
+            record_peak_memory,
+            batched,
+            batch_size,
+            timeout,
         )
         self._checks[widget].append(check)
 
@@ -298,13 +333,83 @@ class CheckRegistry(VBox):
             for check in self._checks[widget]:
                 result = check.check_function()
                 checks_result.append(result)
+            self._checks_results[widget] = checks_result
             widget.handle_checks_result(checks_result)
             return checks_result
         except Exception as exception:
             checks_result.append(exception)
+            self._checks_results[widget] = checks_result
             widget.handle_checks_result(checks_result)
             return checks_result
 
+    def timings_summary(self) -> List[Dict[str, Any]]:
+        """
+        Aggregates the timings of the last check run of each widget by widget, check,
+        stage and function name over all inputs. The rows are sorted by the total wall
+        time in descending order, so the hot spots of the checks come first.
+
+        :return:
+            A list of rows, each a dict with the keys "widget", "check", "stage",
+            "name", "calls", "total_wall_time", "max_wall_time" and "max_peak_memory"
+        """
+        rows: OrderedDict[tuple, Dict[str, Any]] = OrderedDict()
+        for widget, checks_result in self._checks_results.items():
+            for check_index, result in enumerate(checks_result):
+                if not isinstance(result, CheckResult):
+                    continue
+                for timing in result.timings:
+                    key = (widget, check_index, timing.stage, timing.name)
+                    if key not in rows:
+                        rows[key] = {
+                            "widget": self._names[widget],
+                            "check": check_index,
+                            "stage": timing.stage,
+                            "name": timing.name,
+                            "calls": 0,
+                            "total_wall_time": 0.0,
+                            "max_wall_time": 0.0,
+                            "max_peak_memory": None,
+                        }
+                    row = rows[key]
+                    row["calls"] += 1
+                    row["total_wall_time"] += timing.wall_time
+                    row["max_wall_time"] = max(row["max_wall_time"], timing.wall_time)
+                    if timing.peak_memory is not None:
+                        row["max_peak_memory"] = max(
+                            row["max_peak_memory"] or 0, timing.peak_memory
+                        )
+        return sorted(
+            rows.values(), key=lambda row: row["total_wall_time"], reverse=True
+        )
+
+    def timings_table(self, max_rows: Optional[int] = 10) -> str:
+        """
+        Formats :py:meth:`timings_summary` as a table.
+
+        :param max_rows:
+            The maximal number of rows that are shown, `None` shows all rows
+        """
+        rows = self.timings_summary()
+        if max_rows is not None:
+            rows = rows[:max_rows]
+        lines = [
+            f"{'widget':>10} {'check':>5} {'stage':>11} {'name':<30} {'calls':>6} "
+            f"{'total [ms]':>11} {'max [ms]':>10} {'peak [KiB]':>11}"
+        ]
+        for row in rows:
+            peak_memory = (
+                "-"
+                if row["max_peak_memory"] is None
+                else f"{row['max_peak_memory'] / 1024:.1f}"
+            )
+            lines.append(
+                f"{str(row['widget']):>10} {row['check']:>5} {row['stage']:>11} "
+                f"{row['name'][:30]:<30} {row['calls']:>6} "
+                f"{row['total_wall_time'] * 1e3:>11.3f} "
+                f"{row['max_wall_time'] * 1e3:>10.3f} {peak_memory:>11}"
+            )
+        return "\n".join(lines)
+
     def check_all_widgets(
         self,
     ) -> OrderedDict[CheckableWidget, List[Union[CheckResult, Exception]]]:
@@ -318,12 +423,14 @@ class CheckRegistry(VBox):
                 messages[widget] = [exception]
         return messages
 
+    @user_action("set_all_references")
     def _on_click_set_all_references_button(self, change: dict):
         self._output.clear_output(wait=True)
         with self._output:
             self.compute_and_set_all_references()
             print(Formatter.color_success_message("Successfully set all references."))
 
+    @user_action("check_all")
     def _on_click_check_all_widgets_button(self, change: dict):
         self._output.clear_output(wait=True)
         try:
@@ -374,6 +481,10 @@ class CheckRegistry(VBox):
                                 f"Widget {self._names[widget]}: 𐄂 (failed)"
                             )
                         )
+            if self._display_timings_summary:
+                with self._output:
+                    print(Formatter.color_info_message("Timings of the checks:"))
+                    print(self.timings_table())
         except Exception as exception:
             with self._output:
                 print(
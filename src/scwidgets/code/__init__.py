@@ -1,7 +1,28 @@
-from ._widget_code_input import CodeInput
-from ._widget_parameters_panel import ParametersPanel
+from typing import TYPE_CHECKING
+
+from .._lazy_import import attach_lazy_attributes
+
+if TYPE_CHECKING:
+    from ._code_analysis import CodeAnalysis
+    from ._line_profiler import LineProfile, LineProfiler
+    from ._widget_code_input import CodeInput
+    from ._widget_parameters_panel import ParametersPanel
+
+__getattr__, __dir__ = attach_lazy_attributes(
+    __name__,
+    {
+        "CodeAnalysis": "._code_analysis",
+        "LineProfile": "._line_profiler",
+        "LineProfiler": "._line_profiler",
+        "CodeInput": "._widget_code_input",
+        "ParametersPanel": "._widget_parameters_panel",
+    },
+)
 
 __all__ = [
     "CodeInput",
     "ParametersPanel",
+    "CodeAnalysis",
+    "LineProfile",
+    "LineProfiler",
 ]
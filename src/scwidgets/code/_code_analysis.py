@@ -0,0 +1,187 @@
+import ast
+import functools
+import types
+from typing import FrozenSet, List, NamedTuple, Optional, Tuple, Union
+
+#: The maximal number of analyses kept in the cache
+ANALYSIS_CACHE_SIZE = 128
+
+
+class CodeAnalysis(NamedTuple):
+    """
+    The result of the static analysis of the code of a :py:class:`CodeInput`.
+
+    :param syntax_error:
+        The syntax error raised when parsing the code, `None` if the code is valid
+        Python
+    :param violations:
+        A message for each forbidden name, forbidden import or missing return found in
+        the code
+    :param parameters:
+        The names of the parameters of the function, `None` if the code has a syntax
+        error
+    :param has_var_keyword:
+        Whether the function accepts arbitrary keyword arguments
+    :param compiled_code:
+        The compiled code, `None` if the code has a syntax error
+    """
+
+    syntax_error: Optional[SyntaxError]
+    violations: Tuple[str, ...]
+    parameters: Optional[Tuple[str, ...]]
+    has_var_keyword: bool
+    compiled_code: Optional[types.CodeType]
+
+    @property
+    def valid(self) -> bool:
+        return self.syntax_error is None and len(self.violations) == 0
+
+
+@functools.lru_cache(maxsize=ANALYSIS_CACHE_SIZE)
+def analyze_code(
+    code: str,
+    function_name: str,
+    filename: str,
+    forbidden_names: FrozenSet[str] = frozenset(),
+    forbidden_imports: FrozenSet[str] = frozenset(),
+    require_return: bool = False,
+) -> CodeAnalysis:
+    """
+    Parses and compiles the code once and checks it for forbidden names, forbidden
+    imports and a missing return without executing it. The result is cached by the
+    code and the options, so repeated runs of unchanged code are not analyzed again.
+
+    :param code:
+        The code containing the definition of the function
+    :param function_name:
+        The name of the function defined in the code
+    :param filename:
+        The filename the code is compiled with
+    :param forbidden_names:
+        Names that must not be used in the code. Dotted names like `"np.load"` forbid
+        the attribute access, undotted names forbid the name and all its attributes.
+    :param forbidden_imports:
+        Modules that must not be imported including their submodules
+    :param require_return:
+        Whether the function has to contain a return statement with a value
+    """
+    try:
+        module = ast.parse(code, filename)
+        compiled_code = compile(module, filename, "exec", dont_inherit=True)
+    except SyntaxError as exception:
+        return CodeAnalysis(exception, (), None, False, None)
+
+    function_definition = _find_function_definition(module, function_name)
+    if function_definition is None:
+        return CodeAnalysis(
+            None,
+            (f"The code does not define the function {function_name!r}.",),
+            None,
+            False,
+            compiled_code,
+        )
+    arguments = function_definition.args
+    parameters = tuple(
+        argument.arg
+        for argument in arguments.posonlyargs + arguments.args + arguments.kwonlyargs
+    )
+
+    violations = []
+    # the inner parts of an attribute chain like `np.linalg` in `np.linalg.inv`
+    attribute_chain_parts = set()
+    for node in ast.walk(module):
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            for imported_module in _get_imported_modules(node):
+                if _matches(imported_module, forbidden_imports):
+                    violations.append(
+                        f"Line {node.lineno}: importing {imported_module!r} is not "
+                        "allowed."
+                    )
+
+        if isinstance(node, ast.Attribute):
+            attribute_chain_parts.add(id(node.value))
+        if (
+            isinstance(node, (ast.Name, ast.Attribute))
+            and id(node) not in attribute_chain_parts
+        ):
+            name = _get_dotted_name(node)
+            if name is not None and _matches(name, forbidden_names):
+                violations.append(f"Line {node.lineno}: using {name!r} is not allowed.")
+
+    if require_return and not (_has_return_value(function_definition)):
+        violations.append(
+            f"The function {function_name!r} does not return a value, a return "
+            "statement is missing."
+        )
+
+    return CodeAnalysis(
+        None,
+        tuple(violations),
+        parameters,
+        arguments.kwarg is not None,
+        compiled_code,
+    )
+
+
+def _find_function_definition(
+    module: ast.Module, function_name: str
+) -> Optional[Union[ast.FunctionDef, ast.AsyncFunctionDef]]:
+    for node in module.body:
+        if (
+            isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+            and node.name == function_name
+        ):
+            return node
+    return None
+
+
+def _get_imported_modules(node: Union[ast.Import, ast.ImportFrom]) -> List[str]:
+    if isinstance(node, ast.Import):
+        return [alias.name for alias in node.names]
+    # relative imports can only import modules of the same package
+    if node.level > 0 or node.module is None:
+        return []
+    return [node.module]
+
+
+def _matches(name: str, forbidden: FrozenSet[str]) -> bool:
+    """
+    Checks if the name or one of its parents, in the sense of a dotted path, is
+    forbidden.
+    """
+    parts = name.split(".")
+    return any(".".join(parts[: i + 1]) in forbidden for i in range(len(parts)))
+
+
+def _get_dotted_name(node: ast.AST) -> Optional[str]:
+    """
+    Returns the dotted name of a chain of attributes on a name like `np.linalg.inv`,
+    or `None` if the chain does not start with a name.
+    """
+    attributes: List[str] = []
+    while isinstance(node, ast.Attribute):
+        attributes.append(node.attr)
+        node = node.value
+    if not (isinstance(node, ast.Name)):
+        return None
+    return ".".join([node.id] + attributes[::-1])
+
+
+def _has_return_value(
+    function_definition: Union[ast.FunctionDef, ast.AsyncFunctionDef],
+) -> bool:
+    nodes: List[ast.AST] = list(function_definition.body)
+    while len(nodes) > 0:
+        node = nodes.pop()
+        if isinstance(node, ast.Return) and node.value is not None:
+            return True
+        if isinstance(node, (ast.Yield, ast.YieldFrom)):
+            return True
+        # returns of nested functions and classes do not count
+        if not (
+            isinstance(
+                node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef)
+            )
+        ):
+            nodes.extend(ast.iter_child_nodes(node))
+    return False
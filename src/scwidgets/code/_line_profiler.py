@@ -0,0 +1,279 @@
+import sys
+import time
+from array import array
+from collections import defaultdict
+from typing import Any, Callable, DefaultDict, Dict, Optional, Tuple
+
+import numpy as np
+
+from .._utils import Formatter
+
+
+class LineProfile:
+    """
+    The number of hits and the cumulative time of each line of a profiled code. The
+    time of a line includes the time spent in functions called from the line that are
+    not part of the profiled code like numpy functions, while the time of functions of
+    the profiled code is attributed to their own lines.
+
+    :param source:
+        The source code that was profiled
+    :param hits:
+        The number of executions of each line by line number, starting at 1
+    :param times:
+        The cumulative time in seconds of each line by line number
+    :param total_time:
+        The wall time of the profiled call in seconds
+    """
+
+    __slots__ = ("_source_lines", "_hits", "_times", "_total_time")
+
+    def __init__(
+        self,
+        source: str,
+        hits: Dict[int, int],
+        times: Dict[int, float],
+        total_time: float,
+    ):
+        self._source_lines = source.splitlines()
+        self._hits = tuple(hits.get(i, 0) for i in range(1, self.nb_lines + 1))
+        self._times = tuple(times.get(i, 0.0) for i in range(1, self.nb_lines + 1))
+        self._total_time = total_time
+
+    @property
+    def nb_lines(self) -> int:
+        return len(self._source_lines)
+
+    @property
+    def source_lines(self) -> Tuple[str, ...]:
+        return tuple(self._source_lines)
+
+    @property
+    def hits(self) -> Tuple[int, ...]:
+        """
+        The number of executions of each source line.
+        """
+        return self._hits
+
+    @property
+    def times(self) -> Tuple[float, ...]:
+        """
+        The cumulative time in seconds of each source line.
+        """
+        return self._times
+
+    @property
+    def total_time(self) -> float:
+        return self._total_time
+
+    def format(self) -> str:
+        """
+        Renders a table with the hits, cumulative time and share of the total time of
+        each line next to the source line. Lines that were not executed have empty
+        columns.
+        """
+        rows = [("Line", "Hits", "Time", "% Time", "Code")]
+        for i, source_line in enumerate(self._source_lines):
+            if self._hits[i] == 0:
+                rows.append((str(i + 1), "", "", "", source_line))
+                continue
+            share = (
+                100 * self._times[i] / self._total_time if self._total_time > 0 else 0
+            )
+            rows.append(
+                (
+                    str(i + 1),
+                    str(self._hits[i]),
+                    Formatter.format_time(self._times[i]),
+                    f"{share:.1f}",
+                    source_line,
+                )
+            )
+        widths = [max(len(row[column]) for row in rows) for column in range(4)]
+        lines = [
+            "  ".join(row[column].rjust(widths[column]) for column in range(4))
+            + "  "
+            + row[4]
+            for row in rows
+        ]
+        lines.insert(1, "=" * max(len(line) for line in lines))
+        lines.append(f"Total time: {Formatter.format_time(self._total_time)}")
+        return "\n".join(lines)
+
+
+class LineProfiler:
+    """
+    Counts the hits and measures the cumulative time of each line of the code compiled
+    with the given filename while the profiler is active. Only line events of this code
+    are recorded, so code of other modules like numpy runs at full speed. On Python
+    3.12 and newer :py:mod:`sys.monitoring` is used, otherwise :py:func:`sys.settrace`.
+
+    The time between two line events is attributed to the first line. Each event only
+    appends the line number and a timestamp to a buffer that is aggregated with numpy
+    when it is full or the profile is requested. Python loops still run about 10 to 20
+    times slower than without profiler, see ``benchmarks/bench_code.py``, while code
+    spending its time in numpy calls is barely slowed down.
+
+    :param filename:
+        The filename the profiled code was compiled with
+
+    .. code-block:: python
+
+        with LineProfiler(filename) as profiler:
+            function(*args)
+        profile = profiler.profile(source)
+    """
+
+    #: The name of the tool registered in :py:mod:`sys.monitoring`
+    TOOL_NAME = "scwidgets-line-profiler"
+
+    #: The number of buffered line events after which the buffer is aggregated
+    BUFFER_SIZE = 1 << 20
+
+    def __init__(self, filename: str):
+        self._filename = filename
+        self._hits: DefaultDict[int, int] = defaultdict(int)
+        self._times: DefaultDict[int, float] = defaultdict(float)
+        self._total_time = 0.0
+        self._start_time: Optional[float] = None
+        # the line numbers and timestamps of the line events
+        self._lines = array("i")
+        self._timestamps = array("d")
+        self._previous_trace: Optional[Callable] = None
+        self._tool_id: Optional[int] = None
+
+    def __enter__(self) -> "LineProfiler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self):
+        if self._start_time is not None:
+            raise RuntimeError("The line profiler is already running.")
+        if hasattr(sys, "monitoring"):
+            self._start_monitoring()
+        else:
+            self._previous_trace = sys.gettrace()
+            sys.settrace(self._create_trace_function())
+        self._start_time = time.perf_counter()
+
+    def stop(self):
+        if self._start_time is None:
+            return
+        stop_time = time.perf_counter()
+        self._total_time += stop_time - self._start_time
+        self._start_time = None
+        if self._tool_id is not None:
+            self._stop_monitoring()
+        else:
+            sys.settrace(self._previous_trace)
+            self._previous_trace = None
+        if len(self._lines) > 0:
+            # the last line lasts until the profiler stopped
+            self._lines.append(0)
+            self._timestamps.append(stop_time)
+            self._aggregate()
+            del self._lines[:]
+            del self._timestamps[:]
+
+    def profile(self, source: str) -> LineProfile:
+        """
+        :param source:
+            The source code that was compiled with the filename of the profiler
+        """
+        self._aggregate()
+        return LineProfile(source, self._hits, self._times, self._total_time)
+
+    def _aggregate(self):
+        """
+        Adds the buffered line events to the hits and times of the lines. The last
+        event stays in the buffer, since it lasts until the next event.
+        """
+        if len(self._lines) < 2:
+            return
+        lines = np.array(self._lines, dtype=np.int64)
+        timestamps = np.array(self._timestamps, dtype=np.float64)
+        del self._lines[:-1]
+        del self._timestamps[:-1]
+
+        line_hits = np.bincount(lines[:-1])
+        line_times = np.bincount(lines[:-1], weights=np.diff(timestamps))
+        for line in np.flatnonzero(line_hits):
+            self._hits[int(line)] += int(line_hits[line])
+            self._times[int(line)] += float(line_times[line])
+
+    # sys.settrace
+    # ------------
+
+    def _create_trace_function(self) -> Callable:
+        filename = self._filename
+        lines = self._lines
+        append_line = lines.append
+        append_timestamp = self._timestamps.append
+        clock = time.perf_counter
+        buffer_size = self.BUFFER_SIZE
+        aggregate = self._aggregate
+
+        def trace_line(frame, event: str, arg: Any) -> Callable:
+            if event == "line":
+                append_line(frame.f_lineno)
+                append_timestamp(clock())
+                if len(lines) >= buffer_size:
+                    aggregate()
+            return trace_line
+
+        def trace_call(frame, event: str, arg: Any) -> Optional[Callable]:
+            if frame.f_code.co_filename != filename:
+                # other frames are not traced line by line
+                return None
+            return trace_line
+
+        return trace_call
+
+    # sys.monitoring
+    # --------------
+
+    def _start_monitoring(self):
+        monitoring = sys.monitoring  # type: ignore[attr-defined]
+        for tool_id in range(monitoring.PROFILER_ID, monitoring.OPTIMIZER_ID):
+            if monitoring.get_tool(tool_id) is None:
+                break
+        else:
+            raise RuntimeError(
+                "Cannot start the line profiler, all profiler tool ids of "
+                "sys.monitoring are in use."
+            )
+        monitoring.use_tool_id(tool_id, self.TOOL_NAME)
+        self._tool_id = tool_id
+
+        filename = self._filename
+        disable = monitoring.DISABLE
+        lines = self._lines
+        append_line = lines.append
+        append_timestamp = self._timestamps.append
+        clock = time.perf_counter
+        buffer_size = self.BUFFER_SIZE
+        aggregate = self._aggregate
+
+        def on_line(code, line_number: int) -> Any:
+            if code.co_filename != filename:
+                # the event is not emitted again for this code location
+                return disable
+            append_line(line_number)
+            append_timestamp(clock())
+            if len(lines) >= buffer_size:
+                aggregate()
+            return None
+
+        monitoring.register_callback(tool_id, monitoring.events.LINE, on_line)
+        # locations disabled in a previous run are enabled again
+        monitoring.restart_events()
+        monitoring.set_events(tool_id, monitoring.events.LINE)
+
+    def _stop_monitoring(self):
+        monitoring = sys.monitoring  # type: ignore[attr-defined]
+        monitoring.set_events(self._tool_id, 0)
+        monitoring.free_tool_id(self._tool_id)
+        self._tool_id = None
@@ -1,14 +1,17 @@
 import ast
 import copy
 import inspect
+import itertools
+import linecache
 import re
 import sys
 import textwrap
 import traceback
 import types
 import warnings
+import weakref
 from functools import wraps
-from typing import Any, List, Optional, Tuple, Union
+from typing import Any, Iterable, List, Optional, Tuple, Union
 
 from widget_code_input import WidgetCodeInput
 from widget_code_input.utils import (
@@ -17,7 +20,10 @@ from widget_code_input.utils import (
     is_valid_variable_name,
 )
 
+from .._tracing import trace_span
 from ..check import Check
+from ._code_analysis import CodeAnalysis, analyze_code
+from ._line_profiler import LineProfile, LineProfiler
 
 
 class CodeInput(WidgetCodeInput):
@@ -36,10 +42,24 @@ class CodeInput(WidgetCodeInput):
     :param function_body: The function definition without indentation
     :param builtins: A dictionary containing variable names and values that are added
         to the globals __builtins__ and thus available on initialization
+    :param forbidden_names: Names that must not be used in the code, for example
+        `["eval", "exec", "open"]`. Dotted names like `"np.load"` only forbid the
+        attribute access.
+    :param forbidden_imports: Modules that must not be imported in the code, for
+        example `["os", "subprocess"]`, including their submodules
+    :param require_return: Specifies if the function has to contain a return
+        statement with a value
+
+    The code is analyzed statically once per change before it is executed. Code with
+    a syntax error, a forbidden name or import, or a missing return is rejected with
+    a :py:class:`CodeValidationError` without executing anything.
     """
 
     valid_code_themes = ["nord", "solarizedLight", "basicLight"]
 
+    # numbers the filenames of the instances
+    _instance_counter = itertools.count()
+
     def __init__(
         self,
         function: Optional[types.FunctionType] = None,
@@ -49,6 +69,9 @@ class CodeInput(WidgetCodeInput):
         function_body: Optional[str] = None,
         builtins: Optional[dict[str, Any]] = None,
         code_theme: str = "basicLight",
+        forbidden_names: Optional[Iterable[str]] = None,
+        forbidden_imports: Optional[Iterable[str]] = None,
+        require_return: bool = False,
     ):
         if function is not None:
             function_name = (
@@ -72,6 +95,16 @@ class CodeInput(WidgetCodeInput):
         function_parameters = "" if function_parameters is None else function_parameters
         function_body = "" if function_body is None else function_body
         self._builtins = {} if builtins is None else builtins
+        self._forbidden_names = frozenset(
+            () if forbidden_names is None else forbidden_names
+        )
+        self._forbidden_imports = frozenset(
+            () if forbidden_imports is None else forbidden_imports
+        )
+        self._require_return = require_return
+        self._filename = f"<code-input-{next(CodeInput._instance_counter)}>"
+        # the source of the code is removed from the linecache with the instance
+        weakref.finalize(self, linecache.cache.pop, self._filename, None)
         super().__init__(
             function_name, function_parameters, docstring, function_body, code_theme
         )
@@ -111,38 +144,116 @@ class CodeInput(WidgetCodeInput):
         if not is_valid_variable_name(self.function_name):
             raise SyntaxError("Invalid function name '{}'".format(self.function_name))
 
-        # Optionally one could do a ast.parse here already, to check syntax
-        # before execution
-        try:
-            exec(
-                compile(self.full_function_code, __name__, "exec", dont_inherit=True),
-                globals_dict,
-            )
-        except SyntaxError as exc:
-            raise CodeValidationError(
-                format_syntax_error_msg(exc), orig_exc=exc
-            ) from exc
+        code = self.full_function_code
+        with trace_span("compile", function=self.function_name):
+            analysis = self.analysis
+        self._raise_analysis_errors(analysis)
+        # makes the source available to tracebacks and the interruption of a time
+        # limit, an entry without modification time is never invalidated
+        linecache.cache[self._filename] = (
+            len(code),
+            None,
+            code.splitlines(keepends=True),
+            self._filename,
+        )
+        exec(analysis.compiled_code, globals_dict)  # type: ignore[arg-type]
 
         return globals_dict[self.function_name]
 
+    @property
+    def filename(self) -> str:
+        """
+        The filename the code is compiled with, it is unique for each instance.
+        """
+        return self._filename
+
+    def close(self):
+        linecache.cache.pop(self._filename, None)
+        super().close()
+
+    @property
+    def analysis(self) -> CodeAnalysis:
+        """
+        The static analysis of the current code. It is computed once per change of
+        the code and options and then retrieved from a cache.
+        """
+        return analyze_code(
+            self.full_function_code,
+            self.function_name,
+            self._filename,
+            self._forbidden_names,
+            self._forbidden_imports,
+            self._require_return,
+        )
+
+    def validate(self):
+        """
+        Checks the code statically without executing it.
+
+        :raise CodeValidationError: if the code has a syntax error, uses a forbidden
+          name or import or misses a required return statement
+        """
+        self._raise_analysis_errors(self.analysis)
+
+    @staticmethod
+    def _raise_analysis_errors(analysis: CodeAnalysis):
+        if analysis.syntax_error is not None:
+            raise CodeValidationError(
+                format_syntax_error_msg(analysis.syntax_error),
+                orig_exc=analysis.syntax_error,
+            ) from analysis.syntax_error
+        if len(analysis.violations) > 0:
+            raise CodeValidationError(
+                "The code was rejected before execution:\n"
+                + "\n".join(analysis.violations),
+                orig_exc=None,
+            )
+
     def __call__(self, *args, **kwargs) -> Check.FunOutParamsT:
         """Calls the wrapped function"""
         return self.function(*args, **kwargs)
 
+    def profile(self, *args, **kwargs) -> Tuple[Check.FunOutParamsT, LineProfile]:
+        """
+        Calls the wrapped function under a :py:class:`LineProfiler` that records the
+        hits and cumulative time of each line of the code.
+
+        :return:
+            The output of the function and the line profile of the
+            :py:attr:`full_function_code`
+        """
+        function = self.function
+        with LineProfiler(self._filename) as profiler:
+            output = function(*args, **kwargs)
+        return output, profiler.profile(self.full_function_code)
+
     def compatible_with_signature(self, parameters: List[str]) -> str:
         """
         This function checks if the arguments are compatible with the function signature
-        and returns an explanatory message if this is not the case.
+        and returns an explanatory message if this is not the case. The signature is
+        retrieved from the static analysis of the code, so the code is not executed.
+
+        :raise CodeValidationError: if the code has a syntax error
         """
-        if "**" in self.function_parameters:
+        analysis = self.analysis
+        if analysis.parameters is None:
+            self._raise_analysis_errors(analysis)
+        function_parameters = analysis.parameters or ()
+        if analysis.has_var_keyword:
             # function has keyword arguments so it is compatible
             return ""
-        for parameter_name in inspect.signature(self.function).parameters.keys():
+        for parameter_name in function_parameters:
             if not (parameter_name in parameters):
                 return (
                     f"The input parameter {parameter_name} is not compatible with "
                     "the function code."
                 )
+        for parameter_name in parameters:
+            if not (parameter_name in function_parameters):
+                return (
+                    f"The input parameter {parameter_name} is not a parameter of the "
+                    "function code."
+                )
         return ""
 
     @property
@@ -1,13 +1,38 @@
-from ._widget_cue import CueWidget
-from ._widget_cue_box import CheckCueBox, CueBox, SaveCueBox, UpdateCueBox
-from ._widget_cue_figure import CueFigure
-from ._widget_cue_object import CueObject
-from ._widget_cue_output import CueOutput
-from ._widget_reset_cue_button import (
-    CheckResetCueButton,
-    ResetCueButton,
-    SaveResetCueButton,
-    UpdateResetCueButton,
+from typing import TYPE_CHECKING
+
+from .._lazy_import import attach_lazy_attributes
+
+if TYPE_CHECKING:
+    from ._downsampling import Downsampler
+    from ._widget_cue import CueWidget
+    from ._widget_cue_box import CheckCueBox, CueBox, SaveCueBox, UpdateCueBox
+    from ._widget_cue_figure import CueFigure
+    from ._widget_cue_object import CueObject
+    from ._widget_cue_output import CueOutput
+    from ._widget_reset_cue_button import (
+        CheckResetCueButton,
+        ResetCueButton,
+        SaveResetCueButton,
+        UpdateResetCueButton,
+    )
+
+__getattr__, __dir__ = attach_lazy_attributes(
+    __name__,
+    {
+        "Downsampler": "._downsampling",
+        "CueWidget": "._widget_cue",
+        "CheckCueBox": "._widget_cue_box",
+        "CueBox": "._widget_cue_box",
+        "SaveCueBox": "._widget_cue_box",
+        "UpdateCueBox": "._widget_cue_box",
+        "CueFigure": "._widget_cue_figure",
+        "CueObject": "._widget_cue_object",
+        "CueOutput": "._widget_cue_output",
+        "CheckResetCueButton": "._widget_reset_cue_button",
+        "ResetCueButton": "._widget_reset_cue_button",
+        "SaveResetCueButton": "._widget_reset_cue_button",
+        "UpdateResetCueButton": "._widget_reset_cue_button",
+    },
 )
 
 __all__ = [
@@ -23,4 +48,5 @@ __all__ = [
     "CueOutput",
     "CueObject",
     "CueFigure",
+    "Downsampler",
 ]
@@ -0,0 +1,259 @@
+import weakref
+from typing import Any, Optional, Tuple
+
+import numpy as np
+from matplotlib.axes import Axes
+from matplotlib.collections import PathCollection
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+
+
+def get_m4_indices(
+    x: np.ndarray, y: np.ndarray, x_range: Tuple[float, float]
+) -> Optional[np.ndarray]:
+    """
+    Selects the first, last, minimal and maximal point of each pixel column of a line
+    (the M4 aggregation). A line through these points is rasterized to almost the
+    same pixels as the full line. The points left and right of the range are each
+    aggregated as one column, so the data limits of the line are kept.
+
+    :param x:
+        The monotonic x values of the line in pixels
+    :param y:
+        The y values of the line
+    :param x_range:
+        The range of the visible pixels
+    :return:
+        The sorted indices of the selected points, `None` if the x values are not
+        monotonic
+    """
+    first_column, last_column = np.floor(x_range)
+    if len(x) < 2 or not (last_column > first_column):
+        return None
+    increments = np.diff(x)
+    if (increments < 0).any() and (increments > 0).any():
+        return None
+
+    bins = np.floor(x)
+    np.clip(bins, first_column - 1, last_column + 1, out=bins)
+    starts = np.concatenate([[0], np.flatnonzero(np.diff(bins)) + 1])
+    ends = np.concatenate([starts[1:], [len(x)]])
+    segments = np.repeat(np.arange(len(starts)), ends - starts)
+    selected = [starts, ends - 1]
+    for reduce in [np.fmin, np.fmax]:
+        extrema = reduce.reduceat(y, starts)
+        candidates = np.flatnonzero(y == extrema[segments])
+        # the first candidate of each segment
+        candidate_segments = segments[candidates]
+        selected.append(candidates[np.diff(candidate_segments, prepend=-1) != 0])
+    # the start of each gap, so gaps are not bridged
+    is_nan = np.isnan(y)
+    selected.append(np.flatnonzero(is_nan & ~(np.roll(is_nan, 1))))
+    return np.unique(np.concatenate(selected))
+
+
+def get_pixel_indices(pixels: np.ndarray) -> np.ndarray:
+    """
+    Selects one point for each pixel that is covered by points, and the points with
+    extremal coordinates so the data limits are kept.
+
+    :param pixels:
+        The coordinates of the points in pixels with shape (n, 2)
+    :return:
+        The sorted indices of the selected points
+    """
+    finite_indices = np.flatnonzero(np.isfinite(pixels).all(axis=1))
+    if len(finite_indices) == 0:
+        return finite_indices
+    cells = np.floor(pixels[finite_indices]).astype(np.int64)
+    cells -= cells.min(axis=0)
+    keys = cells[:, 0] * (cells[:, 1].max() + 1) + cells[:, 1]
+    _, first_indices = np.unique(keys, return_index=True)
+    extremal_indices = [
+        function(cells[:, dimension])
+        for function in [np.argmin, np.argmax]
+        for dimension in range(2)
+    ]
+    return finite_indices[np.unique(np.concatenate([first_indices, extremal_indices]))]
+
+
+class _FullData:
+    __slots__ = ("data", "shown_data")
+
+    def __init__(self, data: Any):
+        self.data = data
+        # the downsampled data set on the artist, to detect data set by the code
+        self.shown_data: Any = None
+
+
+class Downsampler:
+    """
+    Downsamples lines and scatter plots of a figure with more points than a threshold
+    to the resolution of their axes. The full data is kept, so the artists can be
+    downsampled again for other view limits. Lines are downsampled with
+    :py:func:`get_m4_indices` if their x values are monotonic. Scatter plots keep one
+    point per pixel and are only downsampled if all points have the same size and
+    colors.
+
+    :param threshold:
+        The minimal number of points of an artist to be downsampled
+    :param refine_on_zoom:
+        Whether the artists of an axes are downsampled again when its view limits
+        change, for example by zooming or panning in an interactive backend
+    """
+
+    def __init__(self, threshold: int, refine_on_zoom: bool = False):
+        self._threshold = threshold
+        self._refine_on_zoom = refine_on_zoom
+        self._pixel_scale = 1.0
+        self._full_data: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        # the callback registry of each axes the zoom callbacks are connected to, it
+        # is replaced when the axes is cleared
+        self._connected_callbacks: weakref.WeakKeyDictionary = (
+            weakref.WeakKeyDictionary()
+        )
+        self._updating = False
+
+    @property
+    def threshold(self) -> int:
+        return self._threshold
+
+    def update(self, figure: Figure, pixel_scale: float = 1.0):
+        """
+        Downsamples the artists of all axes of the figure.
+
+        :param pixel_scale:
+            The number of pixels of the rendered image per pixel of the figure
+        """
+        self._pixel_scale = pixel_scale
+        for ax in figure.get_axes():
+            self.update_axes(ax)
+            if (
+                self._refine_on_zoom
+                and self._connected_callbacks.get(ax) is not ax.callbacks
+            ):
+                ax.callbacks.connect("xlim_changed", self._on_limits_changed)
+                ax.callbacks.connect("ylim_changed", self._on_limits_changed)
+                self._connected_callbacks[ax] = ax.callbacks
+
+    def update_axes(self, ax: Axes):
+        # computing the view limits can change them, which calls this method again
+        if self._updating:
+            return
+        self._updating = True
+        try:
+            for line in ax.lines:
+                self._downsample_line(ax, line)
+            for collection in ax.collections:
+                if isinstance(collection, PathCollection):
+                    self._downsample_points(ax, collection)
+        finally:
+            self._updating = False
+
+    def get_full_data(self, artist: Any) -> Optional[Any]:
+        """
+        The data of the artist before it was downsampled, `None` if it was not
+        downsampled.
+        """
+        full_data = self._full_data.get(artist)
+        return None if full_data is None else full_data.data
+
+    def _on_limits_changed(self, ax: Axes):
+        self.update_axes(ax)
+        ax.figure.canvas.draw_idle()
+
+    def _get_full_data(self, artist: Any, *shown_data: Any) -> Optional[_FullData]:
+        full_data = self._full_data.get(artist)
+        if (
+            full_data is not None
+            and full_data.shown_data is not None
+            and all(
+                data is shown for data, shown in zip(shown_data, full_data.shown_data)
+            )
+        ):
+            return full_data
+        self._full_data.pop(artist, None)
+        return None
+
+    def _downsample_line(self, ax: Axes, line: Line2D):
+        full_data = self._get_full_data(
+            line, line.get_xdata(orig=True), line.get_ydata(orig=True)
+        )
+        if full_data is None:
+            x = line.get_xdata(orig=True)
+            y = line.get_ydata(orig=True)
+            if np.ma.is_masked(x) or np.ma.is_masked(y):
+                return
+            x = np.asarray(x)
+            y = np.asarray(y)
+            if (
+                x.ndim != 1
+                or y.shape != x.shape
+                or len(x) < self._threshold
+                or not (np.issubdtype(x.dtype, np.number))
+                or not (np.issubdtype(y.dtype, np.number))
+            ):
+                return
+            full_data = _FullData((x, y.astype(float, copy=False)))
+        x, y = full_data.data
+
+        # applies a pending autoscale and the aspect, as a draw would
+        ax.get_xlim()
+        ax.apply_aspect()
+        # the x values in pixels without transforming the y values
+        pixels = ax.xaxis.get_transform().transform(x)
+        (scale, _), (offset, _) = (ax.transLimits + ax.transAxes).transform(
+            [[1, 0], [0, 0]]
+        )
+        pixels = (pixels * (scale - offset) + offset) * self._pixel_scale
+        window_extent = ax.get_window_extent()
+        indices = (
+            get_m4_indices(
+                pixels,
+                y,
+                (
+                    window_extent.x0 * self._pixel_scale,
+                    window_extent.x1 * self._pixel_scale,
+                ),
+            )
+            if np.isfinite(pixels).all()
+            else None
+        )
+        if indices is None or len(indices) == len(x):
+            if full_data.shown_data is not None:
+                # the line was downsampled for other view limits
+                line.set_data(x, y)
+                del self._full_data[line]
+            return
+        line.set_data(x[indices], y[indices])
+        full_data.shown_data = (line.get_xdata(orig=True), line.get_ydata(orig=True))
+        self._full_data[line] = full_data
+
+    def _downsample_points(self, ax: Axes, collection: PathCollection):
+        full_data = self._get_full_data(collection, collection.get_offsets())
+        if full_data is None:
+            offsets = collection.get_offsets()
+            if np.ma.is_masked(offsets):
+                return
+            offsets = np.asarray(offsets)
+            if (
+                len(offsets) < self._threshold
+                or collection.get_offset_transform() is not ax.transData
+                or collection.get_array() is not None
+                or len(collection.get_sizes()) > 1
+                or len(collection.get_facecolor()) > 1
+                or len(collection.get_edgecolor()) > 1
+            ):
+                return
+            full_data = _FullData(offsets)
+        offsets = full_data.data
+
+        indices = get_pixel_indices(ax.transData.transform(offsets) * self._pixel_scale)
+        if len(indices) == len(offsets):
+            if full_data.shown_data is not None:
+                collection.set_offsets(offsets)
+                del self._full_data[collection]
+            return
+        collection.set_offsets(offsets[indices])
+        full_data.shown_data = (collection.get_offsets(),)
+        self._full_data[collection] = full_data
@@ -2,15 +2,34 @@
 # see https://stackoverflow.com/a/33533514
 from __future__ import annotations
 
-from typing import List, Optional, Union
+import asyncio
+import pickle
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Deque, Dict, Hashable, List, Optional, Tuple, Union
 
 import matplotlib
 import matplotlib.pyplot as plt
-from IPython.display import display
+from IPython.core.pylabtools import print_figure
+from IPython.display import Image, display
 from ipywidgets import Widget
+from matplotlib.artist import Artist
+from matplotlib.axes import Axes
+from matplotlib.collections import (
+    Collection,
+    LineCollection,
+    PathCollection,
+    PolyCollection,
+)
 from matplotlib.figure import Figure
+from matplotlib.image import AxesImage
+from matplotlib.lines import Line2D
+from matplotlib.text import Text
 from traitlets.utils.sentinel import Sentinel
 
+from .._tracing import traced
+from ._downsampling import Downsampler
 from ._widget_cue_output import CueOutput
 
 
@@ -40,8 +59,55 @@ class CueFigure(CueOutput):
           traits_to_observe: in widget :param widgets_to_observe: changes.
           It is supposed to change the style of the box such that the user has a visual
           cue that :param widget_to_cue: has changed.
+    :param redraw_mode:
+        - **clear**: :py:meth:`clear_display` clears all axes with data, so the
+          figure is rebuilt from scratch on each update
+        - **incremental**: :py:meth:`clear_display` keeps the axes and their artists.
+          The lines, collections, images and texts created by the update are matched
+          by order and type with the ones of the previous update. If they match, the
+          data of the new artists is transferred to the previous artists which are
+          kept, otherwise the previous artists are removed. Ticks, labels and limits
+          of the axes are not rebuilt. With the ipympl backend only the updated
+          artists are redrawn by blitting as long as the view limits do not change.
+    :param max_fps:
+        The maximal number of frames drawn per second. A :py:meth:`draw_display`
+        that follows the previous frame too closely is postponed, further draws in
+        the meantime replace it, so the newest state of the figure is always drawn
+        last. Postponed frames are drawn by the running event loop of the kernel,
+        without one they are drawn immediately. `None` draws each frame.
+    :param image_format:
+        The format of the image the figure is rendered to for the `matplotlib inline`
+        backend, either `"png"` or `"jpeg"`
+    :param image_quality:
+        The quality of JPEG images from 1 to 95, `None` uses the default of `Pillow`
+    :param image_dpi:
+        The resolution of the rendered image, `None` uses the resolution of the figure
+    :param image_cache_size:
+        The number of rendered images that are kept for the `matplotlib inline`
+        backend. An image is reused instead of rendering the figure again, if the
+        cache key passed to :py:meth:`draw_display` matches, draws without a cache key
+        are always rendered. The key has to identify everything that changes the
+        figure, for example the parameters of the update. `0` disables the cache.
+    :param downsampling_threshold:
+        Lines and scatter plots with at least this number of points are downsampled
+        to the resolution of their axes before drawing, see
+        :py:class:`Downsampler`. Lines keep the first, last, minimal and maximal point
+        of each pixel column, which draws almost the same pixels as the full line,
+        scatter plots keep one point per pixel. With the ipympl backend, the full data
+        is downsampled again when zooming or panning. `None` disables downsampling.
+    :param render_in_thread:
+        For the `matplotlib inline` backend, renders a snapshot of the figure on a
+        worker thread, so the kernel can process widget events in the meantime. The
+        rendered image is displayed by the running event loop of the kernel, unless a
+        newer frame was displayed in the meantime. The snapshot is created by pickling
+        the figure, which takes a time similar to rendering small figures, so it pays
+        off for large figures. Without a running event loop or if the figure cannot be
+        pickled, the figure is rendered immediately.
     """
 
+    #: The number of frame times that are kept
+    MAX_FRAME_TIMES = 100
+
     def __init__(
         self,
         figure: Figure,
@@ -52,8 +118,63 @@ class CueFigure(CueOutput):
         cued: bool = True,
         show_toolbars: bool = False,
         css_style: Optional[dict] = None,
+        redraw_mode: str = "clear",
+        max_fps: Optional[float] = None,
+        image_format: str = "png",
+        image_quality: Optional[int] = None,
+        image_dpi: Optional[float] = None,
+        image_cache_size: int = 0,
+        downsampling_threshold: Optional[int] = None,
+        render_in_thread: bool = False,
         **kwargs,
     ):
+        allowed_redraw_modes = ["clear", "incremental"]
+        if redraw_mode not in allowed_redraw_modes:
+            raise ValueError(
+                f"Got redraw mode {redraw_mode!r} but only "
+                f"{allowed_redraw_modes} are allowed."
+            )
+        self._redraw_mode = redraw_mode
+        allowed_image_formats = ["png", "jpeg"]
+        if image_format not in allowed_image_formats:
+            raise ValueError(
+                f"Got image format {image_format!r} but only "
+                f"{allowed_image_formats} are allowed."
+            )
+        self._image_format = image_format
+        self._image_quality = image_quality
+        self._image_dpi = image_dpi
+        self._image_cache_size = image_cache_size
+        self._image_cache: OrderedDict[Hashable, Optional[Image]] = OrderedDict()
+        self._nb_image_cache_hits = 0
+        self._nb_image_cache_misses = 0
+        self._render_in_thread = render_in_thread
+        # identifies the newest displayed frame, so older renderings are not shown
+        self._display_generation = 0
+        self._nb_pending_renderings = 0
+        self._downsampler = (
+            None
+            if downsampling_threshold is None
+            else Downsampler(
+                downsampling_threshold,
+                refine_on_zoom=matplotlib.get_backend()
+                in ["module://ipympl.backend_nbagg", "widget"],
+            )
+        )
+        # the artists and data limits of each axis before the update, only set
+        # between clear_display and draw_display in incremental mode
+        self._previous_state: Optional[Dict[Axes, _AxesState]] = None
+        self._blit_artists: List[Artist] = []
+        self._blit_background: Any = None
+        self._draw_event_id: Optional[int] = None
+        self._frame_start: Optional[float] = None
+        self._frame_times: Deque[float] = deque(maxlen=self.MAX_FRAME_TIMES)
+        self.max_fps = max_fps
+        self._pending_frame: Optional[_Frame] = None
+        self._pending_handle: Optional[asyncio.TimerHandle] = None
+        self._last_draw_time = -float("inf")
+        self._nb_dropped_frames = 0
+
         CueOutput.__init__(
             self,
             widgets_to_observe,
@@ -96,18 +217,86 @@ class CueFigure(CueOutput):
 
         self.draw_display()
 
+    @property
+    def redraw_mode(self) -> str:
+        return self._redraw_mode
+
+    @property
+    def max_fps(self) -> Optional[float]:
+        return self._max_fps
+
+    @max_fps.setter
+    def max_fps(self, max_fps: Optional[float]):
+        if max_fps is not None and max_fps <= 0:
+            raise ValueError(f"Got max_fps {max_fps} but it must be positive.")
+        self._max_fps = max_fps
+
+    @property
+    def nb_dropped_frames(self) -> int:
+        """
+        The number of frames that were not drawn because a newer frame replaced them
+        while they were postponed by :py:attr:`max_fps`.
+        """
+        return self._nb_dropped_frames
+
+    @property
+    def nb_image_cache_hits(self) -> int:
+        return self._nb_image_cache_hits
+
+    @property
+    def nb_image_cache_misses(self) -> int:
+        return self._nb_image_cache_misses
+
+    def clear_image_cache(self):
+        self._image_cache.clear()
+
+    @property
+    def render_in_thread(self) -> bool:
+        return self._render_in_thread
+
+    @property
+    def is_rendering(self) -> bool:
+        """
+        Whether an image is rendered on the worker thread, see
+        :py:attr:`render_in_thread`.
+        """
+        return self._nb_pending_renderings > 0
+
+    @property
+    def has_pending_frame(self) -> bool:
+        return self._pending_frame is not None
+
+    @property
+    def frame_times(self) -> Tuple[float, ...]:
+        """
+        The wall times in seconds of the last drawn frames, each from the call of
+        :py:meth:`clear_display`, or :py:meth:`draw_display` if the display was not
+        cleared, until the figure was drawn. The time a frame was postponed by
+        :py:attr:`max_fps` is not included. At most :py:attr:`MAX_FRAME_TIMES` are
+        kept.
+        """
+        return tuple(self._frame_times)
+
+    @property
+    def last_frame_time(self) -> Optional[float]:
+        return self._frame_times[-1] if len(self._frame_times) > 0 else None
+
     def clear_display(self, wait=False):
         """
         :param wait:
             same meaning as for the `wait` parameter in the `ipywidgets.clear_output`
             function
         """
+        self._frame_start = time.perf_counter()
         if matplotlib.backends.backend in [
             "module://matplotlib_inline.backend_inline",
             "macosx",
             "agg",
         ]:
-            self.clear_figure()
+            if self._redraw_mode == "incremental":
+                self._store_previous_state()
+            else:
+                self.clear_figure()
             self.clear_output(wait=wait)
         elif (
             matplotlib.backends.backend == "module://ipympl.backend_nbagg"
@@ -115,10 +304,14 @@ class CueFigure(CueOutput):
         ):
             # jupyter lab 3 uses "module://ipympl.backend_nbagg"
             # jupyter lab 4 uses "widget"
-            self.clear_figure()
-            if not (wait):
-                self.figure.canvas.draw_idle()
-                self.figure.canvas.flush_events()
+            if self._redraw_mode == "incremental":
+                # the figure is unchanged until the next draw
+                self._store_previous_state()
+            else:
+                self.clear_figure()
+                if not (wait):
+                    self.figure.canvas.draw_idle()
+                    self.figure.canvas.flush_events()
         else:
             raise NotImplementedError(
                 f"matplotlib backend {matplotlib.backends.backend!r} not supported. "
@@ -126,24 +319,82 @@ class CueFigure(CueOutput):
                 "that should be supported on all systems."
             )
 
-    def draw_display(self):
+    @traced("draw_figure")
+    def draw_display(self, cache_key: Optional[Hashable] = None):
         """
-        Enforces redrawing the figure
+        Enforces redrawing the figure. If :py:attr:`max_fps` is set, the drawing might
+        be postponed.
+
+        :param cache_key:
+            Identifies the state of the figure for the image cache, for example the
+            parameters that produced it. `None` does not use the image cache.
+        """
+        frame_start = (
+            time.perf_counter() if self._frame_start is None else self._frame_start
+        )
+        self._frame_start = None
+        reused_artists, blittable = self._reuse_previous_artists()
+        if self._downsampler is not None:
+            self._downsampler.update(
+                self.figure,
+                1.0 if self._image_dpi is None else self._image_dpi / self.figure.dpi,
+            )
+        now = time.perf_counter()
+        update_time = now - frame_start
+        if self._pending_frame is not None:
+            # the pending frame is replaced, only its artists are still blittable
+            self._nb_dropped_frames += 1
+            blittable &= self._pending_frame.blittable and set(
+                map(id, reused_artists)
+            ) == set(map(id, self._pending_frame.artists))
+        self._pending_frame = _Frame(reused_artists, blittable, update_time, cache_key)
+
+        delay = (
+            0.0
+            if self._max_fps is None
+            else self._last_draw_time + 1 / self._max_fps - now
+        )
+        if delay <= 0:
+            self.flush_display()
+        elif self._pending_handle is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                # without an event loop nothing could draw the frame later
+                self.flush_display()
+                return
+            self._pending_handle = loop.call_later(delay, self.flush_display)
+
+    def flush_display(self):
+        """
+        Draws the frame postponed by :py:attr:`max_fps` immediately.
         """
+        if self._pending_handle is not None:
+            self._pending_handle.cancel()
+            self._pending_handle = None
+        if self._pending_frame is None:
+            return
+        frame = self._pending_frame
+        self._pending_frame = None
+
+        draw_start = time.perf_counter()
         if matplotlib.backends.backend in [
             "module://matplotlib_inline.backend_inline",
             "macosx",
             "agg",
         ]:
-            with self:
-                display(self.figure)
+            self._display_image(frame.cache_key)
         elif (
             matplotlib.backends.backend == "module://ipympl.backend_nbagg"
             or matplotlib.backends.backend == "widget"
         ):
             # jupyter lab 3 uses "module://ipympl.backend_nbagg"
             # jupyter lab 4 uses "widget"
-            self.figure.canvas.draw_idle()
+            if frame.blittable and self.figure.canvas.supports_blit:
+                self._blit(frame.artists)
+            else:
+                self._stop_blitting()
+                self.figure.canvas.draw_idle()
             self.figure.canvas.flush_events()
         else:
             raise NotImplementedError(
@@ -151,6 +402,183 @@ class CueFigure(CueOutput):
                 "Please change backend to 'widget' by running `%matplotlib widget` "
                 "that should be supported on all systems."
             )
+        self._last_draw_time = time.perf_counter()
+        self._frame_times.append(frame.update_time + self._last_draw_time - draw_start)
+
+    def _display_image(self, cache_key: Optional[Hashable]):
+        """
+        Displays the cached image of the figure or renders it.
+        """
+        self._display_generation += 1
+        key = (
+            None
+            if self._image_cache_size <= 0 or cache_key is None
+            else (cache_key, self._image_format, self._image_quality, self._image_dpi)
+        )
+        if key is not None and key in self._image_cache:
+            self._nb_image_cache_hits += 1
+            self._image_cache.move_to_end(key)
+            self._show_image(self._image_cache[key])
+            return
+        if key is not None:
+            self._nb_image_cache_misses += 1
+
+        loop = None
+        snapshot = None
+        if self._render_in_thread:
+            try:
+                loop = asyncio.get_running_loop()
+                # the snapshot is independent of the figure that is changed by the
+                # next update, matplotlib artists must not be shared between threads
+                snapshot = pickle.loads(pickle.dumps(self.figure))
+            except RuntimeError:
+                pass
+            except (pickle.PicklingError, TypeError, AttributeError):
+                # figures with parts that cannot be pickled, like a formatter with a
+                # lambda function, are rendered immediately
+                pass
+        if loop is None or snapshot is None:
+            image = self._render_image(self.figure)
+            self._cache_image(key, image)
+            self._show_image(image)
+            return
+
+        generation = self._display_generation
+        self._nb_pending_renderings += 1
+        future = _get_render_executor().submit(self._render_image, snapshot)
+        future.add_done_callback(
+            lambda future: loop.call_soon_threadsafe(  # type: ignore[union-attr]
+                self._on_image_rendered, future, key, generation
+            )
+        )
+
+    def _on_image_rendered(
+        self, future: Future, key: Optional[Hashable], generation: int
+    ):
+        self._nb_pending_renderings -= 1
+        # an exception of the rendering is shown in the output
+        with self:
+            image = future.result()
+            self._cache_image(key, image)
+            if generation == self._display_generation and image is not None:
+                display(image)
+
+    def _cache_image(self, key: Optional[Hashable], image: Optional[Image]):
+        if key is None:
+            return
+        self._image_cache[key] = image
+        if len(self._image_cache) > self._image_cache_size:
+            self._image_cache.popitem(last=False)
+
+    def _show_image(self, image: Optional[Image]):
+        if image is not None:
+            with self:
+                display(image)
+
+    def _render_image(self, figure: Figure) -> Optional[Image]:
+        kwargs: Dict[str, Any] = {}
+        if self._image_dpi is not None:
+            kwargs["dpi"] = self._image_dpi
+        if self._image_quality is not None:
+            kwargs["pil_kwargs"] = {"quality": self._image_quality}
+        # the same rendering as the one of the inline backend
+        data = print_figure(figure, self._image_format, **kwargs)
+        if data is None:
+            # the figure is empty
+            return None
+        return Image(data=data, format=self._image_format)
+
+    def _store_previous_state(self):
+        self._previous_state = {
+            ax: _AxesState(ax, _get_reusable_artists(ax))
+            for ax in self.figure.get_axes()
+        }
+        for ax in self._previous_state.keys():
+            # the data limits are recomputed from the artists of the update
+            ax.ignore_existing_data_limits = True
+
+    def _reuse_previous_artists(self) -> Tuple[List[Artist], bool]:
+        """
+        Transfers the data of the artists created since :py:meth:`clear_display` to
+        the matching artists of the previous update.
+
+        :return:
+            The artists that were reused and whether the figure can be updated by
+            only redrawing them, that is when all new artists were reused and the view
+            limits did not change
+        """
+        if self._previous_state is None:
+            return [], False
+        previous_state = self._previous_state
+        self._previous_state = None
+
+        reused_artists: List[Artist] = []
+        blittable = True
+        for ax in self.figure.get_axes():
+            if ax not in previous_state:
+                blittable = False
+                continue
+            state = previous_state[ax]
+            artists = _get_reusable_artists(ax)
+            previous_artist_ids = {id(artist) for artist in state.artists}
+            new_artists = [
+                artist for artist in artists if id(artist) not in previous_artist_ids
+            ]
+            if len(new_artists) == 0:
+                # nothing was plotted, the artists might have been updated in place
+                ax.dataLim.set(state.data_limits)
+                ax.ignore_existing_data_limits = state.ignore_existing_data_limits
+                continue
+            if _artists_match(state.artists, new_artists):
+                for previous_artist, new_artist in zip(state.artists, new_artists):
+                    _transfer_data(new_artist, previous_artist)
+                    new_artist.remove()
+                reused_artists.extend(state.artists)
+                # accessing the view limits applies a pending autoscale
+                blittable &= state.view_limits == ax.viewLim.frozen().bounds
+            else:
+                for previous_artist in state.artists:
+                    previous_artist.remove()
+                blittable = False
+        return reused_artists, blittable
+
+    def _blit(self, artists: List[Artist]):
+        """
+        Redraws only the given artists on the background of the last full draw.
+        """
+        canvas = self.figure.canvas
+        if self._draw_event_id is None:
+            self._draw_event_id = canvas.mpl_connect("draw_event", self._on_draw)
+        if set(map(id, artists)) != set(map(id, self._blit_artists)):
+            self._stop_blitting(disconnect=False)
+            for artist in artists:
+                artist.set_animated(True)
+            self._blit_artists = artists
+        if self._blit_background is None:
+            # the full draw stores the background and draws the animated artists
+            canvas.draw()
+        else:
+            canvas.restore_region(self._blit_background)  # type: ignore[attr-defined]
+            for artist in self._blit_artists:
+                self.figure.draw_artist(artist)
+        canvas.blit(self.figure.bbox)
+
+    def _on_draw(self, event):
+        # animated artists are not drawn on a full draw, for example on a resize of
+        # the canvas, so they are drawn on top of the stored background
+        canvas = self.figure.canvas
+        self._blit_background = canvas.copy_from_bbox(self.figure.bbox)
+        for artist in self._blit_artists:
+            self.figure.draw_artist(artist)
+
+    def _stop_blitting(self, disconnect: bool = True):
+        for artist in self._blit_artists:
+            artist.set_animated(False)
+        self._blit_artists = []
+        self._blit_background = None
+        if disconnect and self._draw_event_id is not None:
+            self.figure.canvas.mpl_disconnect(self._draw_event_id)
+            self._draw_event_id = None
 
     def clear_figure(self):
         """
@@ -160,3 +588,111 @@ class CueFigure(CueOutput):
         for ax in self.figure.get_axes():
             if ax.has_data() or len(ax.artists) > 0:
                 ax.clear()
+
+
+_RENDER_EXECUTOR: Optional[ThreadPoolExecutor] = None
+
+
+def _get_render_executor() -> ThreadPoolExecutor:
+    """
+    The worker thread shared by all figures, a single worker renders the images in
+    the order of the frames.
+    """
+    global _RENDER_EXECUTOR
+    if _RENDER_EXECUTOR is None:
+        _RENDER_EXECUTOR = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="scwidgets-render"
+        )
+    return _RENDER_EXECUTOR
+
+
+class _Frame:
+    """
+    A frame that was updated but not drawn yet.
+    """
+
+    __slots__ = ("artists", "blittable", "update_time", "cache_key")
+
+    def __init__(
+        self,
+        artists: List[Artist],
+        blittable: bool,
+        update_time: float,
+        cache_key: Optional[Hashable],
+    ):
+        self.artists = artists
+        self.blittable = blittable
+        self.update_time = update_time
+        self.cache_key = cache_key
+
+
+class _AxesState:
+    """
+    The artists, data limits and view limits of an axis before an update.
+    """
+
+    __slots__ = (
+        "artists",
+        "data_limits",
+        "ignore_existing_data_limits",
+        "view_limits",
+    )
+
+    def __init__(self, ax: Axes, artists: List[Artist]):
+        self.artists = artists
+        self.data_limits = ax.dataLim.frozen()
+        self.ignore_existing_data_limits = ax.ignore_existing_data_limits
+        self.view_limits = ax.viewLim.frozen().bounds
+
+
+def _get_reusable_artists(ax: Axes) -> List[Artist]:
+    return [*ax.lines, *ax.collections, *ax.images, *ax.texts]
+
+
+def _artists_match(previous_artists: List[Artist], new_artists: List[Artist]) -> bool:
+    return len(previous_artists) == len(new_artists) and all(
+        type(previous_artist) is type(new_artist)
+        and (
+            not (isinstance(new_artist, Collection))
+            or isinstance(new_artist, _REUSABLE_COLLECTIONS)
+        )
+        for previous_artist, new_artist in zip(previous_artists, new_artists)
+    )
+
+
+def _transfer_data(source: Artist, target: Artist):
+    """
+    Transfers the data and the style of the source artist to the target artist of the
+    same type.
+    """
+    target.update_from(source)
+    target.set_label(source.get_label())
+    if isinstance(source, Line2D):
+        target.set_data(*source.get_data(orig=True))  # type: ignore[attr-defined]
+    elif isinstance(source, Collection):
+        paths = source.get_paths()
+        if isinstance(target, LineCollection):
+            target.set_segments([path.vertices for path in paths])
+        elif isinstance(target, PolyCollection):
+            target.set_verts_and_codes(
+                [path.vertices for path in paths],
+                [path.codes for path in paths],  # type: ignore[misc]
+            )
+        else:
+            target.set_paths(paths)  # type: ignore[attr-defined]
+        target.set_offsets(source.get_offsets())  # type: ignore[attr-defined]
+        target.set_array(source.get_array())  # type: ignore[attr-defined]
+        if isinstance(source, PathCollection):
+            target.set_sizes(source.get_sizes())  # type: ignore[attr-defined]
+    elif isinstance(source, AxesImage):
+        target.set_data(source.get_array())  # type: ignore[attr-defined]
+        target.set_extent(source.get_extent())  # type: ignore[attr-defined]
+        target.set_cmap(source.get_cmap())  # type: ignore[attr-defined]
+        target.set_clim(*source.get_clim())  # type: ignore[attr-defined]
+    elif isinstance(source, Text):
+        target.set_text(source.get_text())  # type: ignore[attr-defined]
+        target.set_position(source.get_position())  # type: ignore[attr-defined]
+
+
+#: Collections whose data is fully described by their paths, offsets and array
+_REUSABLE_COLLECTIONS = (LineCollection, PathCollection, PolyCollection)
@@ -2,8 +2,11 @@
 # see https://stackoverflow.com/a/33533514
 from __future__ import annotations
 
-from typing import Any, List, Optional, Union
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Tuple, Union
 
+from IPython import get_ipython
 from IPython.display import display
 from ipywidgets import Widget
 from traitlets.utils.sentinel import Sentinel
@@ -31,6 +34,13 @@ class CueObject(CueOutput):
           `traits_to_observe` in widget `widgets_to_observe` changes.
           It is supposed to change the style of the box such that the user has a visual
           cue that `widget_to_cue` has changed.
+    :param update_mode:
+        - **full**: :py:meth:`clear_display` clears the output and
+          :py:meth:`draw_display` displays the object again
+        - **diff**: the output is only changed by :py:meth:`draw_display` if the
+          representation of the object changed since the last display, the call of
+          :py:meth:`clear_display` is ignored. If a string was extended, only the
+          appended text is sent, other representations are sent in full.
     """
 
     def __init__(
@@ -42,9 +52,22 @@ class CueObject(CueOutput):
         ] = None,
         cued: bool = True,
         css_style: Optional[dict] = None,
+        update_mode: str = "full",
         *args,
         **kwargs,
     ):
+        allowed_update_modes = ["full", "diff"]
+        if update_mode not in allowed_update_modes:
+            raise ValueError(
+                f"Got update mode {update_mode!r} but only "
+                f"{allowed_update_modes} are allowed."
+            )
+        self._update_mode = update_mode
+        # the text or the digest of the representation that is displayed in diff mode
+        self._displayed_text: Optional[str] = None
+        self._displayed_digest: Optional[bytes] = None
+        self._nb_skipped_updates = 0
+
         CueOutput.__init__(
             self,
             widgets_to_observe,
@@ -65,12 +88,83 @@ class CueObject(CueOutput):
     def object(self, object: Any):
         self._object = object
 
+    @property
+    def update_mode(self) -> str:
+        return self._update_mode
+
+    @property
+    def nb_skipped_updates(self) -> int:
+        """
+        The number of calls of :py:meth:`draw_display` in diff mode that did not send
+        anything, because the representation of the object was unchanged.
+        """
+        return self._nb_skipped_updates
+
     def clear_display(self, wait=False):
+        if self._update_mode == "diff":
+            # draw_display only clears the output if the representation changed
+            return
         self.clear_output(wait=wait)
 
     def draw_display(self):
+        if self._update_mode == "diff":
+            self._draw_display_diff()
+            return
         with self:
             if isinstance(self._object, str):
                 print(self._object)
             elif self._object is not None:
                 display(self._object)
+
+    def _draw_display_diff(self):
+        if isinstance(self._object, str):
+            text = self._object + "\n"
+            displayed_text = self._displayed_text
+            if text == displayed_text:
+                self._nb_skipped_updates += 1
+                return
+            if displayed_text is not None and text.startswith(displayed_text):
+                with self:
+                    print(text.removeprefix(displayed_text), end="")
+            else:
+                self._clear_displayed()
+                with self:
+                    print(text, end="")
+            self._displayed_text = text
+        elif self._object is None:
+            if self._displayed_text is None and self._displayed_digest is None:
+                self._nb_skipped_updates += 1
+                return
+            self.clear_output()
+            self._displayed_text = None
+            self._displayed_digest = None
+        else:
+            data, metadata = _format_object(self._object)
+            digest = hashlib.blake2b(
+                json.dumps([data, metadata], sort_keys=True, default=repr).encode(),
+                digest_size=16,
+            ).digest()
+            if digest == self._displayed_digest:
+                self._nb_skipped_updates += 1
+                return
+            self._clear_displayed()
+            with self:
+                display(data, metadata=metadata, raw=True)
+            self._displayed_digest = digest
+
+    def _clear_displayed(self):
+        if self._displayed_text is not None or self._displayed_digest is not None:
+            # the output is cleared when the new output arrives to prevent flickering
+            self.clear_output(wait=True)
+        self._displayed_text = None
+        self._displayed_digest = None
+
+
+def _format_object(object: Any) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Computes the mime bundle the object is displayed with.
+    """
+    shell = get_ipython()
+    if shell is None:
+        return {"text/plain": repr(object)}, {}
+    return shell.display_formatter.format(object)
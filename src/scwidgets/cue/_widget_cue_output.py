@@ -2,7 +2,10 @@
 # see https://stackoverflow.com/a/33533514
 from __future__ import annotations
 
-from typing import List, Optional, Union
+import os
+import sys
+import threading
+from typing import IO, Any, List, Optional, Tuple, Union
 
 from ipywidgets import Output, Widget
 from traitlets.utils.sentinel import Sentinel
@@ -27,6 +30,17 @@ class CueOutput(Output, CueWidget):
           in widget `widgets_to_observe` changes.
           It is supposed to change the style of the box such that the user has a visual
           cue that `widget_to_cue` has changed.
+    :param max_bytes:
+        The maximal number of bytes printed to stdout and stderr within the output per
+        update, that is between two calls of :py:meth:`clear_output`. Further output
+        is truncated with a notice. `None` does not limit the output.
+    :param max_lines:
+        The maximal number of lines printed per update, `None` does not limit the
+        output. Only if `max_bytes` or `max_lines` is given, stdout and stderr are
+        replaced while the output is entered to count and truncate the output.
+    :param overflow_file:
+        The file the truncated output of the last update is written to. `None`
+        discards the truncated output.
     """
 
     def __init__(
@@ -37,9 +51,16 @@ class CueOutput(Output, CueWidget):
         ] = None,
         cued: bool = True,
         css_style: Optional[dict] = None,
+        max_bytes: Optional[int] = None,
+        max_lines: Optional[int] = None,
+        overflow_file: Union[None, str, os.PathLike] = None,
         *args,
         **kwargs,
     ):
+        self._budget = _OutputBudget(max_bytes, max_lines, overflow_file)
+        # the budgeted stdout and stderr installed while the output is entered
+        self._nb_entered = 0
+        self._streams: Optional[Tuple[_BudgetedStream, _BudgetedStream]] = None
         if css_style is None:
             css_style = {
                 "base": "scwidget-cue-output",
@@ -76,3 +97,210 @@ class CueOutput(Output, CueWidget):
         else:
             self.remove_class(self._css_style["cue"])
         self._cued = cued
+
+    @property
+    def max_bytes(self) -> Optional[int]:
+        return self._budget.max_bytes
+
+    @property
+    def max_lines(self) -> Optional[int]:
+        return self._budget.max_lines
+
+    @property
+    def nb_output_bytes(self) -> int:
+        """
+        The number of bytes printed within the output including the truncated ones,
+        only counted if the output is limited.
+        """
+        return self._budget.nb_output_bytes
+
+    @property
+    def nb_output_lines(self) -> int:
+        return self._budget.nb_output_lines
+
+    @property
+    def nb_truncated_bytes(self) -> int:
+        """
+        The number of bytes that were not sent to the output because they exceeded
+        the budget.
+        """
+        return self._budget.nb_truncated_bytes
+
+    def clear_output(self, *args, **kwargs):
+        # a new update starts with a new budget, outside of IPython the clearing is
+        # printed, so the budget is also reset afterwards
+        self._budget.reset()
+        Output.clear_output(self, *args, **kwargs)
+        self._budget.reset()
+
+    def __enter__(self):
+        Output.__enter__(self)
+        if self._nb_entered == 0 and self._budget.is_limited:
+            self._streams = (
+                _BudgetedStream(sys.stdout, self._budget),
+                _BudgetedStream(sys.stderr, self._budget),
+            )
+            sys.stdout, sys.stderr = self._streams
+        self._nb_entered += 1
+
+    def __exit__(self, etype, evalue, tb):
+        self._nb_entered -= 1
+        if self._nb_entered == 0 and self._streams is not None:
+            # the streams are restored before a traceback is shown
+            stdout, stderr = self._streams
+            self._streams = None
+            sys.stdout = _remove_stream(sys.stdout, stdout)
+            sys.stderr = _remove_stream(sys.stderr, stderr)
+            self._budget.close_overflow_file()
+        return Output.__exit__(self, etype, evalue, tb)
+
+
+class _OutputBudget:
+    """
+    Counts the output of an update and truncates it when it exceeds the maximal
+    number of bytes or lines.
+    """
+
+    def __init__(
+        self,
+        max_bytes: Optional[int],
+        max_lines: Optional[int],
+        overflow_file: Union[None, str, os.PathLike],
+    ):
+        self.max_bytes = max_bytes
+        self.max_lines = max_lines
+        self.overflow_file = overflow_file
+        self.nb_output_bytes = 0
+        self.nb_output_lines = 0
+        self.nb_truncated_bytes = 0
+        self._nb_update_bytes = 0
+        self._nb_update_lines = 0
+        self._truncated = False
+        self._overflow_stream: Optional[IO[str]] = None
+        # whether the overflow file was started in the current update
+        self._overflow_started = False
+
+    @property
+    def is_limited(self) -> bool:
+        return self.max_bytes is not None or self.max_lines is not None
+
+    def reset(self):
+        self.close_overflow_file()
+        self._nb_update_bytes = 0
+        self._nb_update_lines = 0
+        self._truncated = False
+        self._overflow_started = False
+
+    def write(self, stream: Any, text: str):
+        nb_bytes = len(text.encode(errors="replace"))
+        self.nb_output_bytes += nb_bytes
+        self.nb_output_lines += text.count("\n")
+        if self._truncated:
+            self._write_overflow(text, nb_bytes)
+            return
+
+        allowed_text = self._get_allowed_text(text)
+        if len(allowed_text) > 0:
+            stream.write(allowed_text)
+        self._nb_update_bytes += len(allowed_text.encode(errors="replace"))
+        self._nb_update_lines += allowed_text.count("\n")
+        nb_allowed_characters = len(allowed_text)
+        if nb_allowed_characters < len(text):
+            self._truncated = True
+            rest = text[nb_allowed_characters:]
+            stream.write(self._get_notice())
+            self._write_overflow(rest, len(rest.encode(errors="replace")))
+
+    def close_overflow_file(self):
+        if self._overflow_stream is not None:
+            self._overflow_stream.close()
+            self._overflow_stream = None
+
+    def _get_allowed_text(self, text: str) -> str:
+        allowed_text = text
+        if self.max_lines is not None:
+            # the text up to the last allowed line break
+            end = -1
+            for _ in range(max(self.max_lines - self._nb_update_lines, 0)):
+                end = allowed_text.find("\n", end + 1)
+                if end == -1:
+                    break
+            else:
+                allowed_text = allowed_text[: end + 1]
+        if self.max_bytes is not None:
+            nb_remaining_bytes = max(self.max_bytes - self._nb_update_bytes, 0)
+            encoded_text = allowed_text.encode(errors="replace")
+            if len(encoded_text) > nb_remaining_bytes:
+                # a character cut in the middle is dropped
+                allowed_text = encoded_text[:nb_remaining_bytes].decode(errors="ignore")
+        return allowed_text
+
+    def _get_notice(self) -> str:
+        limits = []
+        if self.max_bytes is not None:
+            limits.append(f"{self.max_bytes} bytes")
+        if self.max_lines is not None:
+            limits.append(f"{self.max_lines} lines")
+        notice = (
+            "\n[Output truncated, it exceeded the limit of "
+            f"{' or '.join(limits)} per update."
+        )
+        if self.overflow_file is not None:
+            notice += f" The rest is written to {os.fspath(self.overflow_file)!r}."
+        return notice + "]\n"
+
+    def _write_overflow(self, text: str, nb_bytes: int):
+        self.nb_truncated_bytes += nb_bytes
+        if self.overflow_file is None:
+            return
+        if self._overflow_stream is None:
+            self._overflow_stream = open(
+                self.overflow_file, "a" if self._overflow_started else "w"
+            )
+            self._overflow_started = True
+        self._overflow_stream.write(text)
+
+
+class _BudgetedStream:
+    """
+    Replaces stdout or stderr while the output is entered, so the output is counted
+    and truncated before it is sent. The streams are shared by all threads, so only
+    the text written by the thread that entered the output is counted, text of other
+    threads like the rendering thread of :py:class:`CueFigure` is passed through.
+    """
+
+    def __init__(self, stream: Any, budget: _OutputBudget):
+        self._stream = stream
+        # `None` once the output is exited, the text is then passed through
+        self._budget: Optional[_OutputBudget] = budget
+        self._thread_id = threading.get_ident()
+
+    def write(self, text: str) -> int:
+        if self._budget is None or threading.get_ident() != self._thread_id:
+            return self._stream.write(text)
+        self._budget.write(self._stream, text)
+        return len(text)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._stream, name)
+
+
+def _remove_stream(current_stream: Any, stream: _BudgetedStream) -> Any:
+    """
+    Removes the budgeted stream from the streams wrapped by the current stream and
+    returns the stream that replaces the current one. Outputs can be exited in a
+    different order than they were entered, so the stream is not necessarily the
+    current one.
+    """
+    if current_stream is stream:
+        return stream._stream
+    wrapping_stream = current_stream
+    while isinstance(wrapping_stream, _BudgetedStream):
+        if wrapping_stream._stream is stream:
+            wrapping_stream._stream = stream._stream
+            return current_stream
+        wrapping_stream = wrapping_stream._stream
+    # the stream was replaced by other code that restores it later, until then the
+    # text is passed through
+    stream._budget = None
+    return current_stream
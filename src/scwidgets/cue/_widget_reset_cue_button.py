@@ -3,6 +3,7 @@ from typing import Callable, Dict, List, Optional, Union
 from ipywidgets import Button, Widget
 from traitlets.utils.sentinel import Sentinel
 
+from .._instrumentation import counted_as
 from ._widget_cue import CueWidget
 
 
@@ -158,17 +159,19 @@ class ResetCueButton(Button, CueWidget):
         self._disable_on_successful_action = disable_on_successful_action
 
     def _on_click(self, button: Button):
-        self.disabled = self._disable_during_action
-        success = False
-        try:
-            success = self._action()
-        except Exception as e:
-            raise e
-        finally:
-            for cue_box in self._cue_widgets:
-                cue_box.cued = False
-            self.cued = False
-            self.disabled = success and self._disable_on_successful_action
+        # the changes of the buttons are counted for the action of the click
+        with counted_as(getattr(self._action, "user_action", None)):
+            self.disabled = self._disable_during_action
+            success = False
+            try:
+                success = self._action()
+            except Exception as e:
+                raise e
+            finally:
+                for cue_box in self._cue_widgets:
+                    cue_box.cued = False
+                self.cued = False
+                self.disabled = success and self._disable_on_successful_action
 
 
 class SaveResetCueButton(ResetCueButton):
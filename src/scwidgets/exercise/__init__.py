@@ -1,7 +1,23 @@
-from ._widget_code_exercise import CodeExercise
-from ._widget_exercise_registry import ExerciseRegistry, ExerciseWidget
-from ._widget_multiplechoice_exercise import MultipleChoiceExercise
-from ._widget_text_exercise import TextExercise
+from typing import TYPE_CHECKING
+
+from .._lazy_import import attach_lazy_attributes
+
+if TYPE_CHECKING:
+    from ._widget_code_exercise import CodeExercise
+    from ._widget_exercise_registry import ExerciseRegistry, ExerciseWidget
+    from ._widget_multiplechoice_exercise import MultipleChoiceExercise
+    from ._widget_text_exercise import TextExercise
+
+__getattr__, __dir__ = attach_lazy_attributes(
+    __name__,
+    {
+        "CodeExercise": "._widget_code_exercise",
+        "ExerciseRegistry": "._widget_exercise_registry",
+        "ExerciseWidget": "._widget_exercise_registry",
+        "MultipleChoiceExercise": "._widget_multiplechoice_exercise",
+        "TextExercise": "._widget_text_exercise",
+    },
+)
 
 __all__ = [
     "CodeExercise",
@@ -2,25 +2,35 @@
 # see https://stackoverflow.com/a/33533514
 from __future__ import annotations
 
+import importlib.util
 import inspect
+import sys
 import types
 from platform import python_version
-from typing import Any, Callable, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, Union
 
 from ipywidgets import HTML, Box, HBox, HTMLMath, Layout, VBox, Widget
-from matplotlib.figure import Figure
 from widget_code_input import WidgetCodeInput
 from widget_code_input.utils import CodeValidationError
 
+from .._instrumentation import user_action
+from .._tracing import traced
 from .._utils import Formatter
-from ..check import Check, CheckableWidget, CheckRegistry, CheckResult
+from .._watchdog import ExecutionTimeoutError, call_with_time_limit
+from ..check import (
+    Check,
+    CheckableWidget,
+    CheckRegistry,
+    CheckResult,
+    fingerprint_blake2b,
+)
+from ..code._line_profiler import LineProfile
 from ..code._widget_code_input import CodeInput
 from ..code._widget_parameters_panel import ParametersPanel
 from ..css_style import CssStyle
 from ..cue import (
     CheckCueBox,
     CheckResetCueButton,
-    CueFigure,
     CueObject,
     CueOutput,
     SaveCueBox,
@@ -30,6 +40,13 @@ from ..cue import (
 )
 from ._widget_exercise_registry import ExerciseRegistry, ExerciseWidget
 
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+_CUE_FIGURE_MODULE = importlib.util.resolve_name(
+    "..cue._widget_cue_figure", __package__
+)
+
 
 class CodeExercise(VBox, CheckableWidget, ExerciseWidget):
     """
@@ -71,8 +88,42 @@ class CodeExercise(VBox, CheckableWidget, ExerciseWidget):
 
     :param title:
         A title for the exercise. If not given, `key` is used.
+
+    :param timeout:
+        The time limit in seconds for each run of the code in :py:meth:`run_code`,
+        `None` disables the limit. Code exceeding the limit, for example because of
+        an infinite loop, is interrupted without restarting the kernel and an
+        :py:class:`ExecutionTimeoutError` with the executed line is raised.
+
+    :param profile:
+        If `True`, a profile button is shown that runs the code with the current
+        parameters under a line profiler and shows the hits and cumulative time of
+        each line of the code. The button is only shown if `code` is given as
+        function or :py:class:`CodeInput`. The profiler slows down Python loops about
+        10 to 20 times, see :py:class:`LineProfiler`, so a warning is shown below the
+        profile if the profiled code ran longer than :py:attr:`PROFILE_WARNING_TIME`.
+
+    :param figure_kwargs:
+        Keyword arguments for the :py:class:`CueFigure` that is created for each
+        figure in `outputs`, for example `{"redraw_mode": "incremental"}` to reuse the
+        artists of the figure between updates. The rendered images of the figures are
+        cached by the code and the parameters of the update, see
+        :py:attr:`FIGURE_IMAGE_CACHE_SIZE`. Updates depending on other state, like
+        random numbers, have to disable the cache with `{"image_cache_size": 0}`.
+    :param output_kwargs:
+        Keyword arguments for the :py:class:`CueOutput` that shows the printed output
+        and errors of the exercise, for example `{"max_bytes": 100000}` to truncate
+        large printed output.
     """
 
+    #: The time in seconds of a profiled run above which the profile action warns
+    #: that the line profiler slows down the code
+    PROFILE_WARNING_TIME = 1.0
+
+    #: The number of rendered images that are cached for each figure in `outputs`, so
+    #: an update with code and parameters that were drawn before reuses the image
+    FIGURE_IMAGE_CACHE_SIZE = 16
+
     def __init__(
         self,
         code: Union[None, WidgetCodeInput, types.FunctionType] = None,
@@ -92,6 +143,10 @@ class CodeExercise(VBox, CheckableWidget, ExerciseWidget):
         ] = None,
         description: Optional[str] = None,
         title: Optional[str] = None,
+        timeout: Optional[float] = None,
+        profile: bool = False,
+        figure_kwargs: Optional[Dict[str, Any]] = None,
+        output_kwargs: Optional[Dict[str, Any]] = None,
         *args,
         **kwargs,
     ):
@@ -102,6 +157,7 @@ class CodeExercise(VBox, CheckableWidget, ExerciseWidget):
                 f"{allowed_update_modes} are allowed."
             )
         self._update_mode = update_mode
+        self._timeout = timeout
 
         self._update_func: Optional[
             Union[
@@ -197,7 +253,7 @@ class CodeExercise(VBox, CheckableWidget, ExerciseWidget):
             ExerciseWidget.__init__(self, None, None)
 
         self._code = code
-        self._output = CueOutput()
+        self._output = CueOutput(**({} if output_kwargs is None else output_kwargs))
 
         if outputs is None:
             outputs = []
@@ -206,11 +262,21 @@ class CodeExercise(VBox, CheckableWidget, ExerciseWidget):
 
         self._cue_outputs: List[CueOutput] = []
         for output in outputs:
-            if isinstance(output, Figure):
+            if _is_instance(output, "matplotlib.figure", "Figure"):
+                from ..cue import CueFigure
+
                 # This needs to happen before the creation of the
                 # ParametersPanel otherwise the figure is not properly closed. I
                 # am not sure why, I guess it is something related to interact
-                self._cue_outputs.append(CueFigure(output))
+                self._cue_outputs.append(
+                    CueFigure(
+                        output,
+                        **{
+                            "image_cache_size": self.FIGURE_IMAGE_CACHE_SIZE,
+                            **({} if figure_kwargs is None else figure_kwargs),
+                        },
+                    )
+                )
             elif isinstance(output, CueOutput):
                 self._cue_outputs.append(output)
             else:
@@ -482,15 +548,38 @@ class CodeExercise(VBox, CheckableWidget, ExerciseWidget):
         if self._cue_parameters_panel is not None:
             demo_children.append(self._cue_parameters_panel)
 
-        buttons = []
-        if self._check_button is None and self._update_button is None:
-            self._code_buttons = HBox([])
-        elif self._check_button is None:
-            self._code_buttons = HBox([self._update_button])
-        elif self._update_button is None:
-            self._code_buttons = HBox([self._check_button])
+        if not (profile) or not (isinstance(self._code, CodeInput)):
+            self._profile_button = None
         else:
-            self._code_buttons = HBox([self._check_button, self._update_button])
+            self._profile_button = UpdateResetCueButton(
+                [],
+                self._on_click_profile_action,
+                disable_on_successful_action=False,
+                disable_during_action=kwargs.pop(
+                    "disable_profile_button_during_action", True
+                ),
+                widgets_to_observe=[],
+                traits_to_observe=[],
+                cued=False,
+                description="Profile Code",
+                button_tooltip=(
+                    "Runs the code with the specified parameters and shows the time "
+                    "spent in each line"
+                ),
+            )
+
+        buttons = []
+        self._code_buttons = HBox(
+            [
+                button
+                for button in [
+                    self._check_button,
+                    self._update_button,
+                    self._profile_button,
+                ]
+                if button is not None
+            ]
+        )
         buttons.append(self._code_buttons)
 
         if self._save_button is not None and self._load_button is not None:
@@ -592,6 +681,14 @@ class CodeExercise(VBox, CheckableWidget, ExerciseWidget):
             {} if self._parameters_panel is None else self._parameters_panel.parameters
         )
 
+    @property
+    def timeout(self) -> Optional[float]:
+        return self._timeout
+
+    @timeout.setter
+    def timeout(self, timeout: Optional[float]):
+        self._timeout = timeout
+
     @property
     def title(self) -> Union[str, None]:
         return self._title
@@ -603,6 +700,8 @@ class CodeExercise(VBox, CheckableWidget, ExerciseWidget):
     def _on_trait_parameters_changed(self, change: dict):
         self.run_update()
 
+    @user_action("check")
+    @traced("check")
     def _on_click_check_action(self) -> bool:
         self._output.clear_output(wait=True)
         raised_error = False
@@ -616,6 +715,7 @@ class CodeExercise(VBox, CheckableWidget, ExerciseWidget):
                 raise e
         return not (raised_error)
 
+    @user_action("save")
     def _on_click_save_action(self) -> bool:
         self._output.clear_output(wait=True)
         raised_error = False
@@ -634,6 +734,7 @@ class CodeExercise(VBox, CheckableWidget, ExerciseWidget):
                 raise e
         return not (raised_error)
 
+    @user_action("load")
     def _on_click_load_action(self) -> bool:
         self._output.clear_output(wait=True)
         raised_error = False
@@ -730,10 +831,12 @@ class CodeExercise(VBox, CheckableWidget, ExerciseWidget):
         return (
             self._cue_outputs[0].figure
             if len(self._cue_outputs) > 0
-            and isinstance(self._cue_outputs[0], CueFigure)
+            and _is_instance(self._cue_outputs[0], _CUE_FIGURE_MODULE, "CueFigure")
             else None
         )
 
+    @user_action("update")
+    @traced("update")
     def _on_click_update_action(self) -> bool:
         self._output.clear_output(wait=True)
         raised_error = False
@@ -752,8 +855,11 @@ class CodeExercise(VBox, CheckableWidget, ExerciseWidget):
                 elif self._code is not None:
                     self.run_code(**self.parameters)
 
+                cache_key = self._get_figure_cache_key()
                 for cue_output in self.outputs:
-                    if hasattr(cue_output, "draw_display"):
+                    if _is_instance(cue_output, _CUE_FIGURE_MODULE, "CueFigure"):
+                        cue_output.draw_display(cache_key)
+                    elif hasattr(cue_output, "draw_display"):
                         cue_output.draw_display()
 
             except CodeValidationError as e:
@@ -770,6 +876,64 @@ class CodeExercise(VBox, CheckableWidget, ExerciseWidget):
 
         return not (raised_error)
 
+    def _get_figure_cache_key(self) -> Optional[str]:
+        """
+        Identifies the figures drawn by an update by the code and the parameters,
+        `None` if the parameters cannot be fingerprinted.
+        """
+        code = (
+            self._code.full_function_code
+            if isinstance(self._code, WidgetCodeInput)
+            else None
+        )
+        try:
+            return fingerprint_blake2b((code, self.parameters))[0]
+        except TypeError:
+            return None
+
+    @user_action("profile")
+    def _on_click_profile_action(self) -> bool:
+        self._output.clear_output(wait=True)
+        raised_error = False
+        with self._output:
+            try:
+                _, profile = self.profile_code(**self.parameters)
+                print(profile.format())
+                if profile.total_time > self.PROFILE_WARNING_TIME:
+                    print(
+                        Formatter.color_info_message(
+                            "The line profiler slows down Python code up to 20 "
+                            "times, so the times are larger than without profiler. "
+                            "Consider profiling the code with smaller inputs."
+                        )
+                    )
+            except Exception as e:
+                raised_error = True
+                raise e
+        return not (raised_error)
+
+    def run_profile(self):
+        """
+        Invokes a profile run, the same that is invoked by a click on the profile
+        button.
+        """
+        if self._profile_button is not None:
+            self._profile_button.click()
+        else:
+            self._on_click_profile_action()
+
+    def profile_code(self, *args, **kwargs) -> Tuple[Check.FunOutParamsT, LineProfile]:
+        """
+        Runs the `code` like :py:meth:`run_code` under a line profiler and returns the
+        output of the `code` and the :py:class:`LineProfile` of its lines.
+        """
+        if not (isinstance(self._code, CodeInput)):
+            raise ValueError(
+                "profile_code was invoked, but no CodeInput was given on "
+                "initialization"
+            )
+        return call_with_time_limit(self._timeout, self._code.profile, *args, **kwargs)
+
     def run_update(self):
         """
         Invokes an update run, the same that is invoked by a click on the update button,
@@ -783,6 +947,7 @@ class CodeExercise(VBox, CheckableWidget, ExerciseWidget):
             # displayed
             self._on_click_update_action()
 
+    @traced("run_code")
     def run_code(self, *args, **kwargs) -> Check.FunOutParamsT:
         """
         Runs the `code` with the given (keyword) arguments and returns the output of the
@@ -793,8 +958,8 @@ class CodeExercise(VBox, CheckableWidget, ExerciseWidget):
                 raise ValueError(
                     "run_code was invoked, but no code was given on initializaion"
                 )
-            return self._code(*args, **kwargs)
-        except CodeValidationError as e:
+            return call_with_time_limit(self._timeout, self._code, *args, **kwargs)
+        except (CodeValidationError, ExecutionTimeoutError) as e:
             raise e
         except Exception as e:
             # we give the student the additional information that this is most likely
@@ -802,3 +967,13 @@ class CodeExercise(VBox, CheckableWidget, ExerciseWidget):
             if python_version() >= "3.11":
                 e.add_note("This might be not related to your code input.")
             raise e
+
+
+def _is_instance(obj: Any, module_name: str, class_name: str) -> bool:
+    """
+    Checks if the object is an instance of the class without importing its module,
+    since no instance can exist if the module has not been imported. This keeps
+    matplotlib from being imported for exercises without figures.
+    """
+    module = sys.modules.get(module_name)
+    return module is not None and isinstance(obj, getattr(module, class_name))
@@ -11,6 +11,8 @@ from typing import Hashable, Optional, Union
 from IPython.display import display
 from ipywidgets import Button, Dropdown, HBox, Label, Layout, Output, Text, VBox
 
+from .._instrumentation import user_action
+from .._tracing import traced
 from .._utils import Formatter
 from ..css_style import CssStyle
 
@@ -435,6 +437,7 @@ class ExerciseRegistry(VBox):
     def load_file_from_student_name(self, student_name: str):
         self.load_file(self.get_answer_filename(student_name))
 
+    @traced("load_file")
     def load_file(self, answers_filename: str):
         """
         Loads all answers from the selected file in the dropdown menu.
@@ -472,6 +475,7 @@ class ExerciseRegistry(VBox):
         self._enable_lower_panel_box()
         self._show_lower_panel_box()
 
+    @traced("save_answer")
     def save_answer(self, exercise_key: Hashable) -> str:
         if not (exercise_key in self._widgets.keys()):
             raise KeyError(
@@ -498,6 +502,7 @@ class ExerciseRegistry(VBox):
             result = f"Exercise has been saved in file {self._loaded_file_name!r}."
         return result
 
+    @traced("save_all_answers")
     def save_all_answers(self) -> str:
         """
         Saves all answers to the loaded JSON file.
@@ -532,6 +537,7 @@ class ExerciseRegistry(VBox):
     # on event functions #
     ######################
 
+    @user_action("save_all")
     def _on_click_confirm_save_button(self, change: dict):
         self._output.clear_output(wait=True)
         with self._output:
@@ -552,6 +558,7 @@ class ExerciseRegistry(VBox):
             self._disable_lower_panel_box()
             self._loaded_file_name = None
 
+    @user_action("load_file")
     def _on_click_load_file_button(self, change: dict):
         self._output.clear_output(wait=True)
         with self._output:
@@ -577,6 +584,7 @@ class ExerciseRegistry(VBox):
                 self._load_file_button,
             ]
 
+    @user_action("create_file")
     def _on_click_confirm_create_new_file_button(self, change: dict):
         self._output.clear_output(wait=True)
         with self._output:
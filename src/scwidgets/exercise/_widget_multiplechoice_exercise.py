@@ -12,6 +12,7 @@ from ipywidgets import (
     VBox,
 )
 
+from .._instrumentation import user_action
 from .._utils import Formatter
 from ..css_style import CssStyle
 from ..cue import SaveCueBox, SaveResetCueButton
@@ -197,6 +198,7 @@ class MultipleChoiceExercise(VBox, ExerciseWidget):
         if self._load_button is not None:
             self._load_button.observe_widgets()
 
+    @user_action("save")
     def _on_click_save_action(self) -> bool:
         self._output.clear_output(wait=True)
         raised_error = False
@@ -215,6 +217,7 @@ class MultipleChoiceExercise(VBox, ExerciseWidget):
                 raise e
         return not raised_error
 
+    @user_action("load")
     def _on_click_load_action(self) -> bool:
         self._output.clear_output(wait=True)
         raised_error = False
@@ -2,6 +2,7 @@ from typing import Optional, Union
 
 from ipywidgets import HTML, HBox, HTMLMath, Layout, Output, Textarea, VBox
 
+from .._instrumentation import user_action
 from .._utils import Formatter
 from ..css_style import CssStyle
 from ..cue import SaveCueBox, SaveResetCueButton
@@ -156,6 +157,7 @@ class TextExercise(VBox, ExerciseWidget):
         if self._load_button is not None:
             self._load_button.observe_widgets()
 
+    @user_action("save")
     def _on_click_save_action(self) -> bool:
         self._output.clear_output(wait=True)
         raised_error = False
@@ -174,6 +176,7 @@ class TextExercise(VBox, ExerciseWidget):
                 raise e
         return not (raised_error)
 
+    @user_action("load")
     def _on_click_load_action(self) -> bool:
         self._output.clear_output(wait=True)
         raised_error = False
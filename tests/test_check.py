@@ -1,18 +1,37 @@
+import copy
+import functools
+import os
 import re
+import subprocess
+import sys
+import time
+import warnings
 
 import numpy as np
 import pytest
 
+from scwidgets import _watchdog
+from scwidgets._watchdog import call_with_time_limit
 from scwidgets.check import (
+    AssertResult,
     Check,
     CheckableWidget,
     CheckRegistry,
     CheckResult,
+    CheckTiming,
+    ExecutionTimeoutError,
+    assert_complexity,
     assert_equal,
+    assert_equal_chunked,
     assert_numpy_allclose,
+    assert_numpy_allclose_chunked,
     assert_numpy_floating_sub_dtype,
+    assert_peak_memory_within,
+    assert_runtime_within,
     assert_shape,
+    assert_shape_chunked,
     assert_type,
+    fingerprint_blake2b,
 )
 
 
@@ -49,6 +68,169 @@ def test_assert_numpy_allclose():
     assert "Output is not close to reference" in result.message()
 
 
+def test_assert_numpy_allclose_blockwise():
+    from scwidgets.check._asserts import _allclose_statistics
+
+    output = np.array([1.0, np.inf, np.nan, -0.7, 2.0, np.nan, 3.0])
+    reference = np.array([1.0, np.inf, np.nan, np.inf, 2.5, 1.0, 3.0 + 1e-9])
+    for equal_nan in [False, True]:
+        statistics = _allclose_statistics(
+            output, reference, rtol=1e-5, atol=1e-8, equal_nan=equal_nan, block_size=2
+        )
+        assert statistics.nb_not_close == np.sum(
+            ~np.isclose(output, reference, equal_nan=equal_nan)
+        )
+        assert statistics.size == output.size
+
+    # non-contiguous arrays and broadcasting
+    output = np.arange(20, dtype=float).reshape(4, 5).T
+    statistics = _allclose_statistics(
+        output, output[0], rtol=1e-5, atol=1e-8, equal_nan=False, block_size=3
+    )
+    assert statistics.nb_not_close == np.sum(~np.isclose(output, output[0]))
+
+    result = assert_numpy_allclose((output,), (output + 1,))
+    assert "20 of 20 values are not close" in result.message()
+
+
+def test_chunked_asserts(tmp_path):
+    reference = np.arange(1000, dtype=float).reshape(10, 100)
+    output = np.memmap(tmp_path / "output.dat", dtype=float, mode="w+", shape=(10, 100))
+    output[:] = reference
+    output[2, 5] = -1.0
+    output[7, 0] = -1.0
+
+    result = assert_numpy_allclose_chunked((output,), (reference,), block_size=64)
+    assert not result.successful
+    message = result.message()
+    assert "first at index (2, 5)" in message
+    assert "1 of 256 compared values are not close" in message
+    assert "Stopped comparing after 256 of 1000 values" in message
+
+    result = assert_numpy_allclose_chunked(
+        (output,), (reference,), block_size=64, stop_on_first_failure=False
+    )
+    assert "2 of 1000 compared values are not close" in result.message()
+    assert "Stopped" not in result.message()
+
+    result = assert_equal_chunked((output,), (reference,), block_size=64)
+    assert "Output is not equal to reference, first at index (2, 5)" in result.message()
+    result = assert_equal_chunked((output, 5), (output, 5), block_size=64)
+    assert result.successful
+    result = assert_equal_chunked((output,), (reference[:5],))
+    assert "Expected shape (5, 100) but got (10, 100)" in result.message()
+
+    # objects supporting the buffer protocol are compared without copying
+    buffer = bytearray(range(10))
+    assert assert_equal_chunked((buffer,), (bytes(range(10)),)).successful
+    assert assert_numpy_allclose_chunked((buffer,), (np.arange(10),)).successful
+    assert assert_shape_chunked((buffer, "text"), (np.arange(10), "text")).successful
+    assert not assert_shape_chunked((buffer,), (np.arange(5),)).successful
+
+
+def test_outputs_references_numeric_indices():
+    from scwidgets.check._check import OutputsReferences
+
+    references = OutputsReferences((np.arange(3), "text", 5, None))
+    assert references.numeric_indices == (0, 2)
+    assert not references[0].flags.writeable
+    # the non-numeric references are skipped in the "auto" mode
+    result = assert_numpy_allclose((np.arange(3), "other", 5, 1), references)
+    assert result.successful
+
+
+def test_fingerprint_blake2b():
+    array = np.arange(12, dtype=float).reshape(3, 4)
+    (digest,) = fingerprint_blake2b(array)
+    assert len(digest) == 32
+    # non-contiguous and big-endian arrays are hashed by value
+    assert fingerprint_blake2b(np.asfortranarray(array)) == (digest,)
+    assert fingerprint_blake2b(array.astype(">f8")) == (digest,)
+    assert fingerprint_blake2b(array.astype(np.float32)) != (digest,)
+    assert fingerprint_blake2b(array.reshape(4, 3)) != (digest,)
+    # the hash of integer arrays does not depend on the default integer size
+    integers = np.arange(6, dtype=np.int64)
+    assert fingerprint_blake2b(integers.astype(np.int32)) == fingerprint_blake2b(
+        integers
+    )
+    assert fingerprint_blake2b(integers.astype(">i4")) == fingerprint_blake2b(integers)
+    assert fingerprint_blake2b(integers.astype(np.uint8)) != fingerprint_blake2b(
+        integers
+    )
+    assert fingerprint_blake2b(1 + 2j) == fingerprint_blake2b(np.complex64(1 + 2j))
+
+    # numpy scalars are hashed like Python scalars and dicts independent of order
+    assert fingerprint_blake2b(np.float64(1.5), np.int64(2)) == fingerprint_blake2b(
+        1.5, 2
+    )
+    assert fingerprint_blake2b({"a": 1, "b": [1, "x"]}) == fingerprint_blake2b(
+        {"b": [1, "x"], "a": 1}
+    )
+    assert fingerprint_blake2b([1, 2]) != fingerprint_blake2b((1, 2))
+    with pytest.raises(TypeError, match="cannot be fingerprinted"):
+        fingerprint_blake2b(object())
+
+    # values within the tolerance have the same hash
+    assert fingerprint_blake2b(
+        array + 1e-9, 0.1 + 1e-9, tolerance=1e-6
+    ) == fingerprint_blake2b(array.astype(np.float32), 0.1, tolerance=1e-6)
+    assert fingerprint_blake2b(array + 1e-3, tolerance=1e-6) != fingerprint_blake2b(
+        array, tolerance=1e-6
+    )
+
+    # values that cannot be rounded to a multiple of the tolerance are hashed unchanged
+    for value in [1e308, -1e308, np.inf, np.nan]:
+        assert fingerprint_blake2b(value, tolerance=1e-10) == fingerprint_blake2b(
+            np.float64(value), tolerance=1e-10
+        )
+    assert fingerprint_blake2b(1e308, tolerance=1e-10) != fingerprint_blake2b(
+        np.inf, tolerance=1e-10
+    )
+    assert fingerprint_blake2b(
+        np.array([1e308, 1.0]), tolerance=1e-10
+    ) != fingerprint_blake2b(np.array([np.inf, 1.0]), tolerance=1e-10)
+
+
+def test_fingerprint_blake2b_deterministic():
+    code = (
+        "import numpy as np; from scwidgets.check import fingerprint_blake2b; "
+        "print(fingerprint_blake2b(np.linspace(0, 1, 5), {'a': 1.0}, 'text', "
+        "tolerance=1e-6))"
+    )
+    digests = [
+        subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+            env={**os.environ, "PYTHONHASHSEED": str(seed)},
+        ).stdout
+        for seed in [1, 2]
+    ]
+    assert digests[0] == digests[1]
+    assert digests[0].strip() == str(
+        fingerprint_blake2b(np.linspace(0, 1, 5), {"a": 1.0}, "text", tolerance=1e-6)
+    )
+
+
+def test_assert_result_retain_parameter_values():
+    output = np.arange(10**4, dtype=float)
+    result = AssertResult("assert_custom", [0, 1], [output, 5], ["wrong", "wrong"])
+    assert result.parameter_values[0] is output
+    assert result.parameter_values[1] == 5
+    assert "shape=(10000,)" in result.parameter_summaries[0]
+
+    del output
+    # the result does not keep the output alive
+    assert result.parameter_values[0] is None
+    assert "shape=(10000,)" in result.message()
+
+    result = AssertResult(
+        "assert_custom", [0], [[1, 2]], ["wrong"], retain_parameter_values=True
+    )
+    assert result.parameter_values[0] == [1, 2]
+
+
 def test_assert_type():
     output_parameters = (42,)
     output_references = (42,)
@@ -269,6 +451,409 @@ class TestCheck:
                 fingerprint=None,
             ).check_function()
 
+    def test_timings(self):
+        check = single_param_check(use_fingerprint=True, failing=False)
+        check.record_peak_memory = True
+        result = check.check_function()
+        assert result.successful
+        assert all(isinstance(timing, CheckTiming) for timing in result.timings)
+        stages = [(timing.stage, timing.input_index) for timing in result.timings]
+        # function, fingerprint and 4 asserts for each of the 2 inputs
+        assert stages.count(("function", 0)) == 1
+        assert stages.count(("fingerprint", 1)) == 1
+        assert stages.count(("assert", 1)) == 4
+        assert len(stages) == 12
+        assert all(timing.wall_time >= 0 for timing in result.timings)
+        assert all(timing.peak_memory is not None for timing in result.timings)
+        assert result.total_wall_time > 0
+
+    def test_message(self):
+        result = single_param_check(
+            use_fingerprint=False, failing=True
+        ).check_function()
+        message = result.message()
+        # the failure is rendered first and the successful asserts are folded
+        assert message.startswith("assert_numpy_allclose failed")
+        assert "7 of 8 asserts passed" in message
+        assert "assert_type passed" not in message
+        assert "assert_type passed" in result.message(full=True)
+
+        # the properties return read-only views
+        assert isinstance(result.assert_results, tuple)
+        with pytest.raises(TypeError):
+            result.inputs_parameters[0]["parameter"] = None
+
+    def test_bounded_message(self):
+        def function_to_check(parameter):
+            return parameter
+
+        def recursive_assert(output, depth=50):
+            if depth == 0:
+                raise ValueError("Error in recursion")
+            return recursive_assert(output, depth - 1)
+
+        check = Check(
+            function_to_check,
+            [recursive_assert],
+            {"parameter": np.arange(10**6)},
+        )
+        result = check.check_function()
+        message = result.message()
+        assert "shape=(1000000,)" in message
+        assert "ValueError" in message
+        assert message.count("File ") == CheckResult.MAX_TRACEBACK_DEPTH
+        assert len(message) < len(result.message(full=True))
+
+    def test_read_only_inputs_parameters(self):
+        parameter = np.array([1.0, 2.0])
+        check = Check(
+            lambda parameter: parameter * 2,
+            [assert_shape],
+            {"parameter": parameter},
+            (parameter * 2,),
+        )
+        # the inputs are not copied
+        assert np.shares_memory(check.inputs_parameters[0]["parameter"], parameter)
+        assert not (check.inputs_parameters[0]["parameter"].flags.writeable)
+        assert not (check.outputs_references[0][0].flags.writeable)
+        assert check.check_function().successful
+        # the input parameters can be copied as before
+        inputs_parameters = copy.deepcopy(check.inputs_parameters)
+        assert np.all(inputs_parameters[0]["parameter"] == parameter)
+
+    @pytest.mark.parametrize(
+        "function_to_check",
+        [
+            lambda parameter, values, pair: parameter.__iadd__(1),
+            lambda parameter, values, pair: values.append(1),
+            lambda parameter, values, pair: pair[1].append(1),
+        ],
+    )
+    def test_modified_inputs_parameters(self, function_to_check):
+        parameter = np.array([1.0, 2.0])
+        values = [1, 2]
+        pair = (0, [3])
+        check = Check(
+            function_to_check,
+            [assert_shape],
+            {"parameter": parameter, "values": values, "pair": pair},
+            (parameter,),
+        )
+        result = check.check_function()
+        assert not (result.successful)
+        assert result.assert_names[0] == "assert_inputs_unchanged"
+        # inputs are not corrupted for later runs
+        assert np.all(parameter == np.array([1.0, 2.0]))
+        assert values == [1, 2]
+        assert pair == (0, [3])
+
+    @pytest.mark.parametrize("batch_size", [None, 3])
+    def test_batched(self, batch_size):
+        nb_calls = []
+
+        def function_to_check(x, scale):
+            nb_calls.append(x.shape)
+            return x * scale, np.sum(x, axis=-1)
+
+        xs = [np.arange(4.0) + i for i in range(8)]
+        inputs_parameters = [{"x": x, "scale": 2.0} for x in xs]
+        outputs_references = [(x * 2.0, np.sum(x)) for x in xs]
+        # the fourth input fails
+        outputs_references[3] = (xs[3] * 2.0 + 1, np.sum(xs[3]))
+
+        def assert_sum_positive(output):
+            return "" if output[1] > 0 else "Sum is not positive."
+
+        asserts = [
+            assert_sum_positive,
+            assert_shape,
+            functools.partial(assert_numpy_allclose, rtol=1e-6),
+        ]
+        unbatched_result = Check(
+            function_to_check,
+            asserts,
+            inputs_parameters,
+            outputs_references,
+            stop_on_assert_error_raised=False,
+        ).check_function()
+        nb_calls.clear()
+
+        check = Check(
+            function_to_check,
+            asserts,
+            inputs_parameters,
+            outputs_references,
+            stop_on_assert_error_raised=False,
+            batched=True,
+            batch_size=batch_size,
+        )
+        result = check.check_function()
+        assert len(nb_calls) == (1 if batch_size is None else 3)
+        assert nb_calls[0] == (8 if batch_size is None else 3, 4)
+        assert result.assert_names == unbatched_result.assert_names
+        assert result.message() == unbatched_result.message()
+        assert not result.successful
+        # the vectorized assert_numpy_allclose is timed once per batch
+        assert sum(
+            timing.name == "assert_numpy_allclose" for timing in result.timings
+        ) == len(nb_calls)
+
+        check.compute_and_set_references()
+        assert check.check_function().successful
+
+    @pytest.mark.parametrize("nb_inputs, batch_size", [(5, 2), (5, None), (1, None)])
+    def test_batched_shared_parameters(self, nb_inputs, batch_size):
+        batch_shapes = []
+
+        def function_to_check(x, matrix):
+            batch_shapes.append((x.shape, matrix.shape))
+            # supports a shared and a stacked matrix
+            return np.einsum("...i,...ij->...j", x, matrix)
+
+        matrix = np.arange(9.0).reshape(3, 3)
+        xs = [np.arange(3.0) + i for i in range(nb_inputs)]
+        check = Check(
+            function_to_check,
+            [assert_shape, assert_numpy_allclose],
+            [{"x": x, "matrix": matrix} for x in xs],
+            [(x @ matrix,) for x in xs],
+            batched=True,
+            batch_size=batch_size,
+        )
+        assert check.check_function().successful
+        if nb_inputs == 1:
+            assert batch_shapes == [((1, 3), (1, 3, 3))]
+        elif batch_size is None:
+            assert batch_shapes == [((5, 3), (3, 3))]
+        else:
+            # the remainder batch of a single input is stacked as well
+            assert batch_shapes == [((2, 3), (3, 3))] * 2 + [((1, 3), (3, 3))]
+
+    def test_batched_invalid_outputs(self):
+        check = Check(
+            lambda x: np.sum(x),
+            [assert_numpy_allclose],
+            [{"x": np.arange(3)}, {"x": np.arange(3) + 1}],
+            [(3,), (6,)],
+            batched=True,
+        )
+        with pytest.raises(ValueError, match="batch of size 2 as first dimension"):
+            check.check_function()
+
+    def test_assert_runtime_within(self):
+        def slow_sum(values):
+            total = 0.0
+            for value in values:
+                total += value
+            return total
+
+        def fast_sum(values):
+            return np.sum(values)
+
+        check = Check(
+            slow_sum,
+            [
+                functools.partial(
+                    assert_runtime_within,
+                    reference_function=fast_sum,
+                    repeats=3,
+                    number=5,
+                )
+            ],
+            {"values": np.arange(10**5, dtype=float)},
+        )
+        assert len(check.function_asserts) == 1
+        assert check.nb_conducted_asserts == 1
+        result = check.check_function()
+        assert not result.successful
+        assert_result = result.assert_results[0]
+        assert assert_result.measurements["ratio"] > 2.0
+        assert len(assert_result.measurements["times"]) == 3
+        message = result.message()
+        assert "times the runtime of the reference" in message
+        assert "> output" not in message
+
+        result = assert_runtime_within(
+            fast_sum, {"values": np.arange(10)}, fast_sum, factor=100.0
+        )
+        assert result.successful
+        assert result.measurements["reference_runtime"] > 0
+
+        # a function modifying its inputs only in the timed calls does not corrupt
+        # the stored inputs
+        calls = []
+
+        def append_value(values):
+            calls.append(values)
+            if len(calls) > 1:
+                values.append(3.0)
+            return len(values)
+
+        values = [1.0, 2.0]
+        check = Check(
+            append_value,
+            functools.partial(
+                assert_runtime_within,
+                reference_function=len,
+                factor=1e6,
+                repeats=2,
+                number=2,
+            ),
+            {"values": values},
+        )
+        check.check_function()
+        assert values == [1.0, 2.0]
+        assert check.inputs_parameters[0]["values"] == [1.0, 2.0]
+
+    def test_assert_peak_memory_within(self):
+        def wasteful_sum(values):
+            return np.sum(np.outer(values, np.ones(100)))
+
+        def reference_sum(values):
+            return np.sum(values) * 100
+
+        inputs_parameters = {"values": np.arange(10**4, dtype=float)}
+        check = Check(
+            wasteful_sum,
+            [
+                functools.partial(
+                    assert_peak_memory_within, reference_function=reference_sum
+                ),
+                functools.partial(assert_peak_memory_within, max_bytes=2**20),
+            ],
+            inputs_parameters,
+            stop_on_assert_error_raised=False,
+        )
+        result = check.check_function()
+        assert not result.successful
+        # the outer product allocates 10**6 floats
+        assert result.assert_results[0].measurements["peak_memory"] >= 8 * 10**6
+        assert result.assert_results[0].measurements["ratio"] > 2.0
+        message = result.message()
+        assert "times the peak of the reference" in message
+        assert "at most 1 MiB are allowed" in message
+
+        result = assert_peak_memory_within(
+            reference_sum, inputs_parameters, max_bytes=2**20
+        )
+        assert result.successful
+        with pytest.raises(ValueError, match="At least one of"):
+            assert_peak_memory_within(reference_sum, inputs_parameters)
+
+    def test_assert_complexity(self):
+        def quadratic_count(values):
+            return np.sum(np.subtract.outer(values, values) > 0)
+
+        def input_generator(n):
+            return {"values": np.random.default_rng(n).random(n)}
+
+        check = Check(
+            quadratic_count,
+            functools.partial(
+                assert_complexity,
+                input_generator=input_generator,
+                max_complexity="O(n log n)",
+                max_size=2**12,
+                time_budget=1.0,
+            ),
+        )
+        assert check.nb_conducted_asserts == 1
+        result = check.check_function()
+        assert not result.successful
+        assert result.assert_results[0].measurements["exponent"] > 1.5
+        assert "but O(n log n) allows at most 1.30" in result.message()
+
+        result = assert_complexity(
+            lambda values: np.sort(values),
+            input_generator,
+            "O(n log n)",
+            max_size=2**16,
+            time_budget=1.0,
+        )
+        assert result.successful, result.message()
+        with pytest.raises(ValueError, match="complexity classes of the form"):
+            assert_complexity(np.sort, input_generator, "O(2^n)")
+        with pytest.raises(ValueError, match="max_size must not be smaller"):
+            assert_complexity(np.sort, input_generator, min_size=64, max_size=32)
+
+    def test_timeout(self):
+        def endless_loop(x):
+            while True:
+                try:
+                    x += 1
+                except Exception:
+                    # the interrupt is not caught by the code
+                    pass
+
+        function_assert_calls = []
+
+        def assert_function(function_to_check):
+            function_assert_calls.append(function_to_check)
+            return ""
+
+        check = Check(
+            endless_loop,
+            [assert_equal, assert_function],
+            [{"x": 0}, {"x": 1}],
+            [(0,), (1,)],
+            timeout=0.2,
+            stop_on_assert_error_raised=False,
+        )
+        result = check.check_function()
+        assert not result.successful
+        assert result.assert_names == ("assert_within_timeout",) * 2
+        assert "time limit of 0.2 s" in result.message()
+        # the function asserts are not run without time limit after a timeout
+        assert function_assert_calls == []
+
+        with pytest.raises(ExecutionTimeoutError, match="time limit") as exc_info:
+            call_with_time_limit(0.1, endless_loop, 0)
+        assert exc_info.value.lineno is not None
+        # nested time limits only catch their own interrupt
+        with pytest.raises(ExecutionTimeoutError) as exc_info:
+            call_with_time_limit(0.1, call_with_time_limit, 10.0, endless_loop, 0)
+        assert exc_info.value.timeout == 0.1
+        assert call_with_time_limit(1.0, np.sum, np.ones(10)) == 10
+        # errors of the function are raised after the time limit has been removed
+        with pytest.raises(ZeroDivisionError):
+            call_with_time_limit(0.1, lambda: 1 / 0)
+        time.sleep(0.2)
+        assert call_with_time_limit(1.0, np.sum, np.ones(10)) == 10
+
+        def swallowing_loop():
+            try:
+                endless_loop(0)
+            except _watchdog._Interrupt:
+                # the interrupt is raised again after it has been caught
+                pass
+            endless_loop(0)
+
+        with pytest.raises(ExecutionTimeoutError):
+            call_with_time_limit(0.1, swallowing_loop)
+
+    def test_timeout_at_finish(self):
+        # the interrupt might be raised right when the function finishes or while a
+        # previous interrupt is handled, it must never escape to the caller
+        def sleep(duration):
+            time.sleep(duration)
+            return duration
+
+        for _ in range(20):
+            try:
+                assert call_with_time_limit(0.01, sleep, 0.01) == 0.01
+            except ExecutionTimeoutError:
+                pass
+
+    def test_timeout_unsupported(self, monkeypatch):
+        monkeypatch.setattr(_watchdog, "_TIME_LIMITS_SUPPORTED", False)
+        monkeypatch.setattr(_watchdog, "_warned_time_limits_unsupported", False)
+        with pytest.warns(RuntimeWarning, match="only supported on CPython"):
+            assert call_with_time_limit(0.1, np.sum, np.ones(10)) == 10
+        # the warning is only shown once
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            assert call_with_time_limit(0.1, np.sum, np.ones(10)) == 10
+
 
 def mock_checkable_widget(check_registry, compute_output_to_check, checks=None):
     class MockCheckableWidget(CheckableWidget):
@@ -335,6 +920,31 @@ class TestCheckRegistry:
                 nb_conducted_asserts += len(result.assert_results)
         assert nb_conducted_asserts == checkable_widget.nb_conducted_asserts
 
+    def test_timings_summary(self):
+        check_registry = CheckRegistry()
+        checks = [single_param_check(use_fingerprint=False, failing=False)]
+        mock_checkable_widget(check_registry, checks[0].function_to_check, checks)
+        check_registry.check_all_widgets()
+
+        rows = check_registry.timings_summary()
+        # one row for the function call and one for each of the 4 asserts
+        assert len(rows) == 5
+        assert all(row["calls"] == 2 for row in rows)
+        total_wall_times = [row["total_wall_time"] for row in rows]
+        assert total_wall_times == sorted(total_wall_times, reverse=True)
+        assert "assert_numpy_allclose" in check_registry.timings_table()
+
+    def test_add_check_peak_memory(self):
+        check_registry = CheckRegistry()
+        check = single_param_check(use_fingerprint=False, failing=False)
+        check.record_peak_memory = True
+        checkable_widget = mock_checkable_widget(
+            check_registry, check.function_to_check
+        )
+        checkable_widget.add_check(check)
+        (result,) = check_registry.check_all_widgets()[checkable_widget]
+        assert all(timing.peak_memory is not None for timing in result.timings)
+
     @pytest.mark.parametrize(
         "checks",
         [
@@ -1,4 +1,7 @@
+import linecache
 import os
+import re
+import sys
 from typing import Callable, List, Literal, Union
 
 import matplotlib.pyplot as plt
@@ -8,8 +11,8 @@ from ipywidgets import fixed
 from matplotlib.figure import Figure
 from widget_code_input.utils import CodeValidationError
 
-from scwidgets.check import Check, CheckRegistry, CheckResult
-from scwidgets.code import CodeInput, ParametersPanel
+from scwidgets.check import Check, CheckRegistry, CheckResult, ExecutionTimeoutError
+from scwidgets.code import CodeInput, LineProfiler, ParametersPanel
 from scwidgets.cue import CueObject
 from scwidgets.exercise import CodeExercise, ExerciseRegistry
 
@@ -126,6 +129,119 @@ class TestCodeInput:
         assert code(1, 1) == 2
         assert code(0, 1) == 1
 
+    def test_filename(self):
+        first_code = CodeInput(
+            function_name="f", function_parameters="x", function_body="return 1 / x"
+        )
+        second_code = CodeInput(
+            function_name="f", function_parameters="x", function_body="return x[0]"
+        )
+        assert first_code.filename != second_code.filename
+        first_code.unwrapped_function
+        second_code.unwrapped_function
+        # each instance keeps its own source for tracebacks
+        with pytest.raises(ZeroDivisionError) as exc_info:
+            first_code.unwrapped_function(0)
+        assert exc_info.traceback[-1].statement.lines[0].strip() == "return 1 / x"
+        assert linecache.getlines(second_code.filename) == (
+            second_code.full_function_code.splitlines(keepends=True)
+        )
+
+        # the source is removed when the instance is closed
+        first_code.close()
+        assert first_code.filename not in linecache.cache
+        assert second_code.filename in linecache.cache
+
+    def test_profile(self):
+        def sum_of_squares(n):
+            total = 0
+            for i in range(n):
+                total += i**2
+            return total
+
+        code = CodeInput(sum_of_squares)
+        trace = sys.gettrace()
+        output, profile = code.profile(100)
+        assert output == sum(i**2 for i in range(100))
+        source_lines = code.full_function_code.splitlines()
+        assert profile.source_lines == tuple(source_lines)
+        loop_line = source_lines.index("    for i in range(n):")
+        assert profile.hits[loop_line] == 101
+        assert profile.hits[loop_line + 1] == 100
+        assert profile.hits[0] == 0
+        assert 0 < sum(profile.times) <= profile.total_time
+        table = profile.format()
+        assert "Hits" in table
+        assert "total += i**2" in table
+
+        # the profiler is removed after the run
+        assert sys.gettrace() is trace
+        with pytest.raises(CodeValidationError):
+            code.profile("100")
+        assert sys.gettrace() is trace
+
+    def test_line_profiler(self, monkeypatch):
+        source = (
+            "def cube(x):\n"
+            "    return x**3\n"
+            "def sum_of_cubes(n):\n"
+            "    total = 0\n"
+            "    for i in range(n):\n"
+            "        total += cube(i)\n"
+            "    return total\n"
+        )
+        namespace: dict = {}
+        exec(compile(source, "<profiled>", "exec"), namespace)
+        # the buffer is aggregated several times during the run
+        monkeypatch.setattr(LineProfiler, "BUFFER_SIZE", 16)
+        with LineProfiler("<profiled>") as profiler:
+            namespace["sum_of_cubes"](100)
+        profile = profiler.profile(source)
+        assert profile.hits == (0, 100, 0, 1, 101, 100, 1)
+        # the time of the called function is attributed to its own lines
+        assert profile.times[1] > 0
+        assert 0 < sum(profile.times) <= profile.total_time
+
+    def test_analysis(self):
+        code = CodeInput(
+            function_name="f",
+            function_parameters="x",
+            function_body="import os\nreturn np.load(x)",
+            forbidden_names=["np.load", "eval"],
+            forbidden_imports=["os"],
+            require_return=True,
+        )
+        analysis = code.analysis
+        assert not analysis.valid
+        assert analysis.parameters == ("x",)
+        assert analysis.violations == (
+            "Line 3: importing 'os' is not allowed.",
+            "Line 4: using 'np.load' is not allowed.",
+        )
+        # the analysis is cached for unchanged code
+        assert code.analysis is analysis
+        with pytest.raises(CodeValidationError, match="rejected before execution"):
+            code(1)
+
+        code.function_body = "import os.path\nx = np.loadtxt\nreturn eval(x)"
+        assert len(code.analysis.violations) == 2
+        code.function_body = "def g():\n    return x\n"
+        assert code.analysis.violations == (
+            "The function 'f' does not return a value, a return statement is missing.",
+        )
+        code.function_body = "return x +"
+        with pytest.raises(CodeValidationError, match="SyntaxError"):
+            code.validate()
+        with pytest.raises(CodeValidationError, match="SyntaxError"):
+            code.compatible_with_signature(["x"])
+
+        code.function_body = "return x"
+        code.validate()
+        assert code(2) == 2
+        assert code.compatible_with_signature(["x"]) == ""
+        assert "is not compatible" in code.compatible_with_signature([])
+        assert "is not a parameter" in code.compatible_with_signature(["x", "y"])
+
     def test_builtins(self):
         """Tests if import work when they are specified by builtins."""
         import numpy as np
@@ -338,6 +454,41 @@ class TestCodeExercise:
         ):
             code_ex.run_code(**code_ex.parameters)
 
+    def test_profile_code(self, capsys, monkeypatch):
+        code_ex = get_code_exercise(
+            [single_param_check(use_fingerprint=False, failing=False)]
+        )
+        assert code_ex._profile_button is None
+        code_ex = CodeExercise(
+            code=CodeInput(TestCodeInput.mock_function_2),
+            parameters={"x": fixed(5)},
+            profile=True,
+        )
+        assert code_ex._profile_button is not None
+        output, profile = code_ex.profile_code(**code_ex.parameters)
+        assert output == 5
+        assert profile.hits[-1] == 1
+        code_ex.run_profile()
+        assert "line profiler slows down" not in capsys.readouterr().out
+        monkeypatch.setattr(CodeExercise, "PROFILE_WARNING_TIME", 0.0)
+        code_ex.run_profile()
+        assert "line profiler slows down" in capsys.readouterr().out
+
+    def test_run_code_timeout(self):
+        def endless_loop(x):
+            while x >= 0:
+                x += 1
+            return x
+
+        code_ex = CodeExercise(code=CodeInput(endless_loop), timeout=0.2)
+        with pytest.raises(ExecutionTimeoutError, match="time limit") as exc_info:
+            code_ex.run_code(x=0)
+        # the source of the code is shown in the location of the interruption
+        assert re.search(
+            r"in endless_loop\n\s+(while x >= 0:|x \+= 1)", str(exc_info.value)
+        )
+        assert code_ex.run_code(x=-1) == -1
+
     @pytest.mark.parametrize(
         "function",
         [
@@ -432,6 +583,43 @@ class TestCodeExercise:
         assert code_ex.output.figure is code_ex.figure
         assert code_ex.outputs[0] is code_ex.output
 
+    def test_figure_image_cache(self):
+        fig, ax = plt.subplots()
+
+        def update(code_ex):
+            ax.clear()
+            ax.plot(code_ex.run_code(**code_ex.parameters))
+
+        def values(n):
+            return list(range(n))
+
+        code_ex = CodeExercise(
+            code=values, parameters={"n": (2, 10, 1)}, outputs=fig, update=update
+        )
+        cue_figure = code_ex.output
+        code_ex.run_update()
+        code_ex.run_update()
+        # the repeated update with the same code and parameters reuses the image
+        assert cue_figure.nb_image_cache_hits == 1
+        assert cue_figure.nb_image_cache_misses == 1
+        code_ex.parameters_panel.update_parameters({"n": 5})
+        code_ex.run_update()
+        code_ex.code.function_body = "return list(range(n + 1))"
+        code_ex.run_update()
+        assert cue_figure.nb_image_cache_hits == 1
+        assert cue_figure.nb_image_cache_misses == 3
+
+        code_ex = CodeExercise(
+            code=values,
+            parameters={"n": (2, 10, 1)},
+            outputs=fig,
+            update=update,
+            figure_kwargs={"image_cache_size": 0},
+        )
+        code_ex.run_update()
+        code_ex.run_update()
+        assert code_ex.output.nb_image_cache_hits == 0
+
     def test_consrtuction_with_registries(self):
         """Because the exercise key is used for the `ExerciseRegistry` and the
         `CheckRegistry` we need to ensure the `CodeExercise` can be run with
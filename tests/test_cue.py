@@ -0,0 +1,381 @@
+import asyncio
+import sys
+import threading
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.ticker import FuncFormatter
+
+from scwidgets.cue import CueFigure, CueObject, CueOutput, Downsampler
+from scwidgets.cue._downsampling import get_m4_indices
+
+
+class TestCueFigure:
+    def test_incremental_redraw(self):
+        fig, ax = plt.subplots()
+        x = np.linspace(0, 1, 10)
+        ax.plot(x, x)
+        ax.scatter(x, x)
+        ax.set_title("title")
+        cue_figure = CueFigure(fig, redraw_mode="incremental")
+        line = ax.lines[0]
+        collection = ax.collections[0]
+        # the x axis is fixed and the y axis is autoscaled
+        ax.set_xlim(0, 1)
+
+        cue_figure.clear_display()
+        ax.plot(x, 2 * x)
+        ax.scatter(x, 2 * x)
+        cue_figure.draw_display()
+        # the artists are reused with the data of the update
+        assert ax.lines[0] is line
+        assert ax.collections[0] is collection
+        assert len(ax.lines) == 1 and len(ax.collections) == 1
+        assert np.allclose(line.get_ydata(), 2 * x)
+        assert np.allclose(collection.get_offsets()[:, 1], 2 * x)
+        assert ax.get_title() == "title"
+        # the data limits only contain the data of the update
+        assert ax.get_ylim()[1] >= 2
+        assert ax.dataLim.y1 == 2
+
+        # a different structure removes the previous artists
+        cue_figure.clear_display()
+        ax.plot(x, x)
+        ax.plot(x, x)
+        cue_figure.draw_display()
+        assert len(ax.lines) == 2 and line not in ax.lines
+        assert len(ax.collections) == 0
+
+        # artists updated in place are kept
+        cue_figure.clear_display()
+        ax.lines[0].set_ydata(3 * x)
+        cue_figure.draw_display()
+        assert len(ax.lines) == 2
+        assert len(cue_figure.frame_times) == 4
+        assert cue_figure.last_frame_time > 0
+
+    def test_clear_redraw(self):
+        fig, ax = plt.subplots()
+        ax.plot([0, 1], [0, 1])
+        cue_figure = CueFigure(fig)
+        assert cue_figure.redraw_mode == "clear"
+        cue_figure.clear_display()
+        assert len(ax.lines) == 0
+        with pytest.raises(ValueError, match="redraw mode"):
+            CueFigure(fig, redraw_mode="partial")
+
+    def test_blit(self):
+        fig, ax = plt.subplots()
+        (line,) = ax.plot([0, 1], [0, 1])
+        cue_figure = CueFigure(fig, redraw_mode="incremental")
+        # the closed figure has no canvas that can draw, the agg canvas supports
+        # blitting but does not show anything
+        FigureCanvasAgg(fig)
+        cue_figure._blit([line])
+        assert line.get_animated()
+        assert cue_figure._blit_background is not None
+        cue_figure._blit([line])
+        cue_figure._stop_blitting()
+        assert not (line.get_animated())
+
+    def test_max_fps(self):
+        fig, ax = plt.subplots()
+        cue_figure = CueFigure(fig, redraw_mode="incremental", max_fps=10)
+        assert len(cue_figure.frame_times) == 1
+
+        # without an event loop all frames are drawn
+        cue_figure.draw_display()
+        assert not (cue_figure.has_pending_frame)
+        assert len(cue_figure.frame_times) == 2
+
+        async def update():
+            cue_figure.flush_display()
+            for i in range(5):
+                cue_figure.clear_display()
+                ax.plot([0, 1], [0, i])
+                cue_figure.draw_display()
+            assert cue_figure.has_pending_frame
+            assert cue_figure.nb_dropped_frames == 4
+            await asyncio.sleep(0.2)
+            # the newest state is drawn last
+            assert not (cue_figure.has_pending_frame)
+
+        asyncio.run(update())
+        assert len(cue_figure.frame_times) == 3
+        assert ax.lines[0].get_ydata()[1] == 4
+        with pytest.raises(ValueError, match="positive"):
+            cue_figure.max_fps = 0
+
+    def test_image_cache(self):
+        fig, ax = plt.subplots()
+        ax.plot([0, 1], [0, 1])
+        cue_figure = CueFigure(fig, image_cache_size=2)
+        assert cue_figure.nb_image_cache_misses == 0
+
+        # the oldest image is removed
+        for key in ["a", "b", "a", "c", "b"]:
+            cue_figure.draw_display(cache_key=key)
+        assert cue_figure.nb_image_cache_hits == 1
+        assert cue_figure.nb_image_cache_misses == 4
+
+        cue_figure.clear_image_cache()
+        cue_figure.draw_display(cache_key="a")
+        assert cue_figure.nb_image_cache_misses == 5
+        # the cache is disabled by default
+        cue_figure = CueFigure(fig)
+        cue_figure.draw_display(cache_key="a")
+        cue_figure.draw_display(cache_key="a")
+        assert cue_figure.nb_image_cache_hits == 0
+
+    @pytest.mark.parametrize(
+        "change",
+        [
+            lambda ax: ax.grid(True),
+            lambda ax: ax.tick_params(labelsize=20),
+            lambda ax: ax.lines[0].set_drawstyle("steps"),
+        ],
+    )
+    def test_image_cache_without_key(self, change):
+        fig, ax = plt.subplots()
+        ax.plot([0, 1, 2], [0, 1, 0])
+        cue_figure = CueFigure(fig, image_cache_size=2)
+        images = []
+        cue_figure._show_image = images.append
+        cue_figure.draw_display()
+        change(ax)
+        # a changed figure is never shown with the previous image
+        cue_figure.draw_display()
+        assert images[0].data != images[1].data
+        assert cue_figure.nb_image_cache_hits == 0
+
+    def test_image_format(self):
+        fig, ax = plt.subplots()
+        ax.plot([0, 1], [0, 1])
+        cue_figure = CueFigure(fig, image_format="jpeg", image_quality=50, image_dpi=20)
+        image = cue_figure._render_image(fig)
+        assert image.format == "jpeg"
+        assert image.data[:2] == b"\xff\xd8"
+        assert len(image.data) < len(CueFigure(fig)._render_image(fig).data)
+        with pytest.raises(ValueError, match="image format"):
+            CueFigure(fig, image_format="gif")
+
+    def test_render_in_thread(self):
+        fig, ax = plt.subplots()
+        (line,) = ax.plot([0, 1], [0, 1])
+        # without an event loop the figure is rendered immediately
+        cue_figure = CueFigure(fig, image_cache_size=4, render_in_thread=True)
+        assert not (cue_figure.is_rendering)
+
+        async def update():
+            line.set_ydata([0, 2])
+            cue_figure.draw_display(cache_key=2)
+            assert cue_figure.is_rendering
+            # the figure can be changed while the snapshot is rendered
+            line.set_ydata([0, 3])
+            cue_figure.draw_display(cache_key=3)
+            for _ in range(100):
+                if not (cue_figure.is_rendering):
+                    break
+                await asyncio.sleep(0.05)
+            assert not (cue_figure.is_rendering)
+
+        asyncio.run(update())
+        # the rendered images are cached
+        assert cue_figure.nb_image_cache_misses == 2
+        cue_figure.draw_display(cache_key=3)
+        assert cue_figure.nb_image_cache_hits == 1
+
+    def test_render_unpicklable_figure_in_thread(self):
+        fig, ax = plt.subplots()
+        ax.plot([0, 1], [0, 1])
+        ax.xaxis.set_major_formatter(FuncFormatter(lambda x, position: f"{x} m"))
+
+        async def update():
+            cue_figure = CueFigure(fig, render_in_thread=True)
+            # the figure is rendered immediately instead of raising
+            assert not (cue_figure.is_rendering)
+            images = []
+            cue_figure._show_image = images.append
+            cue_figure.draw_display()
+            assert len(images) == 1
+
+        asyncio.run(update())
+
+
+class TestCueOutput:
+    def test_max_bytes(self, capsys, tmp_path):
+        overflow_file = tmp_path / "overflow.txt"
+        output = CueOutput(max_bytes=10, overflow_file=overflow_file)
+        with output:
+            print("a" * 8)
+            print("b" * 8, file=sys.stderr)
+            print("c" * 8)
+        captured = capsys.readouterr()
+        assert captured.out.startswith("a" * 8 + "\n")
+        assert captured.err.startswith("b\n[Output truncated")
+        assert str(overflow_file) in captured.err
+        assert overflow_file.read_text() == "b" * 7 + "\n" + "c" * 8 + "\n"
+        assert output.nb_output_bytes == 27
+        assert output.nb_truncated_bytes == 17
+
+        # a new update has a new budget
+        output.clear_output()
+        with output:
+            print("d" * 12)
+        assert capsys.readouterr().out.endswith("d" * 10 + self.notice(output))
+        assert overflow_file.read_text() == "dd\n"
+        assert output.nb_truncated_bytes == 20
+
+    def test_max_lines(self, capsys):
+        output = CueOutput(max_lines=2)
+        with output:
+            print("1\n2\n3")
+            with output:
+                print("4")
+        assert capsys.readouterr().out == "1\n2\n" + self.notice(output)
+        assert output.nb_output_lines == 4
+        assert output.nb_truncated_bytes == 4
+        # the streams are restored
+        print("5")
+        assert capsys.readouterr().out == "5\n"
+
+    def test_streams(self, capsys):
+        stdout = sys.stdout
+        # the streams are only replaced if the output is limited
+        with CueOutput():
+            assert sys.stdout is stdout
+        first_output = CueOutput(max_lines=1)
+        second_output = CueOutput(max_lines=2)
+        first_output.__enter__()
+        second_output.__enter__()
+        # the outputs are exited out of order
+        first_output.__exit__(None, None, None)
+        print("1\n2\n3")
+        second_output.__exit__(None, None, None)
+        assert sys.stdout is stdout
+        assert capsys.readouterr().out == "1\n2\n" + self.notice(second_output)
+        assert first_output.nb_output_lines == 0
+
+        # only the output of the thread that entered the output is counted
+        output = CueOutput(max_lines=2)
+        with output:
+            thread = threading.Thread(target=print, args=("1\n2\n3",))
+            thread.start()
+            thread.join()
+            print("4")
+        assert output.nb_output_lines == 1
+        assert capsys.readouterr().out == "1\n2\n3\n4\n"
+
+    @staticmethod
+    def notice(output):
+        return output._budget._get_notice()
+
+
+class TestCueObject:
+    def test_diff_update(self, capsys):
+        cue_object = CueObject("line 1", update_mode="diff")
+        assert capsys.readouterr().out == "line 1\n"
+
+        # only the appended text is sent
+        cue_object.clear_display(wait=True)
+        cue_object.object = "line 1\nline 2"
+        cue_object.draw_display()
+        assert capsys.readouterr().out == "line 2\n"
+
+        # unchanged representations are not sent
+        cue_object.clear_display(wait=True)
+        cue_object.draw_display()
+        assert capsys.readouterr().out == ""
+        assert cue_object.nb_skipped_updates == 1
+
+        cue_object.object = [1, 2]
+        cue_object.draw_display()
+        assert capsys.readouterr().out.endswith("{'text/plain': '[1, 2]'}\n")
+        cue_object.object = [1, 2]
+        cue_object.draw_display()
+        assert cue_object.nb_skipped_updates == 2
+        cue_object.object = None
+        cue_object.draw_display()
+        cue_object.draw_display()
+        assert cue_object.nb_skipped_updates == 3
+
+        with pytest.raises(ValueError, match="update mode"):
+            CueObject("", update_mode="partial")
+
+
+def test_get_m4_indices():
+    rng = np.random.default_rng(0)
+    x = np.sort(rng.uniform(0, 1000, 10000))
+    y = rng.normal(size=len(x))
+    y[500:510] = np.nan
+    indices = get_m4_indices(x, y, (200.5, 800.5))
+    # each pixel column keeps its first, last, minimal and maximal point
+    assert len(indices) <= 4 * 603 + 1
+    columns = np.clip(np.floor(x), 199, 801)
+    for column in [199, 200, 500, 801]:
+        column_indices = np.flatnonzero(columns == column)
+        selected = np.intersect1d(indices, column_indices)
+        assert column_indices[0] in selected and column_indices[-1] in selected
+        assert np.nanmin(y[column_indices]) == np.nanmin(y[selected])
+        assert np.nanmax(y[column_indices]) == np.nanmax(y[selected])
+    # the gap is kept
+    assert 500 in indices
+
+    x = x[1000:]
+    y = y[1000:]
+    indices = get_m4_indices(x, y, (200.5, 800.5))
+    assert np.array_equal(
+        get_m4_indices(x[::-1], y[::-1], (200.5, 800.5)),
+        np.sort(len(x) - 1 - indices),
+    )
+    assert get_m4_indices(rng.uniform(size=10), y[:10], (0, 1)) is None
+
+
+class TestDownsampler:
+    def test_figure(self):
+        fig, ax = plt.subplots()
+        x = np.linspace(0, 10, 100000)
+        ax.plot(x, np.sin(x))
+        ax.scatter(np.repeat(x[:1000], 100), np.tile(np.linspace(0, 1, 100), 1000))
+        cue_figure = CueFigure(fig, downsampling_threshold=10000)
+        line = ax.lines[0]
+        nb_columns = ax.get_window_extent().width
+        assert len(line.get_xdata()) <= 4 * (nb_columns + 3)
+        assert len(ax.collections[0].get_offsets()) < 100000
+        assert ax.get_ylim() == pytest.approx((-1.1, 1.1), abs=0.01)
+
+        # new data set by the code is downsampled
+        cue_figure.clear_display()
+        ax.plot(x, np.cos(x))
+        cue_figure.draw_display()
+        assert len(ax.lines[0].get_xdata()) < 1000
+        assert ax.lines[0].get_ydata()[0] == 1
+
+    def test_refine_on_zoom(self):
+        fig, ax = plt.subplots()
+        x = np.linspace(0, 10, 100000)
+        (line,) = ax.plot(x, np.sin(x))
+        downsampler = Downsampler(10000, refine_on_zoom=True)
+        downsampler.update(fig)
+        nb_points = len(line.get_xdata())
+        assert np.array_equal(downsampler.get_full_data(line)[0], x)
+
+        ax.set_xlim(0, 1)
+        zoomed_x = line.get_xdata()
+        assert np.sum((zoomed_x >= 0) & (zoomed_x <= 1)) > nb_points / 2
+        ax.set_xlim(0, 0.001)
+        # all points in the view are shown
+        assert np.array_equal(line.get_xdata()[:11], x[:11])
+        ax.set_xlim(0, 10)
+        assert len(line.get_xdata()) < 4 * (ax.get_window_extent().width + 3)
+
+        # the full data is restored if no point can be removed
+        downsampler = Downsampler(10, refine_on_zoom=True)
+        (line,) = ax.plot(x[:100], x[:100])
+        downsampler.update(fig)
+        assert len(line.get_xdata()) < 100
+        ax.set_xlim(0, 0.01)
+        assert len(line.get_xdata()) == 100
+        assert downsampler.get_full_data(line) is None
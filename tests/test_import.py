@@ -0,0 +1,66 @@
+import re
+import subprocess
+import sys
+
+import pytest
+
+import scwidgets
+
+#: The maximal cumulative import time of scwidgets relative to the one of ipywidgets
+#: which every widget needs. Both are measured in the same process, so the ratio does
+#: not depend on the speed or load of the machine. The heavy modules that must not be
+#: imported are checked deterministically in `test_heavy_modules_are_not_imported`.
+IMPORT_TIME_RATIO = 0.25
+
+
+def run_python(code: str, *options: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *options, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def test_import_time():
+    # ipywidgets is imported beforehand, so only the time of scwidgets is measured
+    process = run_python("import ipywidgets; import scwidgets", "-X", "importtime")
+    cumulative_times = {
+        match.group(2): int(match.group(1)) * 1e-6
+        for match in re.finditer(
+            r"^import time:\s+\d+ \|\s+(\d+) \|\s*(\S+)$", process.stderr, re.MULTILINE
+        )
+    }
+    assert (
+        cumulative_times["scwidgets"]
+        < IMPORT_TIME_RATIO * cumulative_times["ipywidgets"]
+    )
+
+
+@pytest.mark.parametrize(
+    "attribute, unimported_modules",
+    [
+        (None, ["numpy", "matplotlib"]),
+        ("TextExercise", ["numpy", "matplotlib"]),
+        ("CodeExercise", ["matplotlib"]),
+    ],
+)
+def test_heavy_modules_are_not_imported(attribute, unimported_modules):
+    code = "import sys, scwidgets\n"
+    if attribute is not None:
+        code += f"scwidgets.{attribute}\n"
+    code += "print(','.join(sorted(sys.modules)))"
+    imported_modules = set(run_python(code).stdout.strip().split(","))
+    for module in unimported_modules:
+        assert module not in imported_modules
+
+
+def test_lazy_attributes():
+    from scwidgets.cue import CueFigure
+
+    assert scwidgets.CueFigure is CueFigure
+    assert scwidgets.cue.CueFigure is CueFigure
+    assert set(scwidgets.__all__) <= set(dir(scwidgets))
+    assert "Downsampler" in dir(scwidgets.cue)
+    with pytest.raises(AttributeError, match="has no attribute 'Figure'"):
+        scwidgets.Figure
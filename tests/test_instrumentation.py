@@ -0,0 +1,159 @@
+import json
+
+import pytest
+from ipywidgets import Button, IntSlider, Widget
+
+from scwidgets import (
+    JsonlSink,
+    OpenTelemetrySink,
+    WidgetCounter,
+    WidgetCounts,
+    add_trace_sink,
+    remove_trace_sink,
+    trace_span,
+    tracing,
+)
+from scwidgets.check import Check, assert_numpy_allclose
+from scwidgets.code import CodeInput
+from scwidgets.cue import CueObject
+from scwidgets.exercise import CodeExercise
+
+
+def square(x):
+    return x**2
+
+
+class TestWidgetCounter:
+    def test_widget_models(self):
+        open_method = Widget.open
+        with WidgetCounter() as counter:
+            assert Widget.open is not open_method
+            button = Button()
+        # the button has a layout and a style
+        assert counter.nb_widget_models == 3
+        assert counter.nb_messages == 3
+        assert counter.nb_trait_syncs == 0
+        assert counter.nb_bytes > 0
+        # the widgets are not affected when no counter is active
+        assert Widget.open is open_method
+
+        with counter:
+            button.description = "Click"
+            button.close()
+        assert counter.nb_messages == 4
+        assert counter.nb_trait_syncs == 1
+        assert counter.actions == {}
+
+    def test_actions(self):
+        slider = IntSlider(value=2)
+
+        def update(exercise):
+            exercise.outputs[0].object = exercise.run_code(**exercise.parameters)
+
+        exercise = CodeExercise(
+            code=CodeInput(square),
+            parameters={"x": slider},
+            outputs=[CueObject(None)],
+            update=update,
+        )
+        global_counter = WidgetCounter()
+        global_counter.start()
+        with WidgetCounter() as counter:
+            exercise.run_update()
+        assert exercise.outputs[0].object == 4
+        assert set(counter.actions) == {"update"}
+        update_counts = counter.actions["update"]
+        assert update_counts.nb_trait_syncs > 0
+        assert update_counts.nb_widget_models == 0
+        # the button states are synced within the action of the click
+        assert counter.nb_messages == update_counts.nb_messages
+
+        # the global counter is still active
+        slider.value = 3
+        assert global_counter.nb_messages > counter.nb_messages
+        global_counter.stop()
+        assert not (global_counter.is_active)
+        global_counter.reset()
+        assert global_counter.total == WidgetCounts()
+
+
+class TestTracing:
+    def test_check_function(self):
+        check = Check(
+            function_to_check=square,
+            asserts=[assert_numpy_allclose],
+            inputs_parameters=[{"x": 1.0}, {"x": 2.0}],
+            outputs_references=[(1.0,), (4.0,)],
+        )
+        with trace_span("unused") as span:
+            assert span is None
+
+        spans = []
+        with tracing(spans.append):
+            result = check.check_function()
+            result.message()
+        assert [span.name for span in spans] == [
+            "function",
+            "assert",
+            "function",
+            "assert",
+            "check_function",
+            "message",
+        ]
+        check_span = spans[4]
+        assert check_span.parent_id is None
+        for span in spans[:4]:
+            assert span.parent_id == check_span.span_id
+            assert span.trace_id == check_span.span_id
+            assert span.duration <= check_span.duration
+        assert spans[2].attributes == {"function": "square", "input_index": 1}
+
+        # no spans are recorded after the context
+        check.check_function()
+        assert len(spans) == 6
+
+    def test_sinks(self, tmp_path):
+        def failing_sink(span):
+            raise RuntimeError("sink failed")
+
+        sink = JsonlSink(tmp_path / "spans.jsonl")
+        add_trace_sink(sink)
+        try:
+            with pytest.raises(ValueError):
+                with trace_span("action", student="name"):
+                    with trace_span("error"):
+                        raise ValueError()
+            with tracing(failing_sink), pytest.warns(UserWarning, match="sink failed"):
+                with trace_span("warning"):
+                    pass
+        finally:
+            remove_trace_sink(sink)
+        lines = (tmp_path / "spans.jsonl").read_text().splitlines()
+        spans = [json.loads(line) for line in lines]
+        assert [span["name"] for span in spans] == ["error", "action", "warning"]
+        assert spans[0]["attributes"] == {"error": "ValueError"}
+        assert spans[1]["attributes"] == {"student": "name", "error": "ValueError"}
+
+    def test_open_telemetry_sink(self):
+        pytest.importorskip("opentelemetry.sdk")
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+        from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+            InMemorySpanExporter,
+        )
+
+        exporter = InMemorySpanExporter()
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(exporter))
+        with tracing(OpenTelemetrySink(provider.get_tracer("test"))):
+            with trace_span("action"):
+                with trace_span("child", index=1):
+                    pass
+                # the spans are exported when the action is finished
+                assert len(exporter.get_finished_spans()) == 0
+        child, action = sorted(
+            exporter.get_finished_spans(), key=lambda span: span.name, reverse=True
+        )
+        assert child.parent.span_id == action.context.span_id
+        assert child.attributes["index"] == 1
+        assert action.start_time <= child.start_time <= child.end_time